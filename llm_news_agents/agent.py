@@ -4,7 +4,13 @@ import callback_logging
 from google.adk.agents import SequentialAgent
 from .sub_agents.investigative_journalist import investigative_journalist_agent
 from .sub_agents.news_researcher import research_agent
+from .sub_agents.news_researcher.agent import start_research_prefetch
 from .sub_agents.news_editor import news_editor_agent
+from .sub_agents.claim_verifier import claim_verifier_agent
+from .shared_libraries.citations import start_citation_turn
+from .shared_libraries.intent_router import route_intent
+from .shared_libraries.lifecycle import ToolsLifecyclePlugin
+from .shared_libraries.report_cache import serve_cached_report
 
 from callback_logging import log_query_to_model, log_model_response
 
@@ -12,13 +18,20 @@ sys.path.append("..")
 
 llm_news_agent = SequentialAgent(
     name='llm_news_auditor',
-    sub_agents=[investigative_journalist_agent, research_agent, news_editor_agent], 
+    sub_agents=[investigative_journalist_agent, research_agent, claim_verifier_agent, news_editor_agent],
     description=(
         "Orchestrates a sequential auditing pipeline where an investigative "
         "journalist first targets potential inaccuracies, a researcher verifies "
-        "facts against live web data, and an editor synthesizes the findings "
+        "facts against live web data, the report's claims are fact-checked in "
+        "parallel, and an editor synthesizes the findings "
         "into a polished, truthful final report."
     ),
+    # Greetings and small talk, and topics with a fresh cached report, are
+    # answered here without running the pipeline; otherwise a new citation
+    # turn begins and the research stage's lookups start right away.
+    before_agent_callback=[
+        route_intent, serve_cached_report, start_citation_turn, start_research_prefetch
+    ],
 
 )
 
@@ -26,4 +39,4 @@ root_agent = llm_news_agent
 
 from google.adk.apps.app import App
 
-app = App(root_agent=root_agent, name="llm_news_agents")
+app = App(root_agent=root_agent, name="llm_news_agents", plugins=[ToolsLifecyclePlugin()])
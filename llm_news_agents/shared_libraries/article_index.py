@@ -0,0 +1,371 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Local BM25 inverted index over articles the news tools have fetched."""
+import glob
+import json
+import logging
+import math
+import mmap
+import os
+import re
+import threading
+import time
+
+from array import array
+from collections import Counter, defaultdict
+from dataclasses import asdict
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+
+from .config import env_int
+from .news_engine import Article, canonical_url
+
+logger = logging.getLogger(__name__)
+
+_WORD = re.compile(r"[a-z0-9]+")
+_STOPWORDS = frozenset(
+    "a an and are as at be by for from has have in is it its of on or that the to was were will with".split()
+)
+
+
+def tokenize(text: str) -> List[str]:
+    """Lowercases text and splits it into index terms, dropping stopwords."""
+    return [word for word in _WORD.findall(text.lower()) if word not in _STOPWORDS]
+
+
+class _Segment:
+    """A set of indexed documents with their postings.
+
+    The active segment keeps postings in growable arrays; flushed segments keep
+    a term dictionary in memory and read postings from a memory-mapped file
+    of packed `(doc_id, term_frequency)` uint32 pairs.
+    """
+
+    def __init__(self) -> None:
+        self.docs: List[Dict] = []
+        self.lengths: List[int] = []
+        self._postings: Dict[str, array] = defaultdict(lambda: array("I"))
+        self._terms: Dict[str, Tuple[int, int]] = {}
+        self._mmap: Optional[mmap.mmap] = None
+        self._file = None
+        # File prefix once the segment is on disk.
+        self.prefix: Optional[str] = None
+
+    def add(self, doc: Dict, terms: List[str]) -> None:
+        doc_id = len(self.docs)
+        self.docs.append(doc)
+        self.lengths.append(len(terms))
+        for term, frequency in Counter(terms).items():
+            self._postings[term].extend((doc_id, frequency))
+
+    def postings(self, term: str) -> Sequence[int]:
+        """Returns the flat `[doc_id, tf, doc_id, tf, ...]` postings of a term."""
+        if self._mmap is None:
+            return self._postings.get(term, ())
+        location = self._terms.get(term)
+        if location is None:
+            return ()
+        offset, count = location
+        return memoryview(self._mmap)[offset:offset + count * 8].cast("I")
+
+    def document_frequency(self, term: str) -> int:
+        if self._mmap is None:
+            return len(self._postings.get(term, ())) // 2
+        return self._terms.get(term, (0, 0))[1]
+
+    def flush(self, prefix: str) -> None:
+        """Writes the segment to `<prefix>.post` / `<prefix>.json` and maps it."""
+        terms = {}
+        with open(f"{prefix}.post", "wb") as f:
+            offset = 0
+            for term, postings in self._postings.items():
+                postings.tofile(f)
+                terms[term] = (offset, len(postings) // 2)
+                offset += len(postings) * postings.itemsize
+        with open(f"{prefix}.json", "w", encoding="utf-8") as f:
+            json.dump({"docs": self.docs, "lengths": self.lengths, "terms": terms}, f)
+        self._postings = defaultdict(lambda: array("I"))
+        self._open(prefix, terms)
+        self.prefix = prefix
+
+    @classmethod
+    def load(cls, prefix: str) -> "_Segment":
+        segment = cls()
+        with open(f"{prefix}.json", encoding="utf-8") as f:
+            meta = json.load(f)
+        segment.docs = meta["docs"]
+        segment.lengths = meta["lengths"]
+        segment._open(prefix, {term: tuple(loc) for term, loc in meta["terms"].items()})
+        segment.prefix = prefix
+        return segment
+
+    def _open(self, prefix: str, terms: Dict[str, Tuple[int, int]]) -> None:
+        self._terms = terms
+        if os.path.getsize(f"{prefix}.post") == 0:
+            self._mmap = None
+            return
+        self._file = open(f"{prefix}.post", "rb")
+        self._mmap = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+
+    def close(self) -> None:
+        if self._mmap is not None:
+            self._mmap.close()
+            self._file.close()
+            self._mmap = None
+
+    def delete(self) -> None:
+        """Closes the segment and removes its files, if it has any."""
+        self.close()
+        if self.prefix:
+            for suffix in (".post", ".json"):
+                try:
+                    os.remove(self.prefix + suffix)
+                except FileNotFoundError:
+                    pass
+
+
+class ArticleIndex:
+    """Incrementally updated BM25 index of fetched articles.
+
+    New articles go into an in-memory segment that is flushed to a
+    memory-mapped segment file every `flush_every` documents when a
+    `directory` is given, so the index survives restarts without holding all
+    postings on the heap; `close()` writes the last, partial segment.
+    Without a directory, full segments are sealed in memory. Either way the
+    oldest segments are dropped (and their files deleted) once the index
+    holds more than `max_docs` documents. Each document remembers when it
+    was last fetched, refreshed whenever a tool returns it again, so callers
+    can demand fresh results.
+
+    All methods are synchronous and thread-safe; async callers run them through
+    `asyncio.to_thread`.
+
+    Args:
+        directory (Optional[str]): Where segments are stored; memory-only if None.
+        flush_every (int): Documents per segment.
+        k1 (float): BM25 term-frequency saturation.
+        b (float): BM25 length normalisation.
+        max_docs (int): Documents kept before the oldest segments are dropped.
+    """
+
+    def __init__(
+        self,
+        directory: Optional[str] = None,
+        flush_every: int = 500,
+        k1: float = 1.2,
+        b: float = 0.75,
+        max_docs: int = 10_000,
+    ) -> None:
+        self.directory = directory
+        self.flush_every = flush_every
+        self.k1 = k1
+        self.b = b
+        self.max_docs = max_docs
+        self._segments: List[_Segment] = []
+        self._active = _Segment()
+        # Indexed documents by key, to refresh `fetched_at` on re-fetch.
+        self._seen: Dict[str, Dict] = {}
+        self._lock = threading.RLock()
+        # Number of the next segment file; never reused after evictions.
+        self._next_segment = 0
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+            for path in sorted(glob.glob(os.path.join(directory, "segment_*.json"))):
+                prefix = path[: -len(".json")]
+                segment = _Segment.load(prefix)
+                self._segments.append(segment)
+                self._seen.update((doc["key"], doc) for doc in segment.docs)
+                self._next_segment = int(prefix.rsplit("_", 1)[1]) + 1
+            self._evict()
+
+    def __len__(self) -> int:
+        return sum(len(segment.docs) for segment in self._all_segments())
+
+    def _all_segments(self) -> Iterator[_Segment]:
+        yield from self._segments
+        yield self._active
+
+    def add(self, articles: Sequence[Article], fetched_at: Optional[float] = None) -> int:
+        """Indexes articles not seen before and refreshes the fetch time of the rest.
+
+        Args:
+            articles (Sequence[Article]): Articles returned by a tool call.
+            fetched_at (Optional[float]): When they were fetched; defaults to now.
+
+        Returns:
+            int: The number of newly indexed articles.
+        """
+        fetched_at = time.time() if fetched_at is None else fetched_at
+        added = 0
+        with self._lock:
+            for article in articles:
+                key = canonical_url(article.url) or (article.title or "").lower()
+                if not key:
+                    continue
+                seen = self._seen.get(key)
+                if seen is not None:
+                    seen["fetched_at"] = max(seen["fetched_at"], fetched_at)
+                    continue
+                terms = tokenize(f"{article.title or ''} {article.description or ''}")
+                doc = {"key": key, "fetched_at": fetched_at, "article": asdict(article)}
+                self._active.add(doc, terms)
+                self._seen[key] = doc
+                added += 1
+            if len(self._active.docs) >= self.flush_every:
+                if self.directory:
+                    self.flush()
+                else:
+                    self._seal()
+        return added
+
+    def _seal(self) -> None:
+        """Keeps a full segment in memory, dropping the oldest beyond `max_docs`."""
+        self._segments.append(self._active)
+        self._active = _Segment()
+        self._evict()
+
+    def _evict(self) -> None:
+        """Drops the oldest segments, and their files, while over `max_docs`."""
+        while self._segments and len(self) > self.max_docs:
+            dropped = self._segments.pop(0)
+            for doc in dropped.docs:
+                if self._seen.get(doc["key"]) is doc:
+                    del self._seen[doc["key"]]
+            dropped.delete()
+            logger.info("Evicted %d articles from the article index.", len(dropped.docs))
+
+    def flush(self) -> None:
+        """Writes the active segment to disk as a new memory-mapped segment."""
+        with self._lock:
+            if not self.directory or not self._active.docs:
+                return
+            prefix = os.path.join(self.directory, f"segment_{self._next_segment:06d}")
+            self._next_segment += 1
+            self._active.flush(prefix)
+            self._segments.append(self._active)
+            self._active = _Segment()
+            self._evict()
+        logger.info("Flushed article index segment %s.", prefix)
+
+    def search(
+        self,
+        query: str,
+        k: int = 10,
+        from_date: Optional[str] = None,
+        to_date: Optional[str] = None,
+        max_age_seconds: Optional[float] = None,
+    ) -> List[Tuple[float, float, Article]]:
+        """Ranks indexed articles against `query` with BM25.
+
+        Args:
+            query (str): The search query.
+            k (int): Maximum number of hits to return.
+            from_date (Optional[str]): Drop articles published before this date.
+            to_date (Optional[str]): Drop articles published after this date.
+            max_age_seconds (Optional[float]): Drop articles fetched longer ago.
+
+        Returns:
+            List[Tuple[float, float, Article]]: `(score, coverage, article)`
+                triples, best first, where coverage is the share of query
+                terms the article contains.
+        """
+        with self._lock:
+            return self._search(query, k, from_date, to_date, max_age_seconds)
+
+    def _search(
+        self,
+        query: str,
+        k: int,
+        from_date: Optional[str],
+        to_date: Optional[str],
+        max_age_seconds: Optional[float],
+    ) -> List[Tuple[float, float, Article]]:
+        terms = list(dict.fromkeys(tokenize(query)))
+        segments = list(self._all_segments())
+        total_docs = sum(len(segment.docs) for segment in segments)
+        if not terms or not total_docs:
+            return []
+        average_length = sum(sum(segment.lengths) for segment in segments) / total_docs
+        now = time.time()
+
+        scores: Dict[Tuple[int, int], float] = defaultdict(float)
+        matched: Dict[Tuple[int, int], int] = defaultdict(int)
+        for term in terms:
+            df = sum(segment.document_frequency(term) for segment in segments)
+            if not df:
+                continue
+            idf = math.log(1 + (total_docs - df + 0.5) / (df + 0.5))
+            for segment_id, segment in enumerate(segments):
+                postings = segment.postings(term)
+                for i in range(0, len(postings), 2):
+                    doc_id, tf = postings[i], postings[i + 1]
+                    norm = self.k1 * (1 - self.b + self.b * segment.lengths[doc_id] / average_length)
+                    scores[(segment_id, doc_id)] += idf * tf * (self.k1 + 1) / (tf + norm)
+                    matched[(segment_id, doc_id)] += 1
+
+        hits = []
+        for (segment_id, doc_id), score in sorted(scores.items(), key=lambda item: item[1], reverse=True):
+            doc = segments[segment_id].docs[doc_id]
+            if max_age_seconds is not None and now - doc["fetched_at"] > max_age_seconds:
+                continue
+            article = Article(**doc["article"])
+            published = (article.published_at or "")[:10]
+            if published and ((from_date and published < from_date) or (to_date and published > to_date)):
+                continue
+            hits.append((score, matched[(segment_id, doc_id)] / len(terms), article))
+            if len(hits) >= k:
+                break
+        return hits
+
+    def close(self) -> None:
+        """Flushes pending documents and unmaps all segments."""
+        with self._lock:
+            self.flush()
+            for segment in self._segments:
+                segment.close()
+
+
+_article_index: Optional[ArticleIndex] = None
+_article_index_lock = threading.Lock()
+
+
+def get_article_index() -> ArticleIndex:
+    """Returns the process-wide article index.
+
+    Segments are persisted under `NEWS_INDEX_PATH` when it is set; otherwise
+    the index lives in memory. Either way it holds at most
+    `NEWS_INDEX_MAX_DOCS` articles. `NEWS_INDEX_FLUSH_EVERY` sets the number
+    of documents per segment. Safe to call from `asyncio.to_thread` workers.
+    """
+    global _article_index
+    path = os.getenv("NEWS_INDEX_PATH") or None
+    with _article_index_lock:
+        if _article_index is None or _article_index.directory != path:
+            if _article_index is not None:
+                _article_index.close()
+            _article_index = ArticleIndex(
+                path,
+                flush_every=env_int("NEWS_INDEX_FLUSH_EVERY", 500),
+                max_docs=env_int("NEWS_INDEX_MAX_DOCS", 10_000),
+            )
+        return _article_index
+
+
+def close_article_index() -> None:
+    """Flushes and closes the process-wide article index, if one was created."""
+    global _article_index
+    with _article_index_lock:
+        if _article_index is not None:
+            _article_index.close()
+            _article_index = None
@@ -0,0 +1,142 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Bounded in-memory TTL + LRU cache for tool responses."""
+import json
+import time
+
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple
+
+_MISSING = object()
+
+
+def normalise_query(query: str) -> str:
+    """Lowercases a search query and collapses runs of whitespace.
+
+    Args:
+        query (str): The raw query as produced by the model.
+
+    Returns:
+        str: A canonical form suitable for use in a cache key.
+    """
+    return " ".join(query.lower().split())
+
+
+def _estimate_size(value: Any) -> int:
+    """Approximates the memory held by a cached value via its JSON encoding."""
+    try:
+        return len(json.dumps(value, default=str).encode("utf-8"))
+    except (TypeError, ValueError):
+        return len(repr(value).encode("utf-8"))
+
+
+class TTLCache:
+    """A thread-unsafe, asyncio-friendly cache with TTL, LRU and byte limits.
+
+    Entries expire `ttl_seconds` after they are written. When either
+    `max_entries` or `max_bytes` would be exceeded, the least recently used
+    entries are evicted first. Hit, miss, eviction and expiry counts are kept
+    for observability.
+
+    Args:
+        ttl_seconds (float): How long an entry stays fresh.
+        max_entries (int): Maximum number of entries held at once.
+        max_bytes (int): Maximum approximate size of all values combined.
+        clock (Callable[[], float]): Monotonic time source, injectable for tests.
+    """
+
+    def __init__(
+        self,
+        ttl_seconds: float,
+        max_entries: int,
+        max_bytes: int,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._clock = clock
+        # key -> (expires_at, size, value), ordered from least to most recently used.
+        self._entries: "OrderedDict[Hashable, Tuple[float, int, Any]]" = OrderedDict()
+        self._bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """Returns a fresh cached value, or `default` if absent or expired."""
+        entry = self._entries.get(key, _MISSING)
+        if entry is _MISSING:
+            self.misses += 1
+            return default
+        expires_at, _, value = entry
+        if expires_at <= self._clock():
+            self._remove(key)
+            self.expirations += 1
+            self.misses += 1
+            return default
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def set(self, key: Hashable, value: Any, ttl_seconds: Optional[float] = None) -> None:
+        """Stores a value, evicting least recently used entries to stay in bounds.
+
+        Values larger than `max_bytes` on their own are not cached at all.
+        """
+        size = _estimate_size(value)
+        if size > self.max_bytes:
+            return
+        if key in self._entries:
+            self._remove(key)
+        ttl = self.ttl_seconds if ttl_seconds is None else ttl_seconds
+        self._entries[key] = (self._clock() + ttl, size, value)
+        self._bytes += size
+        while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+            oldest = next(iter(self._entries))
+            self._remove(oldest)
+            self.evictions += 1
+
+    def pop(self, key: Hashable, default: Any = None) -> Any:
+        """Removes an entry and returns its value, or `default` if absent."""
+        entry = self._entries.get(key, _MISSING)
+        if entry is _MISSING:
+            return default
+        self._remove(key)
+        return entry[2]
+
+    def clear(self) -> None:
+        """Drops every entry while keeping the counters."""
+        self._entries.clear()
+        self._bytes = 0
+
+    def stats(self) -> Dict[str, int]:
+        """Returns the current counters and occupancy of the cache."""
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+            "entries": len(self._entries),
+            "bytes": self._bytes,
+        }
+
+    def _remove(self, key: Hashable) -> None:
+        _, size, _ = self._entries.pop(key)
+        self._bytes -= size
@@ -0,0 +1,185 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Session-scoped citation registry shared by every stage of the pipeline."""
+import logging
+
+from typing import Any, Dict, List, MutableMapping, Optional, Sequence, Tuple
+
+from google.genai import types
+
+from .cache import TTLCache
+from .news_engine import canonical_url
+
+logger = logging.getLogger(__name__)
+
+CITATIONS_KEY = "citations"
+CITATION_TURN_KEY = "citations_turn"
+
+
+def grounding_sources(grounding_metadata: Optional[types.GroundingMetadata]) -> List[Tuple[str, str]]:
+    """Returns the `(uri, title)` pairs of a response's grounding chunks."""
+    if not grounding_metadata:
+        return []
+    sources = []
+    for chunk in grounding_metadata.grounding_chunks or []:
+        # Extract details from either 'retrieved_context' or 'web' sources.
+        source = chunk.retrieved_context or chunk.web
+        if source and (source.uri or source.title):
+            sources.append((source.uri or "", source.title or ""))
+    return sources
+
+
+class CitationRegistry:
+    """Numbered list of cited sources kept in session state.
+
+    Sources are deduplicated by normalised URI (or title when there is no
+    URI) and numbered in order of first appearance, so a source keeps the
+    same id across stages and turns of a session. Each entry remembers the
+    last turn that cited it (the `citations_turn` state key set by
+    `start_citation_turn`), which lets the final stage list only the sources
+    of the current answer. The turn lives in state rather than the invocation
+    id because nested agent tools run under their own invocations. Entries
+    are plain dicts, so the registry survives session persistence.
+
+    Args:
+        state (MutableMapping[str, Any]): Session state, or a callback's view of it.
+        key (str): The state key holding the entries.
+    """
+
+    def __init__(self, state: MutableMapping[str, Any], key: str = CITATIONS_KEY) -> None:
+        self.state = state
+        self.key = key
+        self._entries: List[Dict[str, Any]] = [dict(entry) for entry in state.get(key) or []]
+        self._ids = {self._normalise(entry["uri"], entry["title"]): entry["id"] for entry in self._entries}
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @staticmethod
+    def _normalise(uri: str, title: str) -> str:
+        return canonical_url(uri) or (title or "").strip().lower()
+
+    def register(self, uri: str, title: str = "") -> Optional[int]:
+        """Records a cited source and returns its stable id.
+
+        Args:
+            uri (str): The source URI.
+            title (str): The source title, used for display and when there is no URI.
+
+        Returns:
+            Optional[int]: The source's id, or None if it has neither URI nor title.
+        """
+        return self.register_all([(uri, title)])[0]
+
+    def register_all(self, sources: Sequence[Tuple[str, str]]) -> List[Optional[int]]:
+        """Records several `(uri, title)` sources with a single state write."""
+        turn = self.state.get(CITATION_TURN_KEY)
+        ids = []
+        for uri, title in sources:
+            normalised = self._normalise(uri, title)
+            if not normalised:
+                ids.append(None)
+                continue
+            citation_id = self._ids.get(normalised)
+            if citation_id is None:
+                citation_id = len(self._entries) + 1
+                self._ids[normalised] = citation_id
+                self._entries.append({"id": citation_id, "uri": uri, "title": title or uri})
+            self._entries[citation_id - 1]["turn"] = turn
+            ids.append(citation_id)
+        if any(citation_id is not None for citation_id in ids):
+            # Assign rather than mutate so the change lands in the state delta.
+            self.state[self.key] = self._entries
+        return ids
+
+    def render(self, heading: str = "References", current_turn_only: bool = True) -> str:
+        """Returns one compact references list, or an empty string.
+
+        Args:
+            heading (str): The list heading.
+            current_turn_only (bool): Only list sources cited in the current turn.
+        """
+        turn = self.state.get(CITATION_TURN_KEY)
+        entries = [
+            entry for entry in self._entries
+            if not current_turn_only or entry.get("turn") == turn
+        ]
+        if not entries:
+            return ""
+        lines = [
+            f"[{entry['id']}] [{entry['title']}]({entry['uri']})" if entry["uri"] else f"[{entry['id']}] {entry['title']}"
+            for entry in entries
+        ]
+        return f"\n\n{heading}:\n\n" + "\n".join(lines) + "\n"
+
+
+async def start_citation_turn(callback_context: Any) -> None:
+    """Before-agent callback of the root agent that starts a new citation turn."""
+    callback_context.state[CITATION_TURN_KEY] = callback_context.invocation_id
+    return None
+
+
+# Sources of in-progress streams, by (invocation id, agent name). Bounded, so
+# streams that errored or were cancelled before their final response age out.
+_pending = TTLCache(ttl_seconds=15 * 60, max_entries=256, max_bytes=4 * 1024 * 1024)
+
+
+def collect_citations(callback_context: Any, llm_response: Any) -> Any:
+    """Registers a possibly streamed response's grounding sources.
+
+    Sources of partial responses are buffered per invocation and agent and
+    registered once the final, non-partial response arrives, so the state
+    write lands on an event that is persisted. No citation text is added to
+    the response, keeping it compact for later stages.
+
+    Args:
+        callback_context (Any): The `CallbackContext` of an after-model callback.
+        llm_response (Any): The `LlmResponse`, partial or final.
+
+    Returns:
+        Any: The same response, unchanged.
+    """
+    key = (callback_context.invocation_id, callback_context.agent_name)
+    sources = _pending.pop(key, [])
+    sources.extend(grounding_sources(llm_response.grounding_metadata))
+    if llm_response.partial:
+        _pending.set(key, sources)
+        return llm_response
+    if sources:
+        CitationRegistry(callback_context.state).register_all(sources)
+    return llm_response
+
+
+def render_citations(callback_context: Any, llm_response: Any, heading: str = "References") -> Any:
+    """Registers the response's sources and appends the session's references list.
+
+    Meant for the last stage of the pipeline: partial responses pass through
+    untouched, and the final response gets one list of every source cited in
+    the current turn by any stage.
+
+    Args:
+        callback_context (Any): The `CallbackContext` of an after-model callback.
+        llm_response (Any): The `LlmResponse`, partial or final.
+        heading (str): The references heading.
+
+    Returns:
+        Any: The same response, with the list appended if it is final.
+    """
+    llm_response = collect_citations(callback_context, llm_response)
+    if llm_response.partial or not llm_response.content or not llm_response.content.parts:
+        return llm_response
+    block = CitationRegistry(callback_context.state).render(heading)
+    if block:
+        llm_response.content.parts.append(types.Part(text=block))
+    return llm_response
@@ -0,0 +1,186 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Claim extraction and bounded concurrent verification for the editor's findings."""
+import asyncio
+import logging
+import re
+
+from dataclasses import dataclass, field
+from typing import Awaitable, Callable, List, Optional
+
+logger = logging.getLogger(__name__)
+
+ACCURATE = "Accurate"
+INACCURATE = "Inaccurate"
+DISPUTED = "Disputed"
+UNSUPPORTED = "Unsupported"
+NOT_APPLICABLE = "Not Applicable"
+VERDICTS = (ACCURATE, INACCURATE, DISPUTED, UNSUPPORTED, NOT_APPLICABLE)
+
+# Fact-check ratings are free text; these whole-word patterns map them onto
+# the editor's verdicts, checked in order so "mostly false" is not read as
+# "true" and "not true" or "untrue" never counts as accurate.
+def _words(*phrases: str) -> "re.Pattern[str]":
+    return re.compile(r"\b(?:" + "|".join(phrases) + r")\b")
+
+
+_RATING_PATTERNS = (
+    (UNSUPPORTED, _words(
+        r"no evidence", r"lacks? evidence", r"unproven", r"unsubstantiated", r"unverified",
+        r"unsupported",
+    )),
+    (DISPUTED, _words(
+        r"mixed", r"half", r"partly", r"partially", r"disputed", r"misleading",
+        r"missing context", r"exaggerat\w*",
+    )),
+    (INACCURATE, _words(
+        r"false", r"incorrect", r"inaccurate", r"untrue", r"fake", r"pants on fire", r"wrong",
+        r"fabricated", r"hoax", r"not (?:true|accurate|correct|the case)",
+    )),
+)
+_NEGATED_INACCURATE = _words(r"not (?:false|incorrect|inaccurate|wrong|fake)")
+_NEGATION = re.compile(r"\b(?:not|no|never|nor|un\w+)\b|n't\b")
+_ACCURATE_PATTERN = _words(r"true", r"correct", r"accurate", r"verified", r"confirmed")
+
+_SENTENCE = re.compile(r"(?<=[.!?])\s+")
+_LINK = re.compile(r"\[([^\]]*)\]\([^)]*\)")
+
+
+@dataclass
+class ClaimFinding:
+    """The verification outcome for one claim."""
+
+    claim: str
+    verdict: str
+    justification: str
+    sources: List[str] = field(default_factory=list)
+
+
+def rating_to_verdict(rating: Optional[str]) -> Optional[str]:
+    """Maps a publisher's textual rating to an editor verdict, if it is unambiguous.
+
+    Negations are resolved before any positive keyword is considered, and
+    ratings that are negated in a way the patterns do not cover (e.g. "not
+    false") return None, so the claim is verified by search instead.
+    """
+    text = (rating or "").lower().replace("’", "'")
+    if _NEGATED_INACCURATE.search(text):
+        return None
+    for verdict, pattern in _RATING_PATTERNS:
+        if pattern.search(text):
+            return verdict
+    if _NEGATION.search(text):
+        return None
+    if _ACCURATE_PATTERN.search(text):
+        return ACCURATE
+    return None
+
+
+def extract_claims(report: str, max_claims: int = 12, min_words: int = 6) -> List[str]:
+    """Picks the checkable factual sentences out of a markdown report.
+
+    Headings, reference lists and questions are skipped. Sentences carrying
+    numbers or names are preferred, since those are the ones fact-checks and
+    searches can confirm or refute; the chosen claims keep report order.
+
+    Args:
+        report (str): The investigative report.
+        max_claims (int): Maximum number of claims returned.
+        min_words (int): Shorter sentences are ignored.
+
+    Returns:
+        List[str]: The claims, in the order they appear in the report.
+    """
+    sentences = []
+    for line in report.splitlines():
+        line = line.strip()
+        if not line or line.startswith("#") or line.lower().startswith(("reference", "* [")):
+            continue
+        line = _LINK.sub(r"\1", line).lstrip("*-> ").replace("**", "")
+        sentences.extend(sentence.strip() for sentence in _SENTENCE.split(line))
+
+    candidates = []
+    for position, sentence in enumerate(dict.fromkeys(sentences)):
+        words = sentence.split()
+        if len(words) < min_words or sentence.endswith("?"):
+            continue
+        specificity = sum(
+            1 for word in words[1:] if word[:1].isupper() or any(c.isdigit() for c in word)
+        )
+        candidates.append((specificity, position, sentence))
+    chosen = sorted(candidates, key=lambda item: (-item[0], item[1]))[:max_claims]
+    return [sentence for _, _, sentence in sorted(chosen, key=lambda item: item[1])]
+
+
+async def verify_claims(
+    claims: List[str],
+    verify: Callable[[str], Awaitable[ClaimFinding]],
+    concurrency: int = 4,
+    timeout: float = 20.0,
+) -> List[ClaimFinding]:
+    """Verifies claims concurrently with a bounded worker pool.
+
+    Each claim gets `timeout` seconds once a worker picks it up. Claims that
+    time out or fail are reported as unsupported instead of failing the
+    batch, so the editor always receives a finding for every claim.
+
+    Args:
+        claims (List[str]): The claims to verify.
+        verify (Callable[[str], Awaitable[ClaimFinding]]): Verifies one claim.
+        concurrency (int): Claims verified at the same time.
+        timeout (float): Seconds allowed per claim.
+
+    Returns:
+        List[ClaimFinding]: One finding per claim, in input order.
+    """
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def _worker(claim: str) -> ClaimFinding:
+        async with semaphore:
+            try:
+                return await asyncio.wait_for(verify(claim), timeout)
+            except asyncio.TimeoutError:
+                logger.warning("Verification of claim timed out after %.0fs: %s", timeout, claim)
+                return ClaimFinding(
+                    claim, UNSUPPORTED, "Verification timed out; no source was confirmed in time."
+                )
+            except Exception as e:
+                logger.warning("Verification of claim failed: %s (%s)", claim, e)
+                return ClaimFinding(claim, UNSUPPORTED, f"Verification failed: {e}")
+
+    return list(await asyncio.gather(*(_worker(claim) for claim in claims)))
+
+
+def overall_verdict(findings: List[ClaimFinding]) -> str:
+    """The most severe verdict among the findings."""
+    for verdict in (INACCURATE, DISPUTED, UNSUPPORTED):
+        if any(finding.verdict == verdict for finding in findings):
+            return verdict
+    return ACCURATE
+
+
+def render_findings(findings: List[ClaimFinding]) -> str:
+    """Formats findings in the layout the news editor prompt expects."""
+    if not findings:
+        return ""
+    lines = ["Findings:", ""]
+    for number, finding in enumerate(findings, 1):
+        lines.append(f"  * Claim {number}: {finding.claim}")
+        lines.append(f"      * Verdict: {finding.verdict}")
+        lines.append(f"      * Justification: {finding.justification}")
+        if finding.sources:
+            lines.append(f"      * Sources: {', '.join(finding.sources)}")
+    lines.append(f"  * Overall verdict: {overall_verdict(findings)}")
+    return "\n".join(lines)
@@ -0,0 +1,266 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Persistent store of fact-check claims with fuzzy lookup of repeated claims."""
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+
+from collections import defaultdict
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List, Optional, Tuple
+
+from .config import env_float
+from .fuzzy import TrigramIndex
+
+logger = logging.getLogger(__name__)
+
+_SCHEMA = (
+    """
+    CREATE TABLE IF NOT EXISTS claims (
+        id TEXT PRIMARY KEY,
+        language TEXT NOT NULL,
+        text TEXT NOT NULL,
+        data TEXT NOT NULL,
+        stored_at REAL NOT NULL
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS queries (
+        id TEXT PRIMARY KEY,
+        language TEXT NOT NULL,
+        text TEXT NOT NULL,
+        claim_ids TEXT NOT NULL,
+        stored_at REAL NOT NULL,
+        max_age_days INTEGER
+    )
+    """,
+    "CREATE INDEX IF NOT EXISTS claims_stored_at ON claims (stored_at)",
+    "CREATE INDEX IF NOT EXISTS queries_stored_at ON queries (stored_at)",
+)
+
+def _within_age(claim: Dict[str, Any], max_age_days: int) -> bool:
+    """Whether the claim's newest review (or the claim itself) is recent enough."""
+    cutoff = (datetime.now(timezone.utc) - timedelta(days=max_age_days)).strftime("%Y-%m-%d")
+    dates = [review.get("reviewDate") for review in claim.get("claimReviews") or []]
+    dates.append(claim.get("claimDate"))
+    return any(date and date[:10] >= cutoff for date in dates)
+
+
+def _claim_id(language: str, claim: Dict[str, Any]) -> str:
+    raw = f"{language}\x00{claim.get('text') or ''}\x00{claim.get('claimant') or ''}"
+    return hashlib.sha1(raw.encode("utf-8")).hexdigest()
+
+
+class ClaimStore:
+    """Keeps parsed Fact Check claims in SQLite and answers repeat lookups locally.
+
+    Every answered query is stored with the claims it returned, including
+    empty answers, and every claim is stored with its reviews. A lookup first
+    looks for an earlier query similar to the new one and then for stored
+    claims whose text matches it, so paraphrased or repeated claims are served
+    without a remote call. Claims match only when their words come in the
+    same order, so a claim with subject and object swapped is not served the
+    original's reviews. Entries older than `ttl` are ignored, which sends the
+    query to the API again and refreshes them, and are deleted with their
+    index entries whenever new claims are stored.
+
+    All methods are synchronous and thread-safe; async callers run them through
+    `asyncio.to_thread`.
+
+    Args:
+        path (str): Location of the SQLite database, or `:memory:`.
+        ttl (float): Seconds a stored answer is trusted.
+        min_similarity (float): Trigram similarity needed to count as a match.
+    """
+
+    def __init__(
+        self, path: str = ":memory:", ttl: float = 24 * 3600.0, min_similarity: float = 0.8
+    ) -> None:
+        self.path = path
+        self.ttl = ttl
+        self.min_similarity = min_similarity
+        self.query_hits = 0
+        self.claim_hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        # Keyed by ("claims", language) or ("queries", language, max_age_days).
+        self._indexes: Dict[Tuple[Any, ...], TrigramIndex] = defaultdict(TrigramIndex)
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        for statement in _SCHEMA:
+            self._conn.execute(statement)
+        columns = {row[1] for row in self._conn.execute("PRAGMA table_info(queries)")}
+        if "max_age_days" not in columns:
+            # Databases written before the column existed; those rows match no age limit.
+            self._conn.execute("ALTER TABLE queries ADD COLUMN max_age_days INTEGER")
+        self._conn.commit()
+        for entry_id, language, text in self._conn.execute("SELECT id, language, text FROM claims"):
+            self._indexes[("claims", language)].add(entry_id, text)
+        for entry_id, language, text, max_age_days in self._conn.execute(
+            "SELECT id, language, text, max_age_days FROM queries"
+        ):
+            if max_age_days is not None:
+                self._indexes[("queries", language, max_age_days)].add(entry_id, text)
+
+    def _load_claims(self, ids: List[str], fresh_after: float) -> Dict[str, Dict[str, Any]]:
+        if not ids:
+            return {}
+        rows = self._conn.execute(
+            f"SELECT id, data FROM claims WHERE stored_at > ? AND id IN ({','.join('?' * len(ids))})",
+            (fresh_after, *ids),
+        ).fetchall()
+        return {entry_id: json.loads(data) for entry_id, data in rows}
+
+    def lookup(
+        self, query: str, language: str, max_age_days: int = 30
+    ) -> Optional[List[Dict[str, Any]]]:
+        """Returns stored claims answering `query`, or None if the API must be asked.
+
+        Args:
+            query (str): The claim or topic being checked.
+            language (str): The BCP-47 language code of the search.
+            max_age_days (int): The search's review age limit; earlier queries
+                only count if made with the same limit, and claims matched by
+                text must have been reviewed within it.
+
+        Returns:
+            Optional[List[Dict[str, Any]]]: The claims in the same shape
+                `fact_checker` returns; an empty list means an earlier, similar
+                query found nothing.
+        """
+        fresh_after = time.time() - self.ttl
+        with self._lock:
+            queries = self._indexes[("queries", language, max_age_days)]
+            for _, query_id in queries.matches(query, self.min_similarity):
+                row = self._conn.execute(
+                    "SELECT claim_ids FROM queries WHERE id = ? AND stored_at > ?",
+                    (query_id, fresh_after),
+                ).fetchone()
+                if row is None:
+                    continue
+                ids = json.loads(row[0])
+                claims = self._load_claims(ids, fresh_after)
+                if len(claims) == len(ids):
+                    self.query_hits += 1
+                    return [claims[entry_id] for entry_id in ids]
+
+            ranked = self._indexes[("claims", language)].matches(query, self.min_similarity)
+            ids = [entry_id for _, entry_id in ranked]
+            claims = {
+                entry_id: claim
+                for entry_id, claim in self._load_claims(ids, fresh_after).items()
+                if _within_age(claim, max_age_days)
+            }
+        if claims:
+            self.claim_hits += 1
+            return [claims[entry_id] for entry_id in ids if entry_id in claims]
+        self.misses += 1
+        return None
+
+    def store(
+        self, query: str, language: str, claims: List[Dict[str, Any]], max_age_days: int = 30
+    ) -> None:
+        """Persists the claims an API call returned for `query`.
+
+        Args:
+            query (str): The query sent to the API.
+            language (str): The BCP-47 language code of the search.
+            claims (List[Dict[str, Any]]): The parsed claims, possibly empty.
+            max_age_days (int): The review age limit the query was made with.
+        """
+        now = time.time()
+        query_id = hashlib.sha1(f"{language}\x00{max_age_days}\x00{query}".encode("utf-8")).hexdigest()
+        ids = [_claim_id(language, claim) for claim in claims]
+        with self._lock:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO claims VALUES (?, ?, ?, ?, ?)",
+                [
+                    (entry_id, language, claim.get("text") or "", json.dumps(claim), now)
+                    for entry_id, claim in zip(ids, claims)
+                ],
+            )
+            self._conn.execute(
+                "INSERT OR REPLACE INTO queries VALUES (?, ?, ?, ?, ?, ?)",
+                (query_id, language, query, json.dumps(ids), now, max_age_days),
+            )
+            self._prune(now - self.ttl)
+            self._conn.commit()
+            for entry_id, claim in zip(ids, claims):
+                self._indexes[("claims", language)].add(entry_id, claim.get("text") or "")
+            self._indexes[("queries", language, max_age_days)].add(query_id, query)
+
+    def _prune(self, stale_before: float) -> None:
+        """Deletes claims and queries stored before `stale_before` and unindexes them.
+
+        Must be called with the lock held; the caller commits.
+        """
+        stale_claims = self._conn.execute(
+            "SELECT id, language FROM claims WHERE stored_at <= ?", (stale_before,)
+        ).fetchall()
+        stale_queries = self._conn.execute(
+            "SELECT id, language, max_age_days FROM queries WHERE stored_at <= ?", (stale_before,)
+        ).fetchall()
+        self._conn.execute("DELETE FROM claims WHERE stored_at <= ?", (stale_before,))
+        self._conn.execute("DELETE FROM queries WHERE stored_at <= ?", (stale_before,))
+        for entry_id, language in stale_claims:
+            self._indexes[("claims", language)].remove(entry_id)
+        for entry_id, language, max_age_days in stale_queries:
+            self._indexes[("queries", language, max_age_days)].remove(entry_id)
+
+    def stats(self) -> Dict[str, int]:
+        """Returns lookup counters and the number of stored claims and queries."""
+        with self._lock:
+            (claims,) = self._conn.execute("SELECT COUNT(*) FROM claims").fetchone()
+            (queries,) = self._conn.execute("SELECT COUNT(*) FROM queries").fetchone()
+        return {
+            "query_hits": self.query_hits,
+            "claim_hits": self.claim_hits,
+            "misses": self.misses,
+            "claims": claims,
+            "queries": queries,
+        }
+
+    def close(self) -> None:
+        """Closes the underlying SQLite connection."""
+        with self._lock:
+            self._conn.close()
+
+
+_claim_store: Optional[ClaimStore] = None
+
+
+def get_claim_store() -> ClaimStore:
+    """Returns the process-wide claim store.
+
+    Claims persist in the SQLite file at `FACTCHECK_STORE_PATH`, or in memory
+    when it is unset. `FACTCHECK_STORE_TTL_SECONDS` and
+    `FACTCHECK_STORE_MIN_SIMILARITY` tune staleness and matching.
+    """
+    global _claim_store
+    path = os.getenv("FACTCHECK_STORE_PATH") or ":memory:"
+    if _claim_store is None or _claim_store.path != path:
+        _claim_store = ClaimStore(
+            path,
+            ttl=env_float("FACTCHECK_STORE_TTL_SECONDS", 24 * 3600.0),
+            min_similarity=env_float("FACTCHECK_STORE_MIN_SIMILARITY", 0.8),
+        )
+    return _claim_store
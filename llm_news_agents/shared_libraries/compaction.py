@@ -0,0 +1,189 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Token-budget-aware compaction of tool results before they reach the model."""
+import json
+import logging
+import os
+import re
+
+from collections import defaultdict
+from typing import Any, Dict, Iterable, Optional
+
+from .config import env_int
+
+logger = logging.getLogger(__name__)
+
+# Fields that cost tokens without helping the model, by tool name.
+_DEFAULT_DROP_FIELDS = {
+    "search_news": ("provider",),
+    "fact_checker": ("claimDate",),
+}
+
+# Successively shorter string limits tried until a result fits its budget.
+_TRUNCATE_STEPS = (600, 300, 160, 80, 40)
+
+_SENTENCE_END = re.compile(r"(?<=[.!?])\s")
+
+# Links and identifiers are useless once cut, so they are never truncated;
+# records are dropped instead when shorter prose is not enough.
+_VERBATIM_FIELDS = frozenset({"url", "uri", "link", "id"})
+_URL = re.compile(r"^(?:https?://|www\.)\S+$")
+
+_stats: Dict[str, Dict[str, int]] = defaultdict(
+    lambda: {"calls": 0, "tokens_before": 0, "tokens_after": 0}
+)
+
+
+def estimate_tokens(value: Any) -> int:
+    """Estimates the tokens a value costs in the prompt at ~4 characters per token."""
+    text = value if isinstance(value, str) else json.dumps(
+        value, ensure_ascii=False, separators=(",", ":"), default=str
+    )
+    return len(text) // 4 + 1
+
+
+def _prune(value: Any, drop_fields: Iterable[str]) -> Any:
+    """Recursively drops empty values and the named fields."""
+    if isinstance(value, dict):
+        pruned = {
+            key: _prune(item, drop_fields) for key, item in value.items() if key not in drop_fields
+        }
+        return {key: item for key, item in pruned.items() if item not in (None, "", [], {})}
+    if isinstance(value, list):
+        return [_prune(item, drop_fields) for item in value]
+    return value
+
+
+def _tabulate(value: Any) -> Any:
+    """Encodes lists of dicts as `{"columns": [...], "rows": [[...]]}` tables.
+
+    Repeating every key on every record is the largest overhead of JSON
+    article and claim lists; a table states each key once.
+    """
+    if isinstance(value, dict):
+        return {key: _tabulate(item) for key, item in value.items()}
+    if isinstance(value, list):
+        if len(value) > 1 and all(isinstance(item, dict) for item in value):
+            columns = list(dict.fromkeys(key for item in value for key in item))
+            rows = [[_tabulate(item.get(column)) for column in columns] for item in value]
+            return {"columns": columns, "rows": rows}
+        return [_tabulate(item) for item in value]
+    return value
+
+
+def truncate_text(text: str, max_chars: int) -> str:
+    """Shortens text to at most `max_chars`, preferring a sentence or word boundary."""
+    if len(text) <= max_chars:
+        return text
+    cut = text[:max_chars]
+    sentences = [match.start() for match in _SENTENCE_END.finditer(cut)]
+    if sentences and sentences[-1] > max_chars // 2:
+        return cut[:sentences[-1]]
+    return cut.rsplit(" ", 1)[0] + "…"
+
+
+def _truncate(value: Any, max_chars: int) -> Any:
+    if isinstance(value, str):
+        return value if _URL.match(value) else truncate_text(value, max_chars)
+    if isinstance(value, dict):
+        return {
+            key: item if key in _VERBATIM_FIELDS else _truncate(item, max_chars)
+            for key, item in value.items()
+        }
+    if isinstance(value, list):
+        return [_truncate(item, max_chars) for item in value]
+    return value
+
+
+def _drop_tail(value: Any, budget: int) -> Any:
+    """Removes trailing records of the top-level list or table until it fits."""
+    if isinstance(value, dict) and "rows" in value:
+        rows = list(value["rows"])
+        while len(rows) > 1 and estimate_tokens({**value, "rows": rows}) > budget:
+            rows.pop()
+        return {**value, "rows": rows}
+    if isinstance(value, list):
+        items = list(value)
+        while len(items) > 1 and estimate_tokens(items) > budget:
+            items.pop()
+        return items
+    return value
+
+
+def compact(value: Any, budget: int, drop_fields: Iterable[str] = ()) -> Any:
+    """Shrinks a tool result until its estimated token count fits `budget`.
+
+    The cheapest, lossless steps come first: empty values and unhelpful
+    fields are pruned and record lists become tables. Long strings are then
+    truncated at ever shorter limits, except URLs and identifiers, and only
+    as a last resort trailing records are dropped, which keeps the
+    best-ranked results intact.
+
+    Args:
+        value (Any): The tool result.
+        budget (int): Target size in estimated tokens.
+        drop_fields (Iterable[str]): Field names removed at any depth.
+
+    Returns:
+        Any: The compacted result.
+    """
+    if isinstance(value, str):
+        return truncate_text(value, budget * 4)
+    value = _tabulate(_prune(value, frozenset(drop_fields)))
+    for max_chars in _TRUNCATE_STEPS:
+        if estimate_tokens(value) <= budget:
+            return value
+        value = _truncate(value, max_chars)
+    return _drop_tail(value, budget)
+
+
+def compact_tool_result(
+    tool: Any, args: Dict[str, Any], tool_context: Any, tool_response: Any
+) -> Optional[Dict]:
+    """`after_tool_callback` that compacts every tool result to the tool's budget.
+
+    The budget is read from `<TOOL_NAME>_TOKEN_BUDGET` (e.g.
+    `SEARCH_NEWS_TOKEN_BUDGET`), falling back to `TOOL_TOKEN_BUDGET`, and
+    extra fields to drop from `<TOOL_NAME>_DROP_FIELDS` as a comma-separated
+    list. Token counts before and after are logged and accumulated in
+    `compaction_stats()`.
+    """
+    del args, tool_context
+    if tool_response is None:
+        return None
+    name = tool.name
+    prefix = re.sub(r"\W", "_", name).upper()
+    budget = env_int(f"{prefix}_TOKEN_BUDGET", env_int("TOOL_TOKEN_BUDGET", 1500))
+    drop_fields = os.getenv(f"{prefix}_DROP_FIELDS")
+    drop = (
+        tuple(field.strip() for field in drop_fields.split(",") if field.strip())
+        if drop_fields is not None
+        else _DEFAULT_DROP_FIELDS.get(name, ())
+    )
+
+    before = estimate_tokens(tool_response)
+    compacted = compact(tool_response, budget, drop)
+    after = estimate_tokens(compacted)
+    stats = _stats[name]
+    stats["calls"] += 1
+    stats["tokens_before"] += before
+    stats["tokens_after"] += after
+    logger.info("Compacted %s result from ~%d to ~%d tokens (budget %d).", name, before, after, budget)
+    return compacted if isinstance(compacted, dict) else {"result": compacted}
+
+
+def compaction_stats() -> Dict[str, Dict[str, int]]:
+    """Returns per-tool call counts and cumulative token estimates before and after."""
+    return {name: dict(stats) for name, stats in _stats.items()}
@@ -0,0 +1,347 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Optional SQLite-backed HTTP cache that survives process restarts."""
+import asyncio
+import email.utils
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+
+from dataclasses import dataclass
+from typing import Any, Dict, Mapping, Optional
+from urllib.parse import urlencode
+
+from .config import env_float, env_int
+
+logger = logging.getLogger(__name__)
+
+# Query parameters carrying credentials; they never become part of a key on disk.
+_SECRET_PARAMS = frozenset({"apikey", "key", "api_key", "token"})
+
+# Bodies are stored decoded, so headers describing the wire encoding are dropped.
+_UNSTORED_HEADERS = frozenset(
+    {"content-encoding", "content-length", "transfer-encoding", "connection", "set-cookie"}
+)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS responses (
+    key TEXT PRIMARY KEY,
+    status INTEGER NOT NULL,
+    headers TEXT NOT NULL,
+    body BLOB NOT NULL,
+    stored_at REAL NOT NULL,
+    expires_at REAL NOT NULL,
+    etag TEXT,
+    last_modified TEXT
+)
+"""
+
+
+@dataclass
+class CachedResponse:
+    """A response as persisted in the on-disk cache."""
+
+    status: int
+    headers: Dict[str, str]
+    body: bytes
+    stored_at: float
+    expires_at: float
+    etag: Optional[str] = None
+    last_modified: Optional[str] = None
+
+    def is_fresh(self, now: Optional[float] = None) -> bool:
+        """Tells whether the entry can be served without contacting the origin."""
+        return self.expires_at > (time.time() if now is None else now)
+
+    def can_revalidate(self) -> bool:
+        """Tells whether a conditional request can be made for this entry."""
+        return bool(self.etag or self.last_modified)
+
+    def conditional_headers(self) -> Dict[str, str]:
+        """Builds the `If-None-Match` / `If-Modified-Since` headers for revalidation."""
+        headers = {}
+        if self.etag:
+            headers["If-None-Match"] = self.etag
+        if self.last_modified:
+            headers["If-Modified-Since"] = self.last_modified
+        return headers
+
+
+def make_key(url: str, params: Optional[Mapping[str, Any]] = None) -> str:
+    """Builds a stable cache key from a URL and its query parameters.
+
+    Credentials such as `apiKey` or `key` are stripped so they are never
+    written to disk.
+
+    Args:
+        url (str): The request URL without query string.
+        params (Optional[Mapping[str, Any]]): The query parameters.
+
+    Returns:
+        str: The URL with its non-secret parameters in sorted order.
+    """
+    if not params:
+        return url
+    public = sorted(
+        (name, str(value))
+        for name, value in params.items()
+        if value is not None and name.lower() not in _SECRET_PARAMS
+    )
+    return f"{url}?{urlencode(public)}"
+
+
+def freshness_lifetime(headers: Mapping[str, str], default_ttl: float) -> Optional[float]:
+    """Derives how long a response stays fresh from its caching headers.
+
+    Args:
+        headers (Mapping[str, str]): Response headers with lowercase names.
+        default_ttl (float): Heuristic lifetime when the origin gives none.
+
+    Returns:
+        Optional[float]: Lifetime in seconds, or None if the response must not
+            be stored at all (`Cache-Control: no-store` or `private`).
+    """
+    directives: Dict[str, Optional[str]] = {}
+    for directive in headers.get("cache-control", "").split(","):
+        name, _, value = directive.strip().partition("=")
+        if name:
+            directives[name.lower()] = value.strip('"') or None
+
+    if "no-store" in directives or "private" in directives:
+        return None
+    if "no-cache" in directives:
+        return 0.0
+    for name in ("s-maxage", "max-age"):
+        if directives.get(name):
+            try:
+                return max(0.0, float(directives[name]))
+            except ValueError:
+                pass
+    if headers.get("expires"):
+        try:
+            expires = email.utils.parsedate_to_datetime(headers["expires"]).timestamp()
+            return max(0.0, expires - time.time())
+        except (TypeError, ValueError):
+            return 0.0
+    return default_ttl
+
+
+class DiskHttpCache:
+    """Stores HTTP responses in a local SQLite file and compacts it periodically.
+
+    All methods are synchronous and thread-safe; async callers run them through
+    `asyncio.to_thread` so the event loop never waits on disk I/O.
+
+    Args:
+        path (str): Location of the SQLite database file.
+        default_ttl (float): Freshness lifetime used when the origin sends no
+            caching headers.
+        max_stale (float): How long an expired entry carrying validators is kept
+            around for revalidation before compaction deletes it.
+        max_entries (int): Upper bound on stored responses after compaction.
+        compact_interval (float): Minimum seconds between two compactions.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        default_ttl: float = 300.0,
+        max_stale: float = 7 * 24 * 3600.0,
+        max_entries: int = 10_000,
+        compact_interval: float = 600.0,
+    ) -> None:
+        self.path = path
+        self.default_ttl = default_ttl
+        self.max_stale = max_stale
+        self.max_entries = max_entries
+        self.compact_interval = compact_interval
+        self.last_compacted = time.time()
+        self.hits = 0
+        self.misses = 0
+        self.revalidations = 0
+        self._lock = threading.Lock()
+        self._compaction_task: Optional[asyncio.Task] = None
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(_SCHEMA)
+        self._conn.commit()
+
+    def lookup(self, key: str) -> Optional[CachedResponse]:
+        """Returns the stored entry for `key`, fresh or stale, if there is one."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT status, headers, body, stored_at, expires_at, etag, last_modified "
+                "FROM responses WHERE key = ?",
+                (key,),
+            ).fetchone()
+        if row is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        status, headers, body, stored_at, expires_at, etag, last_modified = row
+        return CachedResponse(
+            status, json.loads(headers), body, stored_at, expires_at, etag, last_modified
+        )
+
+    def store(
+        self, key: str, status: int, headers: Mapping[str, str], body: bytes
+    ) -> bool:
+        """Persists a response if its caching headers allow it.
+
+        Args:
+            key (str): The key built by `make_key`.
+            status (int): The HTTP status code; only 200 responses are stored.
+            headers (Mapping[str, str]): The response headers.
+            body (bytes): The raw response body.
+
+        Returns:
+            bool: True if the response was written to the cache.
+        """
+        headers = {
+            name.lower(): value
+            for name, value in headers.items()
+            if name.lower() not in _UNSTORED_HEADERS
+        }
+        lifetime = freshness_lifetime(headers, self.default_ttl)
+        if status != 200 or lifetime is None:
+            return False
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    key,
+                    status,
+                    json.dumps(headers),
+                    body,
+                    now,
+                    now + lifetime,
+                    headers.get("etag"),
+                    headers.get("last-modified"),
+                ),
+            )
+            self._conn.commit()
+        return True
+
+    def refresh(self, key: str, headers: Mapping[str, str]) -> None:
+        """Extends the lifetime of an entry after a `304 Not Modified` answer."""
+        headers = {name.lower(): value for name, value in headers.items()}
+        lifetime = freshness_lifetime(headers, self.default_ttl) or 0.0
+        self.revalidations += 1
+        with self._lock:
+            self._conn.execute(
+                "UPDATE responses SET expires_at = ?, "
+                "etag = COALESCE(?, etag), last_modified = COALESCE(?, last_modified) "
+                "WHERE key = ?",
+                (
+                    time.time() + lifetime,
+                    headers.get("etag"),
+                    headers.get("last-modified"),
+                    key,
+                ),
+            )
+            self._conn.commit()
+
+    def compaction_due(self) -> bool:
+        """Tells whether `compact_interval` has elapsed since the last compaction."""
+        return time.time() - self.last_compacted >= self.compact_interval
+
+    def compact_in_background(self) -> None:
+        """Starts a compaction on a worker thread if one is due and none is running.
+
+        Must be called from within a running event loop.
+        """
+        if not self.compaction_due():
+            return
+        if self._compaction_task is not None and not self._compaction_task.done():
+            return
+        # Claim the slot now so concurrent callers do not schedule a second run.
+        self.last_compacted = time.time()
+        self._compaction_task = asyncio.get_running_loop().create_task(
+            asyncio.to_thread(self.compact)
+        )
+
+    def compact(self) -> int:
+        """Drops dead entries, enforces `max_entries` and reclaims file space.
+
+        Expired entries without validators are dead immediately; entries with
+        validators are kept for `max_stale` seconds so they can be revalidated.
+
+        Returns:
+            int: The number of entries deleted.
+        """
+        now = time.time()
+        self.last_compacted = now
+        with self._lock:
+            deleted = self._conn.execute(
+                "DELETE FROM responses WHERE expires_at <= ? AND "
+                "((etag IS NULL AND last_modified IS NULL) OR expires_at <= ?)",
+                (now, now - self.max_stale),
+            ).rowcount
+            deleted += self._conn.execute(
+                "DELETE FROM responses WHERE key NOT IN "
+                "(SELECT key FROM responses ORDER BY stored_at DESC LIMIT ?)",
+                (self.max_entries,),
+            ).rowcount
+            self._conn.commit()
+            if deleted:
+                self._conn.execute("VACUUM")
+        logger.info("Compacted HTTP disk cache %s: %d entries removed.", self.path, deleted)
+        return deleted
+
+    def stats(self) -> Dict[str, int]:
+        """Returns lookup counters and the number of stored entries."""
+        with self._lock:
+            (entries,) = self._conn.execute("SELECT COUNT(*) FROM responses").fetchone()
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "revalidations": self.revalidations,
+            "entries": entries,
+        }
+
+    def close(self) -> None:
+        """Closes the underlying SQLite connection."""
+        with self._lock:
+            self._conn.close()
+
+
+_disk_cache: Optional[DiskHttpCache] = None
+
+
+def get_disk_cache() -> Optional[DiskHttpCache]:
+    """Returns the process-wide disk cache, or None when it is not configured.
+
+    The cache is enabled by pointing `TOOLS_HTTP_CACHE_PATH` at a writable file.
+    """
+    global _disk_cache
+    path = os.getenv("TOOLS_HTTP_CACHE_PATH")
+    if not path:
+        return None
+    if _disk_cache is None or _disk_cache.path != path:
+        _disk_cache = DiskHttpCache(
+            path,
+            default_ttl=env_float("TOOLS_HTTP_CACHE_DEFAULT_TTL", 300.0),
+            max_stale=env_float("TOOLS_HTTP_CACHE_MAX_STALE", 7 * 24 * 3600.0),
+            max_entries=env_int("TOOLS_HTTP_CACHE_MAX_ENTRIES", 10_000),
+            compact_interval=env_float("TOOLS_HTTP_CACHE_COMPACT_INTERVAL", 600.0),
+        )
+    return _disk_cache
@@ -0,0 +1,163 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Fuzzy matching of short texts: trigram candidates, checked for word order."""
+import re
+
+from bisect import bisect_left
+from collections import defaultdict
+from difflib import SequenceMatcher
+from typing import Dict, FrozenSet, List, Sequence, Set, Tuple
+
+from .article_index import tokenize
+
+_NEGATION = re.compile(r"\b(?:not|no|never|none|nobody|nothing|neither|nor|without|cannot)\b|n't\b")
+_NUMBER = re.compile(r"\d+(?:[.,]\d+)*")
+# Character similarity at which two terms count as the same word ("strike"/"strikes").
+_TERM_SIMILARITY = 0.8
+
+
+def guard_terms(text: str) -> FrozenSet[str]:
+    """Negation and number tokens that must agree for two texts to match.
+
+    Trigram similarity barely notices a "not" or swapped digits, yet
+    "vaccines do not cause autism" and "3.5 percent" mean something else
+    than "vaccines cause autism" and "5.3 percent".
+    """
+    lowered = text.lower().replace("’", "'")
+    terms = set(_NUMBER.findall(lowered))
+    if _NEGATION.search(lowered):
+        terms.add("<negated>")
+    return frozenset(terms)
+
+
+def _trigrams(terms: Sequence[str]) -> Set[str]:
+    """Character trigrams of the sorted, deduplicated terms.
+
+    Sorting the terms makes the candidate search insensitive to word order,
+    and trigrams tolerate plurals, typos and small rewordings.
+    """
+    padded = f"  {' '.join(sorted(set(terms)))} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+def _dice(x: Set[str], y: Set[str]) -> float:
+    return 2 * len(x & y) / (len(x) + len(y)) if x and y else 0.0
+
+
+def _sequence_similarity(a: Sequence[str], b: Sequence[str]) -> float:
+    """Dice coefficient of the terms that appear in the same order in both texts.
+
+    Each term of `a` is paired with the most similar unused term of `b`, and
+    only the longest run of pairs in increasing position counts, so
+    "russia invaded ukraine" and "ukraine invaded russia" share a single term.
+    """
+    if not a or not b:
+        return 0.0
+    used: Set[int] = set()
+    positions: List[int] = []
+    for term in a:
+        best, best_ratio = -1, _TERM_SIMILARITY
+        for position, other in enumerate(b):
+            if position in used:
+                continue
+            ratio = 1.0 if term == other else SequenceMatcher(None, term, other).ratio()
+            if ratio > best_ratio or (ratio == best_ratio and best < 0):
+                best, best_ratio = position, ratio
+            if ratio == 1.0:
+                break
+        if best >= 0:
+            used.add(best)
+            positions.append(best)
+    # Longest increasing subsequence of the paired positions.
+    tails: List[int] = []
+    for position in positions:
+        index = bisect_left(tails, position)
+        tails[index:index + 1] = [position]
+    return 2 * len(tails) / (len(a) + len(b))
+
+
+def similarity(a: str, b: str) -> float:
+    """How alike two texts are, between 0 and 1, respecting word order.
+
+    The lower of the trigram Dice coefficient and the in-order term overlap,
+    so a reworded text scores high while one with subject and object swapped
+    does not. Texts whose `guard_terms` differ score 0.
+    """
+    if guard_terms(a) != guard_terms(b):
+        return 0.0
+    x, y = tokenize(a), tokenize(b)
+    return min(_dice(_trigrams(x), _trigrams(y)), _sequence_similarity(x, y))
+
+
+class TrigramIndex:
+    """In-memory trigram postings used to find fuzzy matches without a full scan.
+
+    The order-insensitive trigrams only select candidates; each candidate is
+    then scored like `similarity`, so word order still counts. Entries only
+    match texts with the same `guard_terms`.
+    """
+
+    def __init__(self) -> None:
+        self._postings: Dict[str, Set[str]] = defaultdict(set)
+        self._terms: Dict[str, Tuple[str, ...]] = {}
+        self._sizes: Dict[str, int] = {}
+        self._guards: Dict[str, FrozenSet[str]] = {}
+
+    def __len__(self) -> int:
+        return len(self._terms)
+
+    def add(self, entry_id: str, text: str) -> None:
+        """Indexes `text` under `entry_id`; an id already indexed is kept as is."""
+        if entry_id in self._terms:
+            return
+        terms = tuple(tokenize(text))
+        grams = _trigrams(terms)
+        self._terms[entry_id] = terms
+        self._sizes[entry_id] = len(grams)
+        self._guards[entry_id] = guard_terms(text)
+        for gram in grams:
+            self._postings[gram].add(entry_id)
+
+    def remove(self, entry_id: str) -> None:
+        """Drops an entry and its postings; unknown ids are ignored."""
+        terms = self._terms.pop(entry_id, None)
+        if terms is None:
+            return
+        del self._sizes[entry_id], self._guards[entry_id]
+        for gram in _trigrams(terms):
+            postings = self._postings.get(gram)
+            if postings is not None:
+                postings.discard(entry_id)
+                if not postings:
+                    del self._postings[gram]
+
+    def matches(self, text: str, min_similarity: float) -> List[Tuple[float, str]]:
+        """Returns `(similarity, id)` pairs at or above the threshold, best first."""
+        terms = tokenize(text)
+        grams = _trigrams(terms)
+        guard = guard_terms(text)
+        shared: Dict[str, int] = defaultdict(int)
+        for gram in grams:
+            for entry_id in self._postings.get(gram, ()):
+                shared[entry_id] += 1
+        scored = []
+        for entry_id, count in shared.items():
+            dice = 2 * count / (len(grams) + self._sizes[entry_id])
+            if dice < min_similarity or self._guards[entry_id] != guard:
+                continue
+            score = min(dice, _sequence_similarity(terms, self._terms[entry_id]))
+            if score >= min_similarity:
+                scored.append((score, entry_id))
+        return sorted(scored, reverse=True)
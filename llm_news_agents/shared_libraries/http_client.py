@@ -0,0 +1,208 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Process-wide pooled async HTTP client shared by every agent tool."""
+import asyncio
+import logging
+import weakref
+
+from typing import Any, Dict, Optional
+
+import httpx
+
+from .config import env_float, env_int
+from .disk_cache import CachedResponse, get_disk_cache, make_key
+from .rate_limit import Priority, get_scheduler, send_with_backoff
+from .resilience import CircuitOpenError, get_breaker, get_hedger
+
+logger = logging.getLogger(__name__)
+
+# Set headers, including User-Agent, to prevent certain connection errors
+DEFAULT_HEADERS = {
+    "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/58.0.3029.110 Safari/537.36"
+}
+
+# Upstreams that get their own connection pool so that a slow provider cannot
+# starve the others of connections.
+PER_HOST_POOLS = (
+    "https://newsapi.org",
+    "https://newsdata.io",
+    "https://factchecktools.googleapis.com",
+    "https://en.wikipedia.org",
+)
+
+# One client per event loop: httpx connections are bound to the loop that
+# opened them, and the ADK runner, Agent Engine and tests may each use their own.
+_clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, httpx.AsyncClient]" = (
+    weakref.WeakKeyDictionary()
+)
+
+
+def _build_client() -> httpx.AsyncClient:
+    """Creates the pooled client using the `TOOLS_HTTP_*` environment settings."""
+    timeout = httpx.Timeout(
+        env_float("TOOLS_HTTP_TIMEOUT", 10.0),
+        connect=env_float("TOOLS_HTTP_CONNECT_TIMEOUT", 5.0),
+    )
+    keepalive_expiry = env_float("TOOLS_HTTP_KEEPALIVE_EXPIRY", 30.0)
+    host_limits = httpx.Limits(
+        max_connections=env_int("TOOLS_HTTP_MAX_CONNECTIONS_PER_HOST", 20),
+        max_keepalive_connections=env_int("TOOLS_HTTP_MAX_KEEPALIVE_PER_HOST", 10),
+        keepalive_expiry=keepalive_expiry,
+    )
+    mounts = {
+        host: httpx.AsyncHTTPTransport(limits=host_limits, retries=1)
+        for host in PER_HOST_POOLS
+    }
+    return httpx.AsyncClient(
+        headers=DEFAULT_HEADERS,
+        timeout=timeout,
+        limits=httpx.Limits(
+            max_connections=env_int("TOOLS_HTTP_MAX_CONNECTIONS", 100),
+            max_keepalive_connections=env_int("TOOLS_HTTP_MAX_KEEPALIVE", 20),
+            keepalive_expiry=keepalive_expiry,
+        ),
+        mounts=mounts,
+        follow_redirects=True,
+    )
+
+
+def get_http_client() -> httpx.AsyncClient:
+    """Returns the shared client for the running event loop, creating it lazily.
+
+    Returns:
+        httpx.AsyncClient: A keep-alive client with per-host connection pools.
+    """
+    loop = asyncio.get_running_loop()
+    client = _clients.get(loop)
+    if client is None or client.is_closed:
+        client = _build_client()
+        _clients[loop] = client
+    return client
+
+
+async def aclose_http_client() -> None:
+    """Closes the shared client of the running event loop, if one was opened."""
+    client = _clients.pop(asyncio.get_running_loop(), None)
+    if client is not None and not client.is_closed:
+        await client.aclose()
+
+
+async def get(
+    url: str,
+    params: Optional[Dict[str, Any]] = None,
+    headers: Optional[Dict[str, str]] = None,
+    priority: Priority = Priority.NORMAL,
+) -> httpx.Response:
+    """Issues a GET request through the shared pooled client.
+
+    When the disk cache is enabled (`TOOLS_HTTP_CACHE_PATH`), fresh entries
+    are served without touching the network, stale entries carrying an `ETag`
+    or `Last-Modified` validator are revalidated with a conditional request,
+    and cacheable 200 responses are persisted.
+
+    Requests that do reach the network wait for their provider's rate-limit
+    token, are retried with backoff on 429 and 5xx responses, may be hedged
+    when slow, and are refused while the endpoint's circuit breaker is open;
+    a stale disk cache entry is served instead when one exists.
+
+    Args:
+        url (str): The absolute URL to request.
+        params (Optional[Dict[str, Any]]): Query string parameters.
+        headers (Optional[Dict[str, str]]): Extra headers merged over the defaults.
+        priority (Priority): The rate-limit lane to queue in.
+
+    Returns:
+        httpx.Response: The response; status codes are not checked here.
+
+    Raises:
+        RateLimitError: If the provider's quota is exhausted or no rate-limit
+            slot became available in time.
+        CircuitOpenError: If the endpoint's breaker is open and nothing is cached.
+    """
+    client = get_http_client()
+    disk_cache = get_disk_cache()
+    if disk_cache is None:
+        return await _send(client, url, params, headers, priority)
+
+    key = make_key(url, params)
+    cached = await asyncio.to_thread(disk_cache.lookup, key)
+    disk_cache.compact_in_background()
+    if cached is not None and cached.is_fresh():
+        return _replay(cached, url, params)
+
+    request_headers = dict(headers or {})
+    if cached is not None and cached.can_revalidate():
+        request_headers.update(cached.conditional_headers())
+    try:
+        response = await _send(client, url, params, request_headers, priority)
+    except CircuitOpenError:
+        if cached is None:
+            raise
+        logger.info("Serving stale cached response for %s while its circuit is open.", url)
+        return _replay(cached, url, params)
+
+    if response.status_code == 304 and cached is not None:
+        await asyncio.to_thread(disk_cache.refresh, key, response.headers)
+        return _replay(cached, url, params)
+    await asyncio.to_thread(
+        disk_cache.store, key, response.status_code, response.headers, response.content
+    )
+    return response
+
+
+async def _send(
+    client: httpx.AsyncClient,
+    url: str,
+    params: Optional[Dict[str, Any]],
+    headers: Optional[Dict[str, str]],
+    priority: Priority,
+) -> httpx.Response:
+    """Sends the request through the provider's breaker, scheduler and hedger."""
+    scheduler = get_scheduler(url)
+    if scheduler is None:
+        return await client.get(url, params=params, headers=headers)
+
+    breaker = get_breaker(url)
+    if not breaker.allow():
+        raise CircuitOpenError(f"Circuit breaker for {url} is open; not calling upstream.")
+    hedger = get_hedger(url)
+    try:
+        response = await send_with_backoff(
+            scheduler,
+            # Hedges only go out when a token is free right now.
+            lambda: hedger.run(
+                lambda: client.get(url, params=params, headers=headers),
+                may_hedge=scheduler.try_acquire,
+            ),
+            priority=priority,
+            max_attempts=env_int("TOOLS_HTTP_MAX_ATTEMPTS", 3),
+        )
+    except httpx.TransportError:
+        breaker.record(False)
+        raise
+    breaker.record(response.status_code < 500)
+    return response
+
+
+def _replay(
+    cached: CachedResponse, url: str, params: Optional[Dict[str, Any]]
+) -> httpx.Response:
+    """Rebuilds an `httpx.Response` from an on-disk cache entry."""
+    return httpx.Response(
+        cached.status,
+        headers=cached.headers,
+        content=cached.body,
+        request=httpx.Request("GET", url, params=params),
+    )
@@ -0,0 +1,177 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Fast-path routing that answers small talk without running the news pipeline."""
+import logging
+import os
+import re
+
+from typing import Any, Optional
+
+from google import genai
+from google.genai import types
+
+from .config import env_bool, env_int
+
+logger = logging.getLogger(__name__)
+
+GREETING = "greeting"
+THANKS = "thanks"
+CHITCHAT = "chitchat"
+CLARIFICATION = "clarification"
+FOLLOW_UP = "follow_up"
+TOPIC = "topic"
+
+# Set by the investigative stage; its presence means there is a report to follow up on.
+PREVIOUS_REPORT_KEY = "investigative_report"
+
+_GREETINGS = (
+    "good morning", "good afternoon", "good evening", "hello there", "hi there",
+    "hello", "hiya", "hey", "hi", "howdy", "greetings", "yo",
+)
+_PHRASES = {
+    THANKS: {
+        "thanks", "thank you", "thanks a lot", "thank you very much", "thx", "cheers",
+        "bye", "goodbye", "see you", "ok", "okay", "cool", "great", "nice", "perfect",
+    },
+    CHITCHAT: {
+        "how are you", "how are you doing", "whats up", "who are you", "what are you",
+        "what can you do", "what do you do", "help", "how does this work", "are you a bot",
+    },
+    CLARIFICATION: {
+        "what", "huh", "sorry", "what do you mean", "can you clarify", "i dont understand",
+    },
+    FOLLOW_UP: {
+        "explain", "more", "tell me more", "go on", "continue", "and", "keep going",
+        "more details", "what else", "anything else", "dig deeper", "go deeper",
+    },
+}
+_REPLIES = {
+    GREETING: (
+        "Hello! I investigate news topics. Tell me an event, story or claim you "
+        "would like checked and I will research it, fact-check it and write up a "
+        "report with references."
+    ),
+    THANKS: "You're welcome! Send me another topic or claim whenever you'd like it investigated.",
+    CHITCHAT: (
+        "I'm a news investigation assistant: I research an event, fact-check the "
+        "claims around it and produce an edited report with references. What "
+        "would you like me to look into?"
+    ),
+    CLARIFICATION: (
+        "Could you tell me which news topic, event or claim you'd like me to "
+        "investigate? A headline or a sentence is enough."
+    ),
+}
+_ROUTER_PROMPT = (
+    "Classify the user message for a news investigation assistant. Answer TOPIC "
+    "if it names a news topic, event, person or claim to investigate, otherwise "
+    "answer CHAT.\n\nMessage: "
+)
+
+_client: Optional[genai.Client] = None
+
+
+def _normalise(text: str) -> str:
+    return re.sub(r"\s+", " ", re.sub(r"[^\w\s]", "", text.lower())).strip()
+
+
+def has_attachments(content: Optional[types.Content]) -> bool:
+    """Whether a user message carries inline or referenced files."""
+    return any(part.inline_data or part.file_data for part in (content.parts or [])) if content else False
+
+
+def classify_intent(text: str) -> str:
+    """Classifies a user message with cheap local rules.
+
+    Leading greetings are stripped first, so "Hi, what happened in Lagos?"
+    is still a topic while "Hi!" alone is a greeting.
+
+    Returns:
+        str: One of `greeting`, `thanks`, `chitchat`, `clarification`,
+            `follow_up` or `topic`.
+    """
+    remainder = _normalise(text)
+    stripped = True
+    while stripped:
+        stripped = False
+        for greeting in _GREETINGS:
+            if remainder == greeting or remainder.startswith(greeting + " "):
+                remainder = remainder[len(greeting):].strip()
+                stripped = True
+                break
+    if not remainder:
+        return GREETING
+    for intent, phrases in _PHRASES.items():
+        if remainder in phrases:
+            return intent
+    return TOPIC
+
+
+async def _model_says_topic(text: str, model: str) -> bool:
+    """Asks a small model whether an ambiguous short message is a real topic."""
+    global _client
+    try:
+        if _client is None:
+            _client = genai.Client()
+        response = await _client.aio.models.generate_content(
+            model=model,
+            contents=_ROUTER_PROMPT + text,
+            config=types.GenerateContentConfig(temperature=0, max_output_tokens=2),
+        )
+        return "CHAT" not in (response.text or "").upper()
+    except Exception as e:
+        # Routing must never block an investigation; run the pipeline instead.
+        logger.warning("Intent router model failed, running the pipeline: %s", e)
+        return True
+
+
+async def route_intent(callback_context: Any) -> Optional[types.Content]:
+    """`before_agent_callback` that replies to small talk without running the pipeline.
+
+    Greetings, thanks, chit-chat and bare clarification requests get a fixed
+    reply and end the invocation. Follow-ups such as "tell me more" and
+    messages without text continue the investigation when the session
+    already holds a report, and are otherwise asked to name a topic;
+    messages with attachments always run the pipeline. If
+    `INTENT_ROUTER_MODEL` names a model, short messages the rules take for
+    topics (at most `INTENT_ROUTER_MODEL_MAX_WORDS` words) are
+    double-checked with it. `INTENT_ROUTER_ENABLED=0` turns routing off.
+
+    Returns:
+        Optional[types.Content]: The reply, or None to run the pipeline.
+    """
+    if not env_bool("INTENT_ROUTER_ENABLED", True):
+        return None
+    content = callback_context.user_content
+    if has_attachments(content):
+        return None
+    text = " ".join(part.text for part in (content.parts or []) if part.text) if content else ""
+    intent = classify_intent(text) if text.strip() else FOLLOW_UP
+    if intent == FOLLOW_UP:
+        if callback_context.state.get(PREVIOUS_REPORT_KEY):
+            return None
+        intent = CLARIFICATION
+    model = os.getenv("INTENT_ROUTER_MODEL")
+    if (
+        intent == TOPIC
+        and model
+        and len(text.split()) <= env_int("INTENT_ROUTER_MODEL_MAX_WORDS", 6)
+        and not await _model_says_topic(text, model)
+    ):
+        intent = CHITCHAT
+    if intent == TOPIC:
+        return None
+    logger.info("Answered %s message without running the pipeline.", intent)
+    return types.Content(role="model", parts=[types.Part(text=_REPLIES[intent])])
@@ -0,0 +1,86 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Runner plugin that manages the lifecycle of the shared tool infrastructure."""
+import asyncio
+import json
+import logging
+
+from typing import Any, Callable, Dict
+
+from google.adk.agents.invocation_context import InvocationContext
+from google.adk.plugins.base_plugin import BasePlugin
+
+from .article_index import close_article_index
+from .compaction import compaction_stats
+from .config import env_bool
+from .disk_cache import get_disk_cache
+from .http_client import aclose_http_client
+from .rate_limit import rate_limit_stats
+from .resilience import resilience_stats
+
+logger = logging.getLogger(__name__)
+
+_stats_sources: Dict[str, Callable[[], Any]] = {}
+
+
+def register_stats(name: str, source: Callable[[], Any]) -> None:
+    """Adds a counter source, e.g. a cache's `stats`, to the per-run stats log line."""
+    _stats_sources[name] = source
+
+
+def tool_stats() -> Dict[str, Any]:
+    """Collects the counters of every registered source.
+
+    A failing source is reported as its error rather than hiding the others.
+    """
+    stats = {}
+    for name, source in _stats_sources.items():
+        try:
+            stats[name] = source()
+        except Exception as e:
+            stats[name] = f"unavailable: {e}"
+    return stats
+
+
+register_stats("compaction", compaction_stats)
+register_stats("rate_limits", rate_limit_stats)
+register_stats("resilience", resilience_stats)
+register_stats("http_disk_cache", lambda: get_disk_cache().stats() if get_disk_cache() else None)
+
+
+class ToolsLifecyclePlugin(BasePlugin):
+    """Reports and releases process-wide tool resources.
+
+    After every run the counters of the registered sources are logged as
+    one JSON line (`TOOLS_STATS_LOG=0` turns this off). The pooled HTTP
+    client and the article index outlive individual invocations, so they
+    are released from the runner's `close()` rather than by the tools that
+    use them; closing the index writes its pending documents to disk.
+    """
+
+    def __init__(self, name: str = "tools_lifecycle") -> None:
+        super().__init__(name=name)
+
+    async def after_run_callback(self, *, invocation_context: InvocationContext) -> None:
+        if env_bool("TOOLS_STATS_LOG", True):
+            logger.info(
+                "Tool stats after invocation %s: %s",
+                invocation_context.invocation_id,
+                json.dumps(tool_stats(), default=str, sort_keys=True),
+            )
+
+    async def close(self) -> None:
+        await aclose_http_client()
+        await asyncio.to_thread(close_article_index)
+        logger.info("Closed the shared tool HTTP client and article index.")
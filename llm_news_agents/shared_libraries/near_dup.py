@@ -0,0 +1,94 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""SimHash-based near-duplicate collapsing for syndicated news articles."""
+import dataclasses
+import hashlib
+import logging
+import re
+
+from typing import List, Tuple
+
+from .news_engine import Article
+
+logger = logging.getLogger(__name__)
+
+_WORD = re.compile(r"[a-z0-9]+")
+_BITS = 64
+
+
+def _features(text: str) -> List[str]:
+    """Word unigrams and bigrams of the lowercased text."""
+    words = _WORD.findall(text.lower())
+    return words + [f"{a} {b}" for a, b in zip(words, words[1:])]
+
+
+def simhash(text: str) -> int:
+    """Computes a 64-bit SimHash fingerprint of `text`.
+
+    Similar texts get fingerprints that differ in few bits, so near
+    duplicates are found by Hamming distance rather than exact equality.
+    """
+    counts = [0] * _BITS
+    for feature in _features(text):
+        value = int.from_bytes(hashlib.blake2b(feature.encode("utf-8"), digest_size=8).digest(), "big")
+        for bit in range(_BITS):
+            counts[bit] += 1 if value >> bit & 1 else -1
+    return sum(1 << bit for bit, count in enumerate(counts) if count > 0)
+
+
+def hamming(a: int, b: int) -> int:
+    """Number of differing bits between two fingerprints."""
+    return (a ^ b).bit_count()
+
+
+def collapse_near_duplicates(
+    articles: List[Article], max_distance: int = 12
+) -> Tuple[List[Article], int]:
+    """Merges syndicated copies of the same story into a single article.
+
+    Fingerprints cover title and description. The first copy of a story is
+    kept and the outlets of later copies are listed in its `other_sources`;
+    kept articles are copies, so cached input lists are never modified.
+    Unrelated texts sit around 32 bits apart, so the default threshold
+    leaves a wide margin. Comparing fingerprints is a single XOR and
+    popcount per pair, which is cheap for the tens of articles a tool call
+    returns.
+
+    Args:
+        articles (List[Article]): Articles in ranking order.
+        max_distance (int): Largest Hamming distance treated as a duplicate.
+
+    Returns:
+        Tuple[List[Article], int]: The collapsed list and the estimated tokens
+            saved by dropping the duplicates.
+    """
+    kept: List[Tuple[int, Article]] = []
+    saved_tokens = 0
+    for article in articles:
+        fingerprint = simhash(f"{article.title or ''} {article.description or ''}")
+        original = next(
+            (kept_article for kept_fp, kept_article in kept if hamming(fingerprint, kept_fp) <= max_distance),
+            None,
+        )
+        if original is None:
+            kept.append(
+                (fingerprint, dataclasses.replace(article, other_sources=list(article.other_sources)))
+            )
+            continue
+        saved_tokens += article.estimated_tokens()
+        for source in [article.source, *article.other_sources]:
+            if source and source != original.source and source not in original.other_sources:
+                original.other_sources.append(source)
+    return [article for _, article in kept], saved_tokens
@@ -0,0 +1,575 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Multi-provider news retrieval with a single normalised article schema."""
+import abc
+import asyncio
+import json
+import logging
+import os
+import time
+
+from dataclasses import asdict, dataclass, field
+from datetime import datetime, timedelta
+from typing import Any, AsyncIterator, Dict, Iterable, List, Optional, Sequence, Tuple
+from urllib.parse import parse_qsl, urlencode, urlsplit
+
+from . import http_client
+from .cache import TTLCache, normalise_query
+from .config import env_float, env_int
+from .single_flight import SingleFlight
+
+logger = logging.getLogger(__name__)
+
+DATE_FORMAT = "%Y-%m-%d"
+
+# Tracking parameters that do not change which article a URL points to.
+_TRACKING_PARAMS = ("utm_", "fbclid", "gclid", "ref", "cmpid", "ocid")
+
+
+@dataclass
+class Article:
+    """A news article in the schema shared by every provider.
+
+    Attributes:
+        source (Optional[str]): Name of the publishing outlet.
+        title (Optional[str]): Headline.
+        description (Optional[str]): Short summary or lede.
+        url (Optional[str]): Link to the article.
+        published_at (Optional[str]): Publication time as reported upstream.
+        provider (str): The retrieval provider that returned the article.
+        other_sources (List[str]): Further outlets that ran the same story.
+    """
+
+    source: Optional[str]
+    title: Optional[str]
+    description: Optional[str]
+    url: Optional[str]
+    published_at: Optional[str] = None
+    provider: str = ""
+    other_sources: List[str] = field(default_factory=list)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Returns the article as a plain dictionary for tool output."""
+        return asdict(self)
+
+    def estimated_tokens(self) -> int:
+        """Roughly estimates the tokens this article costs in the model context."""
+        text = "".join(
+            value for value in (self.source, self.title, self.description, self.url) if value
+        )
+        # About four characters per token for English text, plus key overhead.
+        return len(text) // 4 + 12
+
+
+def canonical_url(url: Optional[str]) -> str:
+    """Normalises a URL so syndicated copies of one link compare equal.
+
+    Drops the scheme, a leading `www.`, trailing slashes, fragments and
+    tracking query parameters, and lowercases the host.
+    """
+    if not url:
+        return ""
+    parts = urlsplit(url.strip())
+    host = (parts.hostname or "").lower()
+    if host.startswith("www."):
+        host = host[4:]
+    query = [
+        (name, value)
+        for name, value in parse_qsl(parts.query)
+        if not name.lower().startswith(_TRACKING_PARAMS)
+    ]
+    canonical = f"{host}{parts.path.rstrip('/')}"
+    return f"{canonical}?{urlencode(sorted(query))}" if query else canonical
+
+
+def resolve_window(
+    from_date: Optional[str], to_date: Optional[str], default_days: int = 7
+) -> Tuple[str, str]:
+    """Validates a date window and fills in defaults.
+
+    Args:
+        from_date (Optional[str]): Oldest date (YYYY-MM-DD); defaults to
+            `default_days` before `to_date`.
+        to_date (Optional[str]): Newest date (YYYY-MM-DD); defaults to today.
+        default_days (int): Window length used when `from_date` is missing.
+
+    Returns:
+        Tuple[str, str]: The `(from_date, to_date)` pair as YYYY-MM-DD strings.
+
+    Raises:
+        ValueError: If a date is not in YYYY-MM-DD format.
+    """
+    if to_date is None:
+        to_dt = datetime.now()
+    else:
+        try:
+            to_dt = datetime.strptime(to_date, DATE_FORMAT)
+        except ValueError:
+            raise ValueError("to_date must be in YYYY-MM-DD format.")
+    if from_date is None:
+        from_dt = to_dt - timedelta(days=default_days)
+    else:
+        try:
+            from_dt = datetime.strptime(from_date, DATE_FORMAT)
+        except ValueError:
+            raise ValueError("from_date must be in YYYY-MM-DD format.")
+    return from_dt.strftime(DATE_FORMAT), to_dt.strftime(DATE_FORMAT)
+
+
+class PlanLimitError(Exception):
+    """Raised when a provider refuses a request that exceeds the account's plan."""
+
+
+class NewsProvider(abc.ABC):
+    """Base class for a pluggable news source.
+
+    Subclasses implement `search` and return articles already normalised to
+    `Article`; they may raise on failure, which the engine logs and skips.
+    Providers that can only reach page N after reading page N-1 (cursor
+    pagination) set `concurrent_pages` to False.
+    """
+
+    name = "provider"
+    concurrent_pages = True
+
+    @abc.abstractmethod
+    async def search(
+        self, query: str, from_date: str, to_date: str, page: int = 1, page_size: int = 5
+    ) -> List[Article]:
+        """Returns one page of articles matching `query` within the window."""
+
+    def stats(self) -> Dict[str, Any]:
+        """Returns the provider's cache and coalescing counters, if it has any."""
+        return {}
+
+
+class NewsApiProvider(NewsProvider):
+    """NewsAPI's 'everything' endpoint, cached and coalesced in-process.
+
+    The free plan only serves the last 30 days, so the start of the window is
+    clamped to `max_age_days` ago (29 by default, `NEWSAPI_MAX_AGE_DAYS` for
+    paid plans) and windows that end before that are not requested at all.
+    """
+
+    name = "newsapi"
+    url = "https://newsapi.org/v2/everything"
+
+    def __init__(self, api_key: str) -> None:
+        self.api_key = api_key
+        self.max_age_days = env_int("NEWSAPI_MAX_AGE_DAYS", 29)
+        # Identical queries within the TTL never leave the process.
+        self.cache = TTLCache(
+            ttl_seconds=env_float("NEWS_CACHE_TTL_SECONDS", 300.0),
+            max_entries=env_int("NEWS_CACHE_MAX_ENTRIES", 512),
+            max_bytes=env_int("NEWS_CACHE_MAX_BYTES", 8 * 1024 * 1024),
+        )
+        # Concurrent identical misses share one upstream request.
+        self.flights = SingleFlight(self.name)
+
+    def stats(self) -> Dict[str, Any]:
+        return {"cache": self.cache.stats(), "flights": self.flights.stats()}
+
+    def oldest_date(self) -> str:
+        """Returns the oldest date the plan serves."""
+        return (datetime.now() - timedelta(days=self.max_age_days)).strftime(DATE_FORMAT)
+
+    def clamp(self, from_date: str) -> str:
+        """Moves `from_date` forward to the oldest date the plan allows."""
+        oldest = self.oldest_date()
+        if from_date >= oldest:
+            return from_date
+        logger.info("Notice: '%s' is too old for the Free Plan. Adjusting to '%s'.", from_date, oldest)
+        return oldest
+
+    async def search(
+        self, query: str, from_date: str, to_date: str, page: int = 1, page_size: int = 5
+    ) -> List[Article]:
+        if to_date < self.oldest_date():
+            # The whole window predates the plan's horizon.
+            return []
+        params = {
+            "q": query,
+            "from": self.clamp(from_date),
+            "to": to_date,
+            "sortBy": "relevancy",
+            "pageSize": page_size,
+            "page": page,
+            "language": "en",
+            "apiKey": self.api_key,
+        }
+        key = (normalise_query(query), params["from"], to_date, page_size, page)
+        raw = self.cache.get(key)
+        if raw is None:
+            raw = await self.flights.do(key, lambda: self._fetch(key, params))
+        return [
+            Article(
+                source=(article.get("source") or {}).get("name"),
+                title=article.get("title"),
+                description=article.get("description"),
+                url=article.get("url"),
+                published_at=article.get("publishedAt"),
+                provider=self.name,
+            )
+            for article in raw
+        ]
+
+    async def _fetch(self, key: tuple, params: Dict[str, Any]) -> List[Dict[str, Any]]:
+        response = await http_client.get(self.url, params=params)
+        # Specific handling for the 426 error if it somehow slips through
+        if response.status_code == 426:
+            raise PlanLimitError("NewsAPI Error: 426 Upgrade Required. You are trying to access data too far back for your plan.")
+        response.raise_for_status()
+        articles = response.json().get("articles", [])
+        self.cache.set(key, articles)
+        return articles
+
+
+class NewsDataProvider(NewsProvider):
+    """NewsData.io's 'latest' endpoint.
+
+    The `newsdataapi` client is synchronous and issues its own `requests`
+    calls, so the same REST endpoint is called through the shared pooled
+    client instead; results outside the window are filtered out locally.
+    """
+
+    name = "newsdata"
+    url = "https://newsdata.io/api/1/latest"
+    concurrent_pages = False
+
+    def __init__(self, api_key: str) -> None:
+        self.api_key = api_key
+        self.cache = TTLCache(
+            ttl_seconds=env_float("NEWS_CACHE_TTL_SECONDS", 300.0),
+            max_entries=env_int("NEWS_CACHE_MAX_ENTRIES", 512),
+            max_bytes=env_int("NEWS_CACHE_MAX_BYTES", 8 * 1024 * 1024),
+        )
+        self.flights = SingleFlight(self.name)
+        # NewsData pages with opaque cursors; remember them per query, bounded
+        # and expiring with the pages they were read from.
+        self._cursors = TTLCache(
+            ttl_seconds=env_float("NEWS_CACHE_TTL_SECONDS", 300.0),
+            max_entries=env_int("NEWS_CURSOR_MAX_ENTRIES", 1024),
+            max_bytes=1024 * 1024,
+        )
+
+    def stats(self) -> Dict[str, Any]:
+        return {"cache": self.cache.stats(), "flights": self.flights.stats()}
+
+    async def search(
+        self, query: str, from_date: str, to_date: str, page: int = 1, page_size: int = 5
+    ) -> List[Article]:
+        base_key = (normalise_query(query), min(page_size, 10))
+        params = {"apikey": self.api_key, "q": query, "language": "en", "size": min(page_size, 10)}
+        if page > 1:
+            cursor = self._cursors.get(base_key + (page,))
+            if cursor is None:
+                return []
+            params["page"] = cursor
+        key = base_key + (page,)
+        payload = self.cache.get(key)
+        if payload is None:
+            payload = await self.flights.do(key, lambda: self._fetch(key, params))
+        if payload.get("nextPage"):
+            self._cursors.set(base_key + (page + 1,), payload["nextPage"])
+
+        articles = []
+        for item in payload.get("results") or []:
+            published = (item.get("pubDate") or "")[:10]
+            if published and not (from_date <= published <= to_date):
+                continue
+            articles.append(
+                Article(
+                    source=item.get("source_name") or item.get("source_id"),
+                    title=item.get("title"),
+                    description=item.get("description"),
+                    url=item.get("link"),
+                    published_at=item.get("pubDate"),
+                    provider=self.name,
+                )
+            )
+        return articles
+
+    async def _fetch(self, key: tuple, params: Dict[str, Any]) -> Dict[str, Any]:
+        response = await http_client.get(self.url, params=params)
+        response.raise_for_status()
+        payload = response.json()
+        self.cache.set(key, payload)
+        return payload
+
+
+class LocalNewsProvider(NewsProvider):
+    """An in-memory stand-in provider for offline runs and tests.
+
+    Articles match when every query term appears in their title or
+    description.
+
+    Args:
+        articles (Sequence[Dict[str, Any]]): Articles in the `Article` schema.
+    """
+
+    name = "local"
+
+    def __init__(self, articles: Sequence[Dict[str, Any]]) -> None:
+        self.articles = [
+            Article(**{**article, "provider": article.get("provider") or self.name})
+            for article in articles
+        ]
+
+    @classmethod
+    def from_file(cls, path: str) -> "LocalNewsProvider":
+        """Loads articles from a JSON file holding a list of article objects."""
+        with open(path, encoding="utf-8") as f:
+            return cls(json.load(f))
+
+    async def search(
+        self, query: str, from_date: str, to_date: str, page: int = 1, page_size: int = 5
+    ) -> List[Article]:
+        terms = normalise_query(query).split()
+        matches = []
+        for article in self.articles:
+            text = f"{article.title or ''} {article.description or ''}".lower()
+            published = (article.published_at or "")[:10]
+            if published and not (from_date <= published <= to_date):
+                continue
+            if all(term in text for term in terms):
+                matches.append(article)
+        start = (page - 1) * page_size
+        return matches[start:start + page_size]
+
+
+@dataclass
+class NewsEngine:
+    """Fans a query out to every provider and merges the answers.
+
+    Providers are queried concurrently. Whatever has arrived when
+    `latency_budget` expires is used and slower providers are cancelled.
+    Results are deduplicated by canonical URL and normalised title, keeping
+    the copy from the earliest provider in `providers` order.
+
+    Attributes:
+        providers (List[NewsProvider]): The providers, in preference order.
+        latency_budget (float): Seconds to wait for providers before merging.
+    """
+
+    providers: List[NewsProvider] = field(default_factory=list)
+    latency_budget: float = 8.0
+
+    async def search(
+        self,
+        query: str,
+        from_date: str,
+        to_date: str,
+        page: int = 1,
+        page_size: int = 5,
+    ) -> List[Article]:
+        """Returns deduplicated articles from all providers that answered in time."""
+        articles, _ = await self.search_with_status(query, from_date, to_date, page, page_size)
+        return articles
+
+    async def search_with_status(
+        self,
+        query: str,
+        from_date: str,
+        to_date: str,
+        page: int = 1,
+        page_size: int = 5,
+    ) -> Tuple[List[Article], int]:
+        """Like `search`, also returning how many providers answered.
+
+        An empty list from providers that answered means there is no news;
+        from none, it only means every provider failed or timed out.
+        """
+        if not self.providers:
+            return [], 0
+        started = time.monotonic()
+        tasks = [
+            asyncio.ensure_future(provider.search(query, from_date, to_date, page, page_size))
+            for provider in self.providers
+        ]
+        done, pending = await asyncio.wait(tasks, timeout=self.latency_budget)
+        for task in pending:
+            task.cancel()
+
+        results: List[List[Article]] = []
+        for provider, task in zip(self.providers, tasks):
+            if task in pending:
+                logger.warning("News provider %s exceeded the %.1fs budget.", provider.name, self.latency_budget)
+                continue
+            if task.cancelled():
+                logger.warning("News provider %s was cancelled.", provider.name)
+                continue
+            if task.exception() is not None:
+                logger.warning("News provider %s failed: %s", provider.name, task.exception())
+                continue
+            results.append(task.result())
+        logger.debug("News engine answered %r in %.3fs.", query, time.monotonic() - started)
+        return dedupe_articles(article for batch in results for article in batch), len(results)
+
+    async def stream(
+        self,
+        query: str,
+        from_date: str,
+        to_date: str,
+        max_articles: int = 20,
+        max_tokens: Optional[int] = None,
+        page_size: int = 5,
+        max_pages: int = 3,
+    ) -> AsyncIterator[Article]:
+        """Yields deduplicated articles from every provider as pages arrive.
+
+        Each provider starts at page 1. Providers with random page access
+        keep one page of lookahead in flight, so page N+1 is already being
+        fetched while page N is read; cursor-paginated providers fetch
+        sequentially. A provider stops after a short page or `max_pages`.
+        The stream ends once `max_articles` or `max_tokens` is reached or
+        `latency_budget` runs out, and outstanding requests are cancelled.
+
+        Args:
+            query (str): The keyword or phrase to search for.
+            from_date (str): Oldest date (YYYY-MM-DD).
+            to_date (str): Newest date (YYYY-MM-DD).
+            max_articles (int): Maximum number of articles to yield.
+            max_tokens (Optional[int]): Maximum estimated tokens to yield.
+            page_size (int): Articles requested per page.
+            max_pages (int): Pages fetched at most per provider.
+
+        Yields:
+            Article: Each new article, in arrival order.
+        """
+        deadline = time.monotonic() + self.latency_budget
+        deduper = _Deduper()
+        in_flight: Dict["asyncio.Future[List[Article]]", Tuple[NewsProvider, int]] = {}
+        launched: Dict[str, int] = {}
+        exhausted: set = set()
+        yielded = tokens = 0
+
+        def launch(provider: NewsProvider, page: int) -> None:
+            if page > max_pages or provider.name in exhausted or launched.get(provider.name, 0) >= page:
+                return
+            launched[provider.name] = page
+            task = asyncio.ensure_future(provider.search(query, from_date, to_date, page, page_size))
+            in_flight[task] = (provider, page)
+
+        for provider in self.providers:
+            launch(provider, 1)
+            if provider.concurrent_pages:
+                launch(provider, 2)
+
+        try:
+            while in_flight:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    logger.warning("News stream for %r hit the %.1fs budget.", query, self.latency_budget)
+                    return
+                done, _ = await asyncio.wait(
+                    in_flight, timeout=remaining, return_when=asyncio.FIRST_COMPLETED
+                )
+                for task in done:
+                    provider, page = in_flight.pop(task)
+                    if task.cancelled() or task.exception() is not None:
+                        error = "cancelled" if task.cancelled() else task.exception()
+                        logger.warning("News provider %s failed on page %d: %s", provider.name, page, error)
+                        exhausted.add(provider.name)
+                        continue
+                    batch = task.result()
+                    if len(batch) < page_size:
+                        exhausted.add(provider.name)
+                    else:
+                        launch(provider, page + 1)
+                        if provider.concurrent_pages:
+                            launch(provider, page + 2)
+                    for article in batch:
+                        if not deduper.add(article):
+                            continue
+                        cost = article.estimated_tokens()
+                        if max_tokens is not None and tokens + cost > max_tokens:
+                            return
+                        tokens += cost
+                        yielded += 1
+                        yield article
+                        if yielded >= max_articles:
+                            return
+        finally:
+            for task in in_flight:
+                task.cancel()
+
+    async def collect(
+        self,
+        query: str,
+        from_date: str,
+        to_date: str,
+        max_articles: int = 20,
+        max_tokens: Optional[int] = None,
+        page_size: int = 5,
+        max_pages: int = 3,
+    ) -> List[Article]:
+        """Gathers `stream` into one bounded list, for single-call tool results."""
+        return [
+            article
+            async for article in self.stream(
+                query, from_date, to_date, max_articles, max_tokens, page_size, max_pages
+            )
+        ]
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        """Returns each provider's cache and coalescing counters."""
+        return {provider.name: provider.stats() for provider in self.providers}
+
+
+class _Deduper:
+    """Tracks articles already seen, keyed by canonical URL and normalised title."""
+
+    def __init__(self) -> None:
+        self._by_key: Dict[str, Article] = {}
+
+    def add(self, article: Article) -> bool:
+        """Records an article; returns False if it repeats one already seen.
+
+        When a repeat carries a description the kept copy lacks, it is
+        borrowed so no information is lost.
+        """
+        keys = [k for k in (canonical_url(article.url), normalise_query(article.title or "")) if k]
+        existing = next((self._by_key[k] for k in keys if k in self._by_key), None)
+        if existing is not None:
+            if not existing.description and article.description:
+                existing.description = article.description
+            return False
+        for k in keys:
+            self._by_key[k] = article
+        return True
+
+
+def dedupe_articles(articles: Iterable[Article]) -> List[Article]:
+    """Drops repeated articles, keeping the first copy of each."""
+    deduper = _Deduper()
+    return [article for article in articles if deduper.add(article)]
+
+
+def build_default_engine() -> NewsEngine:
+    """Builds the engine from whichever providers are configured.
+
+    NewsAPI is enabled by `NEWSAPI_KEY`, NewsData by `NEWSDATA_API_KEY`, and a
+    local stand-in by `NEWS_LOCAL_ARTICLES_PATH` pointing at a JSON file.
+    """
+    providers: List[NewsProvider] = []
+    if os.getenv("NEWSAPI_KEY"):
+        providers.append(NewsApiProvider(os.environ["NEWSAPI_KEY"]))
+    if os.getenv("NEWSDATA_API_KEY"):
+        providers.append(NewsDataProvider(os.environ["NEWSDATA_API_KEY"]))
+    if os.getenv("NEWS_LOCAL_ARTICLES_PATH"):
+        providers.append(LocalNewsProvider.from_file(os.environ["NEWS_LOCAL_ARTICLES_PATH"]))
+    if not providers:
+        logger.warning("No news providers configured; set NEWSAPI_KEY or NEWSDATA_API_KEY.")
+    return NewsEngine(providers, latency_budget=env_float("NEWS_ENGINE_LATENCY_BUDGET", 8.0))
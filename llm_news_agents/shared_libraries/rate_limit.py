@@ -0,0 +1,326 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Quota-aware token-bucket scheduling and backoff for upstream tool APIs."""
+import asyncio
+import email.utils
+import heapq
+import itertools
+import logging
+import random
+import time
+
+from datetime import datetime, timezone
+from enum import IntEnum
+from typing import Awaitable, Callable, Dict, List, Optional, Tuple
+from urllib.parse import urlsplit
+
+import httpx
+
+from .config import env_float, env_int
+
+logger = logging.getLogger(__name__)
+
+# Status codes worth retrying after a pause.
+RETRYABLE_STATUS_CODES = frozenset({429, 500, 502, 503, 504})
+
+
+class Priority(IntEnum):
+    """Scheduling lanes; lower values are served first."""
+
+    HIGH = 0
+    NORMAL = 1
+    LOW = 2
+
+
+class RateLimitError(Exception):
+    """Raised when a call cannot be scheduled within the provider's limits."""
+
+
+class QuotaExceededError(RateLimitError):
+    """Raised when the provider's daily quota has been used up."""
+
+
+class RateLimitTimeoutError(RateLimitError):
+    """Raised when a call waited longer than `max_wait` for a token."""
+
+
+class ProviderScheduler:
+    """Token bucket with a daily quota and priority-ordered waiting.
+
+    Tokens refill continuously at `rate` per second up to `burst`. Callers
+    that find the bucket empty queue by priority (then arrival order) and are
+    released one token at a time, so throughput stays at the configured
+    ceiling instead of bursting into 429s. A 429 pauses the whole bucket for
+    the advertised `Retry-After`.
+
+    Args:
+        name (str): Provider label used in logs and errors.
+        rate (float): Sustained requests per second.
+        burst (int): Maximum tokens that can accumulate.
+        daily_quota (int): Requests allowed per UTC day; 0 disables the check.
+        max_wait (float): Longest a caller may queue before giving up.
+        clock (Callable[[], float]): Monotonic time source, injectable for tests.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        rate: float,
+        burst: int,
+        daily_quota: int = 0,
+        max_wait: float = 10.0,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.name = name
+        self.rate = rate
+        self.burst = burst
+        self.daily_quota = daily_quota
+        self.max_wait = max_wait
+        self._clock = clock
+        self._tokens = float(burst)
+        self._updated = clock()
+        self._paused_until = 0.0
+        self._day = self._today()
+        self.used_today = 0
+        self.granted = 0
+        self.queued = 0
+        self.timed_out = 0
+        self._waiters: List[Tuple[int, int, "asyncio.Future[None]"]] = []
+        self._sequence = itertools.count()
+        self._dispatcher: Optional[asyncio.Task] = None
+
+    @staticmethod
+    def _today() -> str:
+        return datetime.now(timezone.utc).strftime("%Y-%m-%d")
+
+    def _refill(self) -> None:
+        now = self._clock()
+        self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def _delay_until_token(self) -> float:
+        """Seconds until a token can be granted, taking pauses into account."""
+        self._refill()
+        now = self._clock()
+        if self._paused_until > now:
+            return self._paused_until - now
+        if self._tokens >= 1:
+            return 0.0
+        return (1 - self._tokens) / self.rate
+
+    def _check_quota(self) -> None:
+        today = self._today()
+        if today != self._day:
+            self._day = today
+            self.used_today = 0
+        if self.daily_quota and self.used_today >= self.daily_quota:
+            raise QuotaExceededError(
+                f"{self.name} daily quota of {self.daily_quota} requests is exhausted."
+            )
+
+    def _grant(self) -> None:
+        self._tokens -= 1
+        self.used_today += 1
+        self.granted += 1
+
+    def try_acquire(self) -> bool:
+        """Takes a token only if one is free right now and nobody is queued.
+
+        Used for optional extra requests, such as hedges, that should never
+        wait or push real callers back in the queue.
+        """
+        if self._waiters or self._delay_until_token() > 0:
+            return False
+        try:
+            self._check_quota()
+        except QuotaExceededError:
+            return False
+        self._grant()
+        return True
+
+    async def acquire(self, priority: Priority = Priority.NORMAL) -> None:
+        """Waits for a token in the given priority lane.
+
+        Raises:
+            QuotaExceededError: If the daily quota is already used up.
+            RateLimitTimeoutError: If no token was granted within `max_wait`.
+        """
+        self._check_quota()
+        if not self._waiters and self._delay_until_token() == 0:
+            self._grant()
+            return
+
+        loop = asyncio.get_running_loop()
+        future: "asyncio.Future[None]" = loop.create_future()
+        heapq.heappush(self._waiters, (int(priority), next(self._sequence), future))
+        self.queued += 1
+        if self._dispatcher is None or self._dispatcher.done():
+            self._dispatcher = loop.create_task(self._dispatch())
+        try:
+            await asyncio.wait_for(future, self.max_wait)
+        except asyncio.TimeoutError:
+            self.timed_out += 1
+            raise RateLimitTimeoutError(
+                f"Waited more than {self.max_wait:.1f}s for a {self.name} rate-limit slot."
+            ) from None
+
+    async def _dispatch(self) -> None:
+        """Releases queued callers one token at a time in priority order."""
+        while self._waiters:
+            delay = self._delay_until_token()
+            if delay > 0:
+                await asyncio.sleep(delay)
+                continue
+            _, _, future = heapq.heappop(self._waiters)
+            if future.done():
+                # The caller timed out or was cancelled while queued.
+                continue
+            try:
+                self._check_quota()
+            except QuotaExceededError as exc:
+                future.set_exception(exc)
+                continue
+            self._grant()
+            future.set_result(None)
+
+    def pause(self, seconds: float) -> None:
+        """Stops granting tokens for `seconds`, e.g. after a 429 response."""
+        self._paused_until = max(self._paused_until, self._clock() + seconds)
+        logger.warning("%s rate limited; pausing for %.1fs.", self.name, seconds)
+
+    def stats(self) -> Dict[str, int]:
+        """Returns usage counters for observability."""
+        return {
+            "granted": self.granted,
+            "queued": self.queued,
+            "timed_out": self.timed_out,
+            "waiting": len(self._waiters),
+            "used_today": self.used_today,
+            "daily_quota": self.daily_quota,
+        }
+
+
+def retry_after_seconds(response: httpx.Response) -> Optional[float]:
+    """Parses a `Retry-After` header given either in seconds or as an HTTP date."""
+    value = response.headers.get("retry-after")
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, email.utils.parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+def backoff_delay(attempt: int, base: float = 0.5, cap: float = 30.0) -> float:
+    """Exponential backoff with full jitter for the given zero-based attempt."""
+    return random.uniform(0, min(cap, base * (2 ** attempt)))
+
+
+async def send_with_backoff(
+    scheduler: ProviderScheduler,
+    send: Callable[[], Awaitable[httpx.Response]],
+    priority: Priority = Priority.NORMAL,
+    max_attempts: int = 3,
+) -> httpx.Response:
+    """Sends a request through a scheduler, retrying throttled or failed attempts.
+
+    Every attempt waits for a token first. Retryable statuses back off
+    exponentially with jitter, or for exactly `Retry-After` when the provider
+    sends one; a 429 additionally pauses the provider's bucket for everyone.
+    A `Retry-After` longer than the scheduler's `max_wait` is not waited
+    out: the bucket is paused for that long and the call fails at once.
+
+    Args:
+        scheduler (ProviderScheduler): The provider's scheduler.
+        send (Callable[[], Awaitable[httpx.Response]]): Issues one attempt.
+        priority (Priority): The lane to queue in.
+        max_attempts (int): Total attempts including the first one.
+
+    Returns:
+        httpx.Response: The first non-retryable response, or the last one.
+
+    Raises:
+        RateLimitError: If the provider asks to retry after more than `max_wait`.
+    """
+    for attempt in range(max_attempts):
+        await scheduler.acquire(priority)
+        response = await send()
+        if response.status_code not in RETRYABLE_STATUS_CODES:
+            return response
+        delay = retry_after_seconds(response)
+        if delay is None:
+            delay = backoff_delay(attempt)
+        if response.status_code == 429 or delay > scheduler.max_wait:
+            scheduler.pause(delay)
+        if attempt == max_attempts - 1:
+            break
+        if delay > scheduler.max_wait:
+            raise RateLimitError(
+                f"{scheduler.name} asked to retry after {delay:.0f}s, longer than "
+                f"the {scheduler.max_wait:.1f}s wait budget."
+            )
+        await asyncio.sleep(delay)
+    return response
+
+
+# Providers keyed by host, with their defaults (rate/s, burst, daily quota).
+# Each can be overridden with `<PREFIX>_RATE_PER_SEC`, `<PREFIX>_BURST` and
+# `<PREFIX>_DAILY_QUOTA`; NewsAPI's default quota matches its developer plan.
+_PROVIDERS = {
+    "newsapi.org": ("NEWSAPI", 1.0, 5, 100),
+    "newsdata.io": ("NEWSDATA", 0.5, 5, 200),
+    "factchecktools.googleapis.com": ("FACTCHECK", 5.0, 10, 0),
+    "en.wikipedia.org": ("WIKIPEDIA", 10.0, 20, 0),
+}
+_schedulers: Dict[str, ProviderScheduler] = {}
+
+
+def provider_prefix(url: str) -> Optional[str]:
+    """Returns the settings prefix (e.g. `NEWSAPI`) of the URL's provider, if known."""
+    provider = _PROVIDERS.get(urlsplit(url).hostname or "")
+    return provider[0] if provider else None
+
+
+def get_scheduler(url: str) -> Optional[ProviderScheduler]:
+    """Returns the shared scheduler for the URL's provider, if it is rate limited.
+
+    Args:
+        url (str): The request URL.
+
+    Returns:
+        Optional[ProviderScheduler]: None for hosts without a configured provider.
+    """
+    host = urlsplit(url).hostname or ""
+    if host not in _PROVIDERS:
+        return None
+    if host not in _schedulers:
+        prefix, rate, burst, quota = _PROVIDERS[host]
+        _schedulers[host] = ProviderScheduler(
+            prefix.lower(),
+            rate=env_float(f"{prefix}_RATE_PER_SEC", rate),
+            burst=env_int(f"{prefix}_BURST", burst),
+            daily_quota=env_int(f"{prefix}_DAILY_QUOTA", quota),
+            max_wait=env_float("TOOLS_RATE_MAX_WAIT", 10.0),
+        )
+    return _schedulers[host]
+
+
+def rate_limit_stats() -> Dict[str, Dict[str, int]]:
+    """Returns token-bucket and quota counters for every provider used so far."""
+    return {host: scheduler.stats() for host, scheduler in sorted(_schedulers.items())}
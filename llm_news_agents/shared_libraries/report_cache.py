@@ -0,0 +1,277 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Cache of final audited reports for repeated and paraphrased topics."""
+import asyncio
+import hashlib
+import logging
+import os
+import re
+import sqlite3
+import threading
+import time
+
+from typing import Any, Dict, Optional
+
+from google.genai import types
+
+from .article_index import tokenize
+from .config import env_bool, env_float
+from .fuzzy import TrigramIndex
+from .intent_router import PREVIOUS_REPORT_KEY, TOPIC, classify_intent, has_attachments
+
+logger = logging.getLogger(__name__)
+
+TOPIC_KEY = "report_cache_topic"
+
+_SCHEMA = """
+    CREATE TABLE IF NOT EXISTS reports (
+        id TEXT PRIMARY KEY,
+        topic TEXT NOT NULL,
+        report TEXT NOT NULL,
+        stored_at REAL NOT NULL,
+        expires_at REAL NOT NULL
+    )
+"""
+_BYPASS = re.compile(
+    r"\b(?:fresh|new|re-?run|redo|up-to-date)\s+(?:investigation|report|look|search)\b"
+    r"|\b(?:bypass|skip|ignore|without)\s+(?:the\s+)?cache\b"
+    r"|\b(?:from scratch|investigate again|not cached|no cache)\b",
+    re.IGNORECASE,
+)
+_BREAKING = re.compile(
+    r"\b(?:breaking|live|today|tonight|right now|just now|latest|developing|ongoing|"
+    r"this (?:morning|afternoon|evening|week)|(?:minutes?|hours?) ago)\b",
+    re.IGNORECASE,
+)
+_YEAR = re.compile(r"\b(?:19|20)\d{2}\b")
+
+
+def wants_fresh(text: str) -> bool:
+    """Whether the user explicitly asks for a new investigation rather than a cached report."""
+    return bool(_BYPASS.search(text))
+
+
+def topic_key(text: str) -> str:
+    """Normalises a request to its topic: bypass wording, stopwords and repeated terms removed.
+
+    Terms keep their order, so "Israel strikes Iran" and "Iran strikes
+    Israel" are different topics.
+    """
+    return " ".join(dict.fromkeys(tokenize(_BYPASS.sub(" ", text))))
+
+
+def report_ttl(
+    text: str,
+    default_ttl: float = 6 * 3600.0,
+    breaking_ttl: float = 900.0,
+    archive_ttl: float = 7 * 24 * 3600.0,
+    now: Optional[float] = None,
+) -> float:
+    """Picks how long a report stays fresh from how recent its news is.
+
+    Breaking or "latest" stories change by the hour and get `breaking_ttl`.
+    Topics that only name past years are settled history and get
+    `archive_ttl`. Everything else gets `default_ttl`.
+    """
+    if _BREAKING.search(text):
+        return breaking_ttl
+    years = [int(year) for year in _YEAR.findall(text)]
+    current_year = time.gmtime(time.time() if now is None else now).tm_year
+    if years and max(years) < current_year:
+        return archive_ttl
+    return default_ttl
+
+
+class ReportCache:
+    """Keeps final reports in SQLite and serves them for the same or a paraphrased topic.
+
+    Reports are keyed by `topic_key`; when there is no exact entry, a
+    trigram similarity lookup over stored topics finds reworded requests,
+    so "the Fed's rate decision" can reuse the report for "Fed rate
+    decision". Years and other numbers must be equal and terms must come
+    in the same order for a fuzzy hit, so neither "2024 election results"
+    nor "Iran strikes Israel" gets the report for "2020 election results"
+    or "Israel strikes Iran". Each report expires after its own TTL, set
+    from the recency of its news when stored.
+
+    All methods are synchronous and thread-safe; async callers run them through
+    `asyncio.to_thread`.
+
+    Args:
+        path (str): Location of the SQLite database, or `:memory:`.
+        min_similarity (float): Trigram similarity needed to reuse a report
+            for a different wording; 1.0 allows exact topic matches only.
+    """
+
+    def __init__(self, path: str = ":memory:", min_similarity: float = 0.85) -> None:
+        self.path = path
+        self.min_similarity = min_similarity
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._index = TrigramIndex()
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(_SCHEMA)
+        self._conn.commit()
+        for entry_id, topic in self._conn.execute("SELECT id, topic FROM reports"):
+            self._index.add(entry_id, topic)
+
+    @staticmethod
+    def _id(topic: str) -> str:
+        return hashlib.sha1(topic.encode("utf-8")).hexdigest()
+
+    def lookup(self, text: str) -> Optional[str]:
+        """Returns a fresh report for the request's topic, or None.
+
+        A stored topic with different numbers or negation is never a fuzzy
+        match, whatever its similarity (see `fuzzy.guard_terms`).
+
+        Args:
+            text (str): The user's request.
+        """
+        topic = topic_key(text)
+        if not topic:
+            return None
+        now = time.time()
+        with self._lock:
+            candidates = [self._id(topic)]
+            if self.min_similarity < 1.0:
+                candidates += [entry_id for _, entry_id in self._index.matches(topic, self.min_similarity)]
+            for entry_id in dict.fromkeys(candidates):
+                row = self._conn.execute(
+                    "SELECT report FROM reports WHERE id = ? AND expires_at > ?", (entry_id, now)
+                ).fetchone()
+                if row is not None:
+                    self.hits += 1
+                    return row[0]
+        self.misses += 1
+        return None
+
+    def store(self, text: str, report: str, ttl: float) -> None:
+        """Stores the final report for the request's topic, replacing an older one.
+
+        Args:
+            text (str): The user's request.
+            report (str): The final report as sent to the user.
+            ttl (float): Seconds the report may be served again.
+        """
+        topic = topic_key(text)
+        if not topic or not report.strip():
+            return
+        now = time.time()
+        entry_id = self._id(topic)
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO reports VALUES (?, ?, ?, ?, ?)",
+                (entry_id, topic, report, now, now + ttl),
+            )
+            self._conn.execute("DELETE FROM reports WHERE expires_at <= ?", (now,))
+            self._conn.commit()
+            self._index.add(entry_id, topic)
+
+    def stats(self) -> Dict[str, int]:
+        """Returns lookup counters and the number of stored reports."""
+        with self._lock:
+            (reports,) = self._conn.execute("SELECT COUNT(*) FROM reports").fetchone()
+        return {"hits": self.hits, "misses": self.misses, "reports": reports}
+
+    def close(self) -> None:
+        """Closes the underlying SQLite connection."""
+        with self._lock:
+            self._conn.close()
+
+
+_report_cache: Optional[ReportCache] = None
+
+
+def get_report_cache() -> ReportCache:
+    """Returns the process-wide report cache.
+
+    Reports persist in the SQLite file at `REPORT_CACHE_PATH`, or in memory
+    when it is unset. `REPORT_CACHE_MIN_SIMILARITY` tunes paraphrase matching.
+    """
+    global _report_cache
+    path = os.getenv("REPORT_CACHE_PATH") or ":memory:"
+    if _report_cache is None or _report_cache.path != path:
+        _report_cache = ReportCache(path, min_similarity=env_float("REPORT_CACHE_MIN_SIMILARITY", 0.85))
+    return _report_cache
+
+
+def _user_text(callback_context: Any) -> str:
+    content = callback_context.user_content
+    return " ".join(part.text for part in (content.parts or []) if part.text) if content else ""
+
+
+async def serve_cached_report(callback_context: Any) -> Optional[types.Content]:
+    """`before_agent_callback` that answers a repeated topic from the report cache.
+
+    A hit is returned as the reply and ends the invocation, so it reaches
+    the client as a normal event without running the pipeline. On a miss,
+    or when the user asks for a fresh investigation, the request is kept in
+    state for `store_final_report`. Messages whose meaning depends on more
+    than their text are neither served nor stored: follow-ups such as "tell
+    me more", messages with attachments, and anything sent in a session
+    that already holds an investigative report. `REPORT_CACHE_ENABLED=0`
+    turns the cache off.
+
+    Returns:
+        Optional[types.Content]: The cached report, or None to run the pipeline.
+    """
+    callback_context.state[TOPIC_KEY] = ""
+    if not env_bool("REPORT_CACHE_ENABLED", True):
+        return None
+    if has_attachments(callback_context.user_content) or callback_context.state.get(PREVIOUS_REPORT_KEY):
+        return None
+    text = _user_text(callback_context)
+    if classify_intent(text) != TOPIC:
+        return None
+    if not wants_fresh(text):
+        report = await asyncio.to_thread(get_report_cache().lookup, text)
+        if report is not None:
+            logger.info("Served the report for %r from the report cache.", topic_key(text))
+            return types.Content(role="model", parts=[types.Part(text=report)])
+    callback_context.state[TOPIC_KEY] = text
+    return None
+
+
+async def store_final_report(callback_context: Any, llm_response: Any) -> Any:
+    """After-model step of the final stage that stores its finished report.
+
+    Only the final, non-partial response is stored, with a TTL from
+    `report_ttl` (`REPORT_CACHE_TTL_SECONDS`,
+    `REPORT_CACHE_BREAKING_TTL_SECONDS`, `REPORT_CACHE_ARCHIVE_TTL_SECONDS`),
+    and only for a request `serve_cached_report` kept in state. Whether the
+    session held an earlier report is decided there, since by now the
+    pipeline has written this turn's investigative report.
+
+    Returns:
+        Any: The same response, unchanged.
+    """
+    text = callback_context.state.get(TOPIC_KEY)
+    if llm_response.partial or not text or not llm_response.content or not llm_response.content.parts:
+        return llm_response
+    report = "".join(part.text for part in llm_response.content.parts if part.text)
+    ttl = report_ttl(
+        text,
+        default_ttl=env_float("REPORT_CACHE_TTL_SECONDS", 6 * 3600.0),
+        breaking_ttl=env_float("REPORT_CACHE_BREAKING_TTL_SECONDS", 900.0),
+        archive_ttl=env_float("REPORT_CACHE_ARCHIVE_TTL_SECONDS", 7 * 24 * 3600.0),
+    )
+    await asyncio.to_thread(get_report_cache().store, text, report, ttl)
+    callback_context.state[TOPIC_KEY] = ""
+    return llm_response
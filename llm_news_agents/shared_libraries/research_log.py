@@ -0,0 +1,118 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Append-only, bounded research log kept in session state as per-entry keys."""
+import base64
+import hashlib
+import logging
+import zlib
+
+from typing import Any, Dict, List, MutableMapping, Optional
+
+from .cache import normalise_query
+
+logger = logging.getLogger(__name__)
+
+
+def _fingerprint(text: str) -> str:
+    return hashlib.sha1(normalise_query(text).encode("utf-8")).hexdigest()[:16]
+
+
+def _compress(text: str) -> Dict[str, str]:
+    return {"z": base64.b64encode(zlib.compress(text.encode("utf-8"), 9)).decode("ascii")}
+
+
+def _decompress(entry: Any) -> str:
+    if isinstance(entry, dict) and "z" in entry:
+        return zlib.decompress(base64.b64decode(entry["z"])).decode("utf-8")
+    return entry
+
+
+class ResearchLog:
+    """An append-only log of findings stored in session state.
+
+    Each entry lives under its own `<field>.<sequence>` key next to a small
+    `<field>.meta` record, so an append changes only the new entry and the
+    record instead of rewriting the whole list. Only those keys end up in
+    the event's state delta that the session service persists. Identical
+    findings (ignoring case and whitespace) are stored once. Beyond
+    `max_entries` the oldest entries are dropped, and entries older than the
+    newest `keep_uncompressed` are zlib-compressed when that saves space.
+
+    Args:
+        state (MutableMapping[str, Any]): The session state, e.g. `tool_context.state`.
+        field (str): The log's name and state key prefix.
+        max_entries (int): Maximum number of entries kept.
+        keep_uncompressed (int): Newest entries left as plain text; 0 disables
+            compression.
+    """
+
+    def __init__(
+        self,
+        state: MutableMapping[str, Any],
+        field: str,
+        max_entries: int = 50,
+        keep_uncompressed: int = 10,
+    ) -> None:
+        self.state = state
+        self.field = field
+        self.max_entries = max_entries
+        self.keep_uncompressed = keep_uncompressed
+
+    def _meta(self) -> Dict[str, Any]:
+        meta = self.state.get(f"{self.field}.meta")
+        return dict(meta) if meta else {"first": 0, "next": 0, "fingerprints": []}
+
+    def append(self, text: str) -> bool:
+        """Adds a finding unless an identical one is already logged.
+
+        Returns:
+            bool: True if the finding was added, False for a duplicate.
+        """
+        meta = self._meta()
+        fingerprint = _fingerprint(text)
+        if fingerprint in meta["fingerprints"]:
+            return False
+
+        sequence = meta["next"]
+        self.state[f"{self.field}.{sequence}"] = text
+        meta["next"] = sequence + 1
+        meta["fingerprints"] = meta["fingerprints"] + [fingerprint]
+
+        while meta["next"] - meta["first"] > self.max_entries:
+            # State keys cannot be deleted through a delta; clearing them is.
+            self.state[f"{self.field}.{meta['first']}"] = None
+            meta["first"] += 1
+            meta["fingerprints"] = meta["fingerprints"][1:]
+
+        if self.keep_uncompressed:
+            older = sequence - self.keep_uncompressed
+            key = f"{self.field}.{older}"
+            entry = self.state.get(key) if older >= meta["first"] else None
+            if isinstance(entry, str):
+                compressed = _compress(entry)
+                if len(compressed["z"]) < len(entry):
+                    self.state[key] = compressed
+        self.state[f"{self.field}.meta"] = meta
+        return True
+
+    def entries(self) -> List[str]:
+        """Returns the logged findings, oldest first."""
+        meta = self._meta()
+        entries = []
+        for sequence in range(meta["first"], meta["next"]):
+            entry: Optional[Any] = self.state.get(f"{self.field}.{sequence}")
+            if entry is not None:
+                entries.append(_decompress(entry))
+        return entries
@@ -0,0 +1,242 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Hedged requests and circuit breakers for slow or failing upstream tools."""
+import asyncio
+import logging
+import time
+
+from collections import deque
+from typing import Any, Awaitable, Callable, Deque, Dict, Optional, TypeVar
+from urllib.parse import urlsplit
+
+from .config import env_float, env_int
+from .rate_limit import provider_prefix
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class CircuitOpenError(Exception):
+    """Raised instead of calling an endpoint whose circuit breaker is open."""
+
+
+class CircuitBreaker:
+    """Fails fast once an endpoint's recent error rate crosses a threshold.
+
+    The breaker tracks the outcome of the last `window` calls. With at least
+    `min_calls` recorded and a failure ratio of `failure_ratio` or more it
+    opens and rejects calls for `reset_timeout` seconds. It then lets calls
+    through half-open: the next success closes it again and the next failure
+    re-opens it.
+
+    Args:
+        name (str): The endpoint label used in logs.
+        failure_ratio (float): Failure share that opens the breaker.
+        window (int): Number of recent calls considered.
+        min_calls (int): Calls needed before the ratio is trusted.
+        reset_timeout (float): Seconds an open breaker rejects calls.
+        clock (Callable[[], float]): Monotonic time source, injectable for tests.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        failure_ratio: float = 0.5,
+        window: int = 20,
+        min_calls: int = 5,
+        reset_timeout: float = 30.0,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.name = name
+        self.failure_ratio = failure_ratio
+        self.min_calls = min_calls
+        self.reset_timeout = reset_timeout
+        self._clock = clock
+        self._outcomes: Deque[bool] = deque(maxlen=window)
+        self._state = CLOSED
+        self._opened_at = 0.0
+        self.rejected = 0
+        self.times_opened = 0
+
+    @property
+    def state(self) -> str:
+        """The current state: `closed`, `open` or `half_open`."""
+        if self._state == OPEN and self._clock() - self._opened_at >= self.reset_timeout:
+            self._state = HALF_OPEN
+        return self._state
+
+    def allow(self) -> bool:
+        """Tells whether a call may be made; counts rejections when it may not."""
+        if self.state == OPEN:
+            self.rejected += 1
+            return False
+        return True
+
+    def record(self, success: bool) -> None:
+        """Records the outcome of a call that was allowed through."""
+        if self.state == HALF_OPEN:
+            if success:
+                self._state = CLOSED
+                self._outcomes.clear()
+            else:
+                self._open()
+            return
+        self._outcomes.append(success)
+        failures = self._outcomes.count(False)
+        if (
+            len(self._outcomes) >= self.min_calls
+            and failures / len(self._outcomes) >= self.failure_ratio
+        ):
+            self._open()
+
+    def _open(self) -> None:
+        self._state = OPEN
+        self._opened_at = self._clock()
+        self.times_opened += 1
+        self._outcomes.clear()
+        logger.warning("Circuit breaker for %s opened.", self.name)
+
+    def stats(self) -> Dict[str, Any]:
+        """Returns the breaker state and counters for observability."""
+        return {
+            "state": self.state,
+            "recent_calls": len(self._outcomes),
+            "recent_failures": self._outcomes.count(False),
+            "rejected": self.rejected,
+            "times_opened": self.times_opened,
+        }
+
+
+class Hedger:
+    """Sends a backup request when the first one is slower than `delay`.
+
+    Whichever attempt succeeds first wins and the other is cancelled. A hedge
+    is only sent if `may_hedge` allows it, which lets the rate scheduler
+    veto hedges that would exceed the provider's limits.
+
+    Args:
+        name (str): The endpoint label used in logs.
+        delay (float): Latency after which a hedge is sent; 0 disables hedging.
+    """
+
+    def __init__(self, name: str, delay: float) -> None:
+        self.name = name
+        self.delay = delay
+        self.requests = 0
+        self.hedged = 0
+        self.hedge_wins = 0
+
+    async def run(
+        self,
+        send: Callable[[], Awaitable[T]],
+        may_hedge: Callable[[], bool] = lambda: True,
+    ) -> T:
+        """Runs `send`, hedging it once if it has not finished within `delay`."""
+        self.requests += 1
+        primary = asyncio.ensure_future(send())
+        if self.delay <= 0:
+            return await primary
+        hedge: Optional["asyncio.Future[T]"] = None
+        try:
+            done, _ = await asyncio.wait({primary}, timeout=self.delay)
+            if done or not may_hedge():
+                return await primary
+
+            self.hedged += 1
+            logger.info("%s slower than %.2fs; sending hedged request.", self.name, self.delay)
+            hedge = asyncio.ensure_future(send())
+            pending = {primary, hedge}
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is None:
+                        if task is hedge:
+                            self.hedge_wins += 1
+                        return task.result()
+            # Both attempts failed; surface the primary's error.
+            return primary.result()
+        finally:
+            for task in (primary, hedge):
+                if task is not None and not task.done():
+                    task.cancel()
+
+    def stats(self) -> Dict[str, Any]:
+        """Returns hedge counts and the share of hedges that beat the primary."""
+        return {
+            "requests": self.requests,
+            "hedged": self.hedged,
+            "hedge_wins": self.hedge_wins,
+            "hedge_win_rate": self.hedge_wins / self.hedged if self.hedged else 0.0,
+        }
+
+
+_breakers: Dict[str, CircuitBreaker] = {}
+_hedgers: Dict[str, Hedger] = {}
+
+
+def _endpoint(url: str) -> str:
+    parts = urlsplit(url)
+    return f"{parts.hostname}{parts.path}"
+
+
+def get_breaker(url: str) -> CircuitBreaker:
+    """Returns the shared circuit breaker for the URL's endpoint (host and path).
+
+    Thresholds come from `TOOLS_BREAKER_FAILURE_RATIO`, `TOOLS_BREAKER_WINDOW`,
+    `TOOLS_BREAKER_MIN_CALLS` and `TOOLS_BREAKER_RESET_TIMEOUT`.
+    """
+    endpoint = _endpoint(url)
+    if endpoint not in _breakers:
+        _breakers[endpoint] = CircuitBreaker(
+            endpoint,
+            failure_ratio=env_float("TOOLS_BREAKER_FAILURE_RATIO", 0.5),
+            window=env_int("TOOLS_BREAKER_WINDOW", 20),
+            min_calls=env_int("TOOLS_BREAKER_MIN_CALLS", 5),
+            reset_timeout=env_float("TOOLS_BREAKER_RESET_TIMEOUT", 30.0),
+        )
+    return _breakers[endpoint]
+
+
+def get_hedger(url: str) -> Hedger:
+    """Returns the shared hedger for the URL's endpoint.
+
+    The delay is read from `<PREFIX>_HEDGE_AFTER` (e.g. `FACTCHECK_HEDGE_AFTER`),
+    falling back to `TOOLS_HEDGE_AFTER`; the default of 0 disables hedging.
+    """
+    endpoint = _endpoint(url)
+    if endpoint not in _hedgers:
+        delay = env_float("TOOLS_HEDGE_AFTER", 0.0)
+        prefix = provider_prefix(url)
+        if prefix:
+            delay = env_float(f"{prefix}_HEDGE_AFTER", delay)
+        _hedgers[endpoint] = Hedger(endpoint, delay)
+    return _hedgers[endpoint]
+
+
+def resilience_stats() -> Dict[str, Dict[str, Any]]:
+    """Returns breaker state and hedge statistics for every endpoint used so far."""
+    endpoints = set(_breakers) | set(_hedgers)
+    return {
+        endpoint: {
+            "breaker": _breakers[endpoint].stats() if endpoint in _breakers else None,
+            "hedging": _hedgers[endpoint].stats() if endpoint in _hedgers else None,
+        }
+        for endpoint in sorted(endpoints)
+    }
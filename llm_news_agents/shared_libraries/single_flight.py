@@ -0,0 +1,109 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Request coalescing so identical concurrent tool calls share one upstream call."""
+import asyncio
+import logging
+
+from typing import Any, Awaitable, Callable, Dict, Hashable, Tuple, TypeVar
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+def _consume_exception(future: "asyncio.Future[Any]") -> None:
+    """Marks a future's exception as retrieved when nobody else was waiting on it."""
+    if not future.cancelled():
+        future.exception()
+
+
+class _Flight:
+    """The shared task of one in-flight call and the number of callers awaiting it."""
+
+    def __init__(self, task: "asyncio.Future[Any]") -> None:
+        self.task = task
+        self.waiters = 0
+
+
+class SingleFlight:
+    """Collapses concurrent calls with the same key into a single execution.
+
+    The first caller for a key starts the work as its own task; every caller
+    arriving while it is still in flight awaits the same result (or
+    exception). Callers await the task through `asyncio.shield`, so a caller
+    being cancelled never cancels the work for the others; the task is only
+    cancelled once no caller is waiting for it any more. Once the work
+    finishes the key is forgotten, so later calls run again and rely on the
+    response caches instead.
+
+    Args:
+        name (str): Label used when logging collapsed calls.
+    """
+
+    def __init__(self, name: str) -> None:
+        self.name = name
+        # Tasks are bound to a loop, so flights are keyed per running loop.
+        self._in_flight: Dict[Tuple[asyncio.AbstractEventLoop, Hashable], _Flight] = {}
+        self.calls = 0
+        self.executions = 0
+        self.collapsed = 0
+
+    async def do(self, key: Hashable, work: Callable[[], Awaitable[T]]) -> T:
+        """Runs `work` unless an identical call is already in flight.
+
+        Args:
+            key (Hashable): Identifies calls that are interchangeable.
+            work (Callable[[], Awaitable[T]]): Produces the result when no
+                identical call is in flight.
+
+        Returns:
+            T: The result of the single shared execution.
+        """
+        loop = asyncio.get_running_loop()
+        flight_key = (loop, key)
+        self.calls += 1
+
+        flight = self._in_flight.get(flight_key)
+        if flight is not None:
+            self.collapsed += 1
+            logger.debug("[%s] Joined in-flight call for %r.", self.name, key)
+        else:
+            flight = _Flight(asyncio.ensure_future(work()))
+            self._in_flight[flight_key] = flight
+            self.executions += 1
+            flight.task.add_done_callback(_consume_exception)
+            flight.task.add_done_callback(lambda _, flight=flight: self._forget(flight_key, flight))
+
+        flight.waiters += 1
+        try:
+            return await asyncio.shield(flight.task)
+        finally:
+            flight.waiters -= 1
+            if not flight.waiters and not flight.task.done():
+                # The last interested caller gave up; nobody needs the result.
+                flight.task.cancel()
+
+    def _forget(self, flight_key: Tuple[asyncio.AbstractEventLoop, Hashable], flight: _Flight) -> None:
+        if self._in_flight.get(flight_key) is flight:
+            del self._in_flight[flight_key]
+
+    def stats(self) -> Dict[str, int]:
+        """Returns how many calls were made, executed and collapsed."""
+        return {
+            "calls": self.calls,
+            "executions": self.executions,
+            "collapsed": self.collapsed,
+            "in_flight": len(self._in_flight),
+        }
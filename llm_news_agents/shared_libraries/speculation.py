@@ -0,0 +1,94 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Speculative prefetching of a later pipeline stage's lookups."""
+import asyncio
+import logging
+import time
+
+from typing import Awaitable, Callable, Dict, Hashable, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+class SpeculativePrefetcher:
+    """Starts a later stage's lookups early and hands over whatever finished.
+
+    `start` launches named jobs in the background as soon as their input is
+    known, so they overlap the stages that run first. When the dependent
+    stage begins, `collect` gives unfinished jobs a short grace period,
+    returns the results that succeeded and cancels the rest; results that
+    arrive too late are discarded rather than delaying the stage. Batches
+    that are never collected are cancelled after `max_age` seconds.
+
+    Args:
+        name (str): Label used in logs.
+        max_age (float): Seconds after which an uncollected batch is dropped.
+    """
+
+    def __init__(self, name: str, max_age: float = 600.0) -> None:
+        self.name = name
+        self.max_age = max_age
+        self._batches: Dict[Hashable, Tuple[float, Dict[str, "asyncio.Task[str]"]]] = {}
+        self.started = 0
+        self.used = 0
+        self.discarded = 0
+
+    def start(self, key: Hashable, jobs: Dict[str, Callable[[], Awaitable[str]]]) -> None:
+        """Launches `jobs` for the batch identified by `key` (e.g. an invocation id)."""
+        now = time.monotonic()
+        for stale_key, (started_at, tasks) in list(self._batches.items()):
+            if now - started_at > self.max_age:
+                self._discard(tasks)
+                del self._batches[stale_key]
+        loop = asyncio.get_running_loop()
+        tasks = {name: loop.create_task(job()) for name, job in jobs.items()}
+        self._batches[key] = (now, tasks)
+        self.started += len(tasks)
+
+    async def collect(self, key: Hashable, grace: float = 2.0) -> Dict[str, str]:
+        """Returns the finished, successful results of a batch and cancels the rest.
+
+        Args:
+            key (Hashable): The key passed to `start`.
+            grace (float): Seconds to wait for jobs still running.
+
+        Returns:
+            Dict[str, str]: Results by job name; empty if nothing was started.
+        """
+        _, tasks = self._batches.pop(key, (0.0, {}))
+        if not tasks:
+            return {}
+        pending = [task for task in tasks.values() if not task.done()]
+        if pending and grace > 0:
+            await asyncio.wait(pending, timeout=grace)
+        results = {}
+        for name, task in tasks.items():
+            if task.done() and not task.cancelled() and task.exception() is None:
+                results[name] = task.result()
+            elif task.done() and not task.cancelled():
+                logger.info("Speculative %s job %s failed: %s", self.name, name, task.exception())
+        self._discard(tasks)
+        self.used += len(results)
+        return results
+
+    def _discard(self, tasks: Dict[str, "asyncio.Task[str]"]) -> None:
+        for task in tasks.values():
+            if not task.done():
+                task.cancel()
+                self.discarded += 1
+
+    def stats(self) -> Dict[str, int]:
+        """Returns how many jobs were started, used and discarded."""
+        return {"started": self.started, "used": self.used, "discarded": self.discarded}
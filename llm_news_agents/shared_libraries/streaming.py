@@ -0,0 +1,59 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Incremental helpers for post-processing model output streamed in chunks."""
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class MarkerFilter:
+    """Cuts a stream of text at the first occurrence of a marker.
+
+    Chunks are passed through as they arrive except for the shortest tail
+    that could still turn out to be the start of the marker, so a marker
+    split across chunk boundaries never leaks and text that cannot be part
+    of it is never delayed. Once the marker is seen nothing more is emitted.
+    A held tail is never emitted on its own: the final, aggregated response
+    of a stream carries the whole text again.
+
+    Args:
+        marker (str): The text that ends the stream.
+    """
+
+    def __init__(self, marker: str) -> None:
+        self.marker = marker
+        self.done = False
+        self._held = ""
+
+    def _held_length(self, text: str) -> int:
+        """Length of the longest suffix of `text` that is a proper prefix of the marker."""
+        for length in range(min(len(text), len(self.marker) - 1), 0, -1):
+            if self.marker.startswith(text[-length:]):
+                return length
+        return 0
+
+    def feed(self, chunk: str) -> str:
+        """Returns the part of `chunk` (plus held text) that is safe to emit now."""
+        if self.done:
+            return ""
+        text = self._held + chunk
+        index = text.find(self.marker)
+        if index >= 0:
+            self.done = True
+            self._held = ""
+            return text[:index]
+        held = self._held_length(text)
+        self._held = text[len(text) - held:] if held else ""
+        return text[:len(text) - held]
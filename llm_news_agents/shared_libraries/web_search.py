@@ -0,0 +1,130 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Direct Google Search grounding calls that return structured, cached results."""
+import logging
+import os
+
+from typing import Any, Dict, List, Optional
+
+from google import genai
+from google.genai import types
+
+from .cache import TTLCache, normalise_query
+from .config import env_float, env_int
+from .single_flight import SingleFlight
+
+logger = logging.getLogger(__name__)
+
+
+def grounding_result(
+    response: types.GenerateContentResponse, max_sources: int = 8
+) -> Dict[str, Any]:
+    """Extracts the answer, sources and issued search queries from a grounded response.
+
+    Args:
+        response (types.GenerateContentResponse): A response generated with
+            the `google_search` tool enabled.
+        max_sources (int): Maximum number of sources kept.
+
+    Returns:
+        Dict[str, Any]: `answer`, `sources` (title and uri) and `search_queries`.
+    """
+    candidate = response.candidates[0] if response.candidates else None
+    metadata = candidate.grounding_metadata if candidate else None
+    sources: List[Dict[str, Optional[str]]] = []
+    for chunk in (metadata.grounding_chunks if metadata else None) or []:
+        if chunk.web and chunk.web.uri and len(sources) < max_sources:
+            sources.append({"title": chunk.web.title, "uri": chunk.web.uri})
+    return {
+        "answer": response.text or "",
+        "sources": sources,
+        "search_queries": list((metadata.web_search_queries if metadata else None) or []),
+    }
+
+
+class GroundedSearch:
+    """Runs one Google-Search-grounded generation per query and caches its result.
+
+    Unlike wrapping a search agent in an `AgentTool`, this issues a single
+    model call with no agent instructions, history or tool loop, and hands
+    the grounding sources back as data. Results are cached per normalised
+    query and identical concurrent searches share one call.
+
+    Args:
+        model (str): The Gemini model used for grounding.
+        ttl_seconds (float): How long a query's result is reused.
+        max_sources (int): Maximum number of sources per result.
+    """
+
+    def __init__(
+        self, model: str = "gemini-2.0-flash", ttl_seconds: float = 900.0, max_sources: int = 8
+    ) -> None:
+        self.model = model
+        self.max_sources = max_sources
+        self.cache = TTLCache(ttl_seconds=ttl_seconds, max_entries=1024, max_bytes=8 * 1024 * 1024)
+        self._flights = SingleFlight("web_search")
+        self._client: Optional[genai.Client] = None
+        self.prompt_tokens = 0
+        self.output_tokens = 0
+
+    def _get_client(self) -> genai.Client:
+        # Created lazily so importing the agents does not require credentials.
+        if self._client is None:
+            self._client = genai.Client()
+        return self._client
+
+    async def search(self, query: str) -> Dict[str, Any]:
+        """Searches the web for `query` and returns the grounded answer with its sources."""
+        key = normalise_query(query)
+        cached = self.cache.get(key)
+        if cached is not None:
+            return cached
+
+        async def _generate() -> Dict[str, Any]:
+            response = await self._get_client().aio.models.generate_content(
+                model=self.model,
+                contents=query,
+                config=types.GenerateContentConfig(
+                    tools=[types.Tool(google_search=types.GoogleSearch())],
+                    temperature=0,
+                ),
+            )
+            usage = response.usage_metadata
+            if usage:
+                self.prompt_tokens += usage.prompt_token_count or 0
+                self.output_tokens += usage.candidates_token_count or 0
+            return grounding_result(response, self.max_sources)
+
+        result = await self._flights.do(key, _generate)
+        self.cache.set(key, result)
+        return result
+
+    def stats(self) -> Dict[str, Any]:
+        """Returns token usage and cache counters."""
+        return {
+            "prompt_tokens": self.prompt_tokens,
+            "output_tokens": self.output_tokens,
+            **self.cache.stats(),
+        }
+
+
+def build_grounded_search() -> GroundedSearch:
+    """Builds a searcher configured by `WEB_SEARCH_MODEL`,
+    `WEB_SEARCH_CACHE_TTL_SECONDS` and `WEB_SEARCH_MAX_SOURCES`."""
+    return GroundedSearch(
+        model=os.getenv("WEB_SEARCH_MODEL", "gemini-2.0-flash"),
+        ttl_seconds=env_float("WEB_SEARCH_CACHE_TTL_SECONDS", 900.0),
+        max_sources=env_int("WEB_SEARCH_MAX_SOURCES", 8),
+    )
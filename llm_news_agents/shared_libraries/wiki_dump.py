@@ -0,0 +1,269 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Offline Wikipedia backend: a memory-mapped title index and abstract store."""
+import argparse
+import bz2
+import difflib
+import gzip
+import json
+import logging
+import mmap
+import os
+import re
+import xml.etree.ElementTree as ET
+
+from array import array
+from typing import IO, Iterator, List, Optional, Tuple, Union
+
+from .wikipedia import NO_RESULT
+
+logger = logging.getLogger(__name__)
+
+_TITLES = "titles.bin"
+_ABSTRACTS = "abstracts.bin"
+_INDEX = "index.bin"
+# Each index entry is six uint32: key offset/length and display title
+# offset/length in titles.bin, abstract offset/length in abstracts.bin.
+_STRIDE = 6
+
+
+def normalise_title(title: str) -> str:
+    """Folds case, underscores and whitespace so lookups match dump titles."""
+    return re.sub(r"\s+", " ", title.replace("_", " ")).strip().lower()
+
+
+def _open(path: str) -> IO[bytes]:
+    if path.endswith(".gz"):
+        return gzip.open(path, "rb")
+    if path.endswith(".bz2"):
+        return bz2.open(path, "rb")
+    return open(path, "rb")
+
+
+def read_source(path: str) -> Iterator[Tuple[str, Optional[str], Optional[str]]]:
+    """Yields `(title, abstract, redirect_target)` records from a dump or sample.
+
+    Supported inputs are the `enwiki-*-abstract.xml` dumps (optionally gzip or
+    bzip2 compressed) and JSON Lines samples with `title` plus either
+    `abstract` or `redirect` keys, which also carry redirects.
+    """
+    if ".jsonl" in path:
+        with _open(path) as f:
+            for line in f:
+                if line.strip():
+                    record = json.loads(line)
+                    yield record["title"], record.get("abstract"), record.get("redirect")
+        return
+    with _open(path) as f:
+        for _, element in ET.iterparse(f):
+            if element.tag != "doc":
+                continue
+            title = (element.findtext("title") or "").removeprefix("Wikipedia: ")
+            yield title, element.findtext("abstract") or "", None
+            element.clear()
+
+
+def build_index(source: str, directory: str) -> int:
+    """Builds the memory-mappable index files for a dump.
+
+    Args:
+        source (str): Path to the abstract dump or JSON Lines sample.
+        directory (str): Where `titles.bin`, `abstracts.bin` and `index.bin`
+            are written.
+
+    Returns:
+        int: The number of titles indexed, redirects included.
+    """
+    os.makedirs(directory, exist_ok=True)
+    pages = {}
+    redirects = []
+    with open(os.path.join(directory, _ABSTRACTS), "wb") as abstracts:
+        offset = 0
+        for title, abstract, redirect in read_source(source):
+            if redirect:
+                redirects.append((title, redirect))
+                continue
+            data = (abstract or "").strip().encode("utf-8")
+            abstracts.write(data)
+            pages[normalise_title(title)] = (title, offset, len(data))
+            offset += len(data)
+    for title, target in redirects:
+        key = normalise_title(title)
+        if key not in pages and normalise_title(target) in pages:
+            pages[key] = pages[normalise_title(target)]
+
+    index = array("I")
+    with open(os.path.join(directory, _TITLES), "wb") as titles:
+        offset = 0
+        for key in sorted(pages, key=lambda k: k.encode("utf-8")):
+            display, abstract_offset, abstract_length = pages[key]
+            key_bytes, display_bytes = key.encode("utf-8"), display.encode("utf-8")
+            titles.write(key_bytes + display_bytes)
+            index.extend(
+                (offset, len(key_bytes), offset + len(key_bytes), len(display_bytes),
+                 abstract_offset, abstract_length)
+            )
+            offset += len(key_bytes) + len(display_bytes)
+    with open(os.path.join(directory, _INDEX), "wb") as f:
+        index.tofile(f)
+    logger.info("Indexed %d Wikipedia titles (%d redirects) into %s.", len(pages), len(redirects), directory)
+    return len(pages)
+
+
+class WikipediaDumpIndex:
+    """Looks up titles and abstracts in the files written by `build_index`.
+
+    All three files are memory-mapped, so opening an index is instant and only
+    the pages touched by lookups are read from disk. Titles are sorted, which
+    gives O(log n) exact and prefix lookups by binary search.
+
+    Args:
+        directory (str): The directory passed to `build_index`.
+    """
+
+    def __init__(self, directory: str) -> None:
+        self.directory = directory
+        self._maps: List[mmap.mmap] = []
+        self._titles = self._map(_TITLES)
+        self._abstracts = self._map(_ABSTRACTS)
+        self._index = memoryview(self._map(_INDEX)).cast("I")
+
+    def _map(self, name: str) -> Union[mmap.mmap, bytes]:
+        with open(os.path.join(self.directory, name), "rb") as f:
+            if os.fstat(f.fileno()).st_size == 0:
+                return b""  # Empty files cannot be mapped.
+            mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        self._maps.append(mapped)
+        return mapped
+
+    def __len__(self) -> int:
+        return len(self._index) // _STRIDE
+
+    def _key(self, i: int) -> bytes:
+        offset, length = self._index[i * _STRIDE], self._index[i * _STRIDE + 1]
+        return self._titles[offset:offset + length]
+
+    def _entry(self, i: int) -> Tuple[str, str]:
+        base = i * _STRIDE
+        title_offset, title_length, abstract_offset, abstract_length = self._index[base + 2:base + 6]
+        title = self._titles[title_offset:title_offset + title_length].decode("utf-8")
+        abstract = self._abstracts[abstract_offset:abstract_offset + abstract_length].decode("utf-8")
+        return title, abstract
+
+    def _lower_bound(self, key: bytes) -> int:
+        low, high = 0, len(self)
+        while low < high:
+            middle = (low + high) // 2
+            if self._key(middle) < key:
+                low = middle + 1
+            else:
+                high = middle
+        return low
+
+    def lookup(self, title: str) -> Optional[Tuple[str, str]]:
+        """Returns `(title, abstract)` for an exact (normalised) title or redirect."""
+        key = normalise_title(title).encode("utf-8")
+        i = self._lower_bound(key)
+        if i < len(self) and self._key(i) == key:
+            return self._entry(i)
+        return None
+
+    def prefix_search(self, prefix: str, limit: int = 10) -> List[Tuple[str, str]]:
+        """Returns up to `limit` entries whose normalised title starts with `prefix`."""
+        key = normalise_title(prefix).encode("utf-8")
+        results = []
+        i = self._lower_bound(key)
+        while i < len(self) and len(results) < limit and self._key(i).startswith(key):
+            results.append(self._entry(i))
+            i += 1
+        return results
+
+    def fuzzy_search(
+        self, query: str, limit: int = 3, window: int = 50, cutoff: float = 0.6
+    ) -> List[Tuple[str, str]]:
+        """Finds titles similar to `query`, tolerating typos and extra words.
+
+        Candidates are the titles sorted near the query and near each of its
+        words, which keeps the search logarithmic instead of scanning every
+        title; they are then ranked by `difflib` similarity.
+        """
+        key = normalise_title(query)
+        candidates = {}
+        for probe in [key, *key.split()]:
+            i = self._lower_bound(probe.encode("utf-8"))
+            for j in range(max(0, i - window // 5), min(len(self), i + window)):
+                candidates[j] = self._key(j).decode("utf-8")
+        scored = sorted(
+            ((difflib.SequenceMatcher(None, key, title).ratio(), j) for j, title in candidates.items()),
+            reverse=True,
+        )
+        return [self._entry(j) for score, j in scored[:limit] if score >= cutoff]
+
+    def search(self, query: str, limit: int = 3) -> List[Tuple[str, str]]:
+        """Exact match first, then prefix matches, then fuzzy matches."""
+        results = []
+        exact = self.lookup(query)
+        if exact:
+            results.append(exact)
+        for found in self.prefix_search(query, limit) + self.fuzzy_search(query, limit):
+            if len(results) >= limit:
+                break
+            if found not in results:
+                results.append(found)
+        return results
+
+    def close(self) -> None:
+        """Unmaps the index files."""
+        self._index.release()
+        for mapped in self._maps:
+            mapped.close()
+
+
+class OfflineWikipedia:
+    """Drop-in replacement for `WikipediaClient.run` backed by a dump index.
+
+    Args:
+        directory (str): The directory passed to `build_index`.
+        top_k (int): Number of pages summarised per query.
+        max_chars (int): Maximum length of the combined answer.
+    """
+
+    def __init__(self, directory: str, top_k: int = 3, max_chars: int = 4000) -> None:
+        self.index = WikipediaDumpIndex(directory)
+        self.top_k = top_k
+        self.max_chars = max_chars
+
+    async def run(self, query: str, priority: Optional[object] = None) -> str:
+        """Answers a query in the same `Page: ...\\nSummary: ...` format as the online client.
+
+        `priority` is accepted for interface parity and ignored; lookups are local.
+        """
+        blocks = [
+            f"Page: {title}\nSummary: {abstract}"
+            for title, abstract in self.index.search(query, self.top_k)
+            if abstract
+        ]
+        if not blocks:
+            return NO_RESULT
+        return "\n\n".join(blocks)[: self.max_chars]
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    parser = argparse.ArgumentParser(description="Build an offline Wikipedia index from a dump.")
+    parser.add_argument("source", help="enwiki abstract dump (.xml[.gz|.bz2]) or JSON Lines sample")
+    parser.add_argument("directory", help="output directory for the index files")
+    arguments = parser.parse_args()
+    build_index(arguments.source, arguments.directory)
@@ -0,0 +1,161 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Async Wikipedia search over the pooled HTTP client with page and search caches."""
+import asyncio
+import logging
+import os
+
+from typing import TYPE_CHECKING, List, Optional, Union
+
+from . import http_client
+from .cache import TTLCache, normalise_query
+from .config import env_float, env_int
+from .rate_limit import Priority
+from .single_flight import SingleFlight
+
+if TYPE_CHECKING:
+    from .wiki_dump import OfflineWikipedia
+
+logger = logging.getLogger(__name__)
+
+API_URL = "https://en.wikipedia.org/w/api.php"
+NO_RESULT = "No good Wikipedia Search Result was found"
+
+
+class WikipediaClient:
+    """Searches Wikipedia and returns page summaries in `WikipediaQueryRun`'s format.
+
+    A search resolves the query to page titles, then fetches the introduction
+    of every page concurrently. Titles per query and summaries per page are
+    cached separately, so different queries landing on the same pages reuse
+    them, and identical fetches in flight are shared.
+
+    Args:
+        top_k (int): Number of pages summarised per query.
+        max_chars (int): Maximum length of the combined answer.
+        ttl_seconds (float): How long search results and summaries are reused.
+    """
+
+    def __init__(self, top_k: int = 3, max_chars: int = 4000, ttl_seconds: float = 3600.0) -> None:
+        self.top_k = top_k
+        self.max_chars = max_chars
+        self.searches = TTLCache(ttl_seconds=ttl_seconds, max_entries=1024, max_bytes=1024 * 1024)
+        self.pages = TTLCache(ttl_seconds=ttl_seconds, max_entries=4096, max_bytes=16 * 1024 * 1024)
+        self._flights = SingleFlight("wikipedia")
+
+    async def _titles(self, query: str, priority: Priority) -> List[str]:
+        key = normalise_query(query)
+        titles = self.searches.get(key)
+        if titles is not None:
+            return titles
+
+        async def _fetch() -> List[str]:
+            response = await http_client.get(
+                API_URL,
+                params={
+                    "action": "query",
+                    "list": "search",
+                    "srsearch": query[:300],
+                    "srlimit": self.top_k,
+                    "format": "json",
+                },
+                priority=priority,
+            )
+            response.raise_for_status()
+            return [hit["title"] for hit in response.json().get("query", {}).get("search", [])]
+
+        titles = await self._flights.do(("search", key), _fetch)
+        self.searches.set(key, titles)
+        return titles
+
+    async def summary(self, title: str, priority: Priority = Priority.NORMAL) -> Optional[str]:
+        """Returns the plain-text introduction of a page, or None if it has none."""
+        cached = self.pages.get(title)
+        if cached is not None:
+            return cached or None
+
+        async def _fetch() -> str:
+            response = await http_client.get(
+                API_URL,
+                params={
+                    "action": "query",
+                    "prop": "extracts",
+                    "exintro": 1,
+                    "explaintext": 1,
+                    "redirects": 1,
+                    "titles": title,
+                    "format": "json",
+                },
+                priority=priority,
+            )
+            response.raise_for_status()
+            pages = response.json().get("query", {}).get("pages", {})
+            return next((page.get("extract") or "" for page in pages.values()), "")
+
+        extract = await self._flights.do(("page", title), _fetch)
+        # Empty summaries are cached too, so missing pages are not refetched.
+        self.pages.set(title, extract)
+        return extract or None
+
+    async def run(self, query: str, priority: Priority = Priority.NORMAL) -> str:
+        """Answers a query with the summaries of the best-matching pages.
+
+        Args:
+            query (str): The search query.
+            priority (Priority): The rate-limit lane; speculative prefetches use LOW.
+
+        Returns:
+            str: `Page: <title>\\nSummary: <summary>` blocks separated by blank
+                lines, truncated to `max_chars`, or a no-result message.
+        """
+        titles = await self._titles(query, priority)
+        summaries = await asyncio.gather(
+            *(self.summary(title, priority) for title in titles), return_exceptions=True
+        )
+        blocks = []
+        for title, summary in zip(titles, summaries):
+            if isinstance(summary, BaseException):
+                logger.warning("Wikipedia page %r could not be fetched: %s", title, summary)
+                continue
+            if summary:
+                blocks.append(f"Page: {title}\nSummary: {summary}")
+        if not blocks:
+            return NO_RESULT
+        return "\n\n".join(blocks)[: self.max_chars]
+
+
+def build_wikipedia_client() -> Union[WikipediaClient, "OfflineWikipedia"]:
+    """Builds the Wikipedia backend selected by the environment.
+
+    `WIKIPEDIA_BACKEND=offline` serves answers from the dump index built in
+    `WIKIPEDIA_DUMP_INDEX_PATH` (see `wiki_dump`); anything else uses the live
+    API. `WIKIPEDIA_TOP_K` and `WIKIPEDIA_MAX_CHARS` apply to both backends,
+    `WIKIPEDIA_CACHE_TTL_SECONDS` only to the live one.
+    """
+    top_k = env_int("WIKIPEDIA_TOP_K", 3)
+    max_chars = env_int("WIKIPEDIA_MAX_CHARS", 4000)
+    if os.getenv("WIKIPEDIA_BACKEND", "api").lower() == "offline":
+        # Imported lazily: the offline backend reuses this module's constants.
+        from .wiki_dump import OfflineWikipedia
+
+        directory = os.getenv("WIKIPEDIA_DUMP_INDEX_PATH")
+        if not directory:
+            raise ValueError("WIKIPEDIA_BACKEND=offline requires WIKIPEDIA_DUMP_INDEX_PATH.")
+        return OfflineWikipedia(directory, top_k=top_k, max_chars=max_chars)
+    return WikipediaClient(
+        top_k=top_k,
+        max_chars=max_chars,
+        ttl_seconds=env_float("WIKIPEDIA_CACHE_TTL_SECONDS", 3600.0),
+    )
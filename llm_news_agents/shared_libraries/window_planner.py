@@ -0,0 +1,148 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Splits long news searches into cached, concurrently queried date windows."""
+import asyncio
+import logging
+
+from datetime import date, datetime
+from typing import List, Tuple
+
+from .cache import TTLCache, normalise_query
+from .config import env_float, env_int
+from .news_engine import DATE_FORMAT, Article, NewsEngine, dedupe_articles
+
+logger = logging.getLogger(__name__)
+
+
+def plan_windows(from_date: str, to_date: str, window_days: int) -> List[Tuple[str, str]]:
+    """Covers a date range with sub-windows aligned to fixed calendar boundaries.
+
+    Windows start on days whose ordinal is a multiple of `window_days`, so
+    two overlapping requests produce identical windows for the days they
+    share and can reuse each other's cached results. Edge windows are not
+    trimmed to the request; callers filter articles by date instead. The
+    newest window never extends past today.
+
+    Args:
+        from_date (str): Oldest date of the request (YYYY-MM-DD).
+        to_date (str): Newest date of the request (YYYY-MM-DD).
+        window_days (int): Length of each sub-window in days.
+
+    Returns:
+        List[Tuple[str, str]]: Inclusive `(from, to)` windows, newest first.
+    """
+    start = datetime.strptime(from_date, DATE_FORMAT).date()
+    end = datetime.strptime(to_date, DATE_FORMAT).date()
+    if start > end:
+        start, end = end, start
+    today = date.today()
+    windows = []
+    first = start.toordinal() - start.toordinal() % window_days
+    for ordinal in range(first, end.toordinal() + 1, window_days):
+        window_start = date.fromordinal(ordinal)
+        window_end = min(date.fromordinal(ordinal + window_days - 1), max(today, end))
+        windows.append((window_start.strftime(DATE_FORMAT), window_end.strftime(DATE_FORMAT)))
+    return windows[::-1]
+
+
+def _relevance(article: Article, terms: List[str]) -> float:
+    """Fraction of query terms found in the article's title and description."""
+    if not terms:
+        return 0.0
+    text = f"{article.title or ''} {article.description or ''}".lower()
+    return sum(term in text for term in terms) / len(terms)
+
+
+class WindowPlanner:
+    """Answers long-range queries by fanning out over aligned sub-windows.
+
+    Each sub-window is searched through the engine and cached on its own, so
+    a follow-up query that overlaps an earlier one only fetches the windows
+    it has not seen. Windows no provider answered are not cached. Merged results are re-ranked so that every part of the
+    range is represented instead of the few days a single relevancy-sorted
+    page happens to favour.
+
+    Args:
+        engine (NewsEngine): The engine used for each sub-window.
+        window_days (int): Length of each sub-window in days.
+        concurrency (int): Sub-windows searched at the same time.
+        per_window (int): Articles requested per sub-window.
+    """
+
+    def __init__(
+        self, engine: NewsEngine, window_days: int = 7, concurrency: int = 4, per_window: int = 5
+    ) -> None:
+        self.engine = engine
+        self.window_days = window_days
+        self.per_window = per_window
+        self.concurrency = concurrency
+        self.cache = TTLCache(
+            ttl_seconds=env_float("NEWS_WINDOW_CACHE_TTL_SECONDS", 900.0),
+            max_entries=env_int("NEWS_WINDOW_CACHE_MAX_ENTRIES", 1024),
+            max_bytes=env_int("NEWS_WINDOW_CACHE_MAX_BYTES", 8 * 1024 * 1024),
+        )
+
+    async def _search_window(
+        self, query: str, window: Tuple[str, str], semaphore: asyncio.Semaphore
+    ) -> List[Article]:
+        key = (normalise_query(query), window, self.per_window)
+        cached = self.cache.get(key)
+        if cached is not None:
+            return cached
+        async with semaphore:
+            articles, answered = await self.engine.search_with_status(
+                query, window[0], window[1], page_size=self.per_window
+            )
+        if answered:
+            # An outage is not "no news"; leave the window uncached to retry it.
+            self.cache.set(key, articles)
+        return articles
+
+    async def search(
+        self, query: str, from_date: str, to_date: str, max_articles: int = 10
+    ) -> List[Article]:
+        """Searches every sub-window of the range concurrently and merges the results.
+
+        Args:
+            query (str): The keyword or phrase to search for.
+            from_date (str): Oldest date (YYYY-MM-DD).
+            to_date (str): Newest date (YYYY-MM-DD).
+            max_articles (int): Maximum number of articles to return.
+
+        Returns:
+            List[Article]: Deduplicated articles within the range, best first.
+        """
+        windows = plan_windows(from_date, to_date, self.window_days)
+        semaphore = asyncio.Semaphore(self.concurrency)
+        results = await asyncio.gather(
+            *(self._search_window(query, window, semaphore) for window in windows),
+            return_exceptions=True,
+        )
+
+        terms = normalise_query(query).split()
+        scored = []
+        for window, batch in zip(windows, results):
+            if isinstance(batch, BaseException):
+                logger.warning("News window %s..%s failed: %s", window[0], window[1], batch)
+                continue
+            for rank, article in enumerate(batch):
+                published = (article.published_at or "")[:10]
+                if published and not (from_date <= published <= to_date):
+                    continue
+                # Upstream rank within each window, blended with query-term
+                # overlap, so every window's best hits surface near the top.
+                scored.append((_relevance(article, terms) + 1.0 / (rank + 1), article))
+        scored.sort(key=lambda item: item[0], reverse=True)
+        return dedupe_articles(article for _, article in scored)[:max_articles]
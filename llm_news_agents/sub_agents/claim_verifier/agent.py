@@ -0,0 +1,119 @@
+"""Claim verifier agent that fans out fact checks for the investigative report."""
+import dataclasses
+import logging
+import re
+
+from typing import AsyncGenerator
+
+from google.adk.agents import BaseAgent
+from google.adk.agents.invocation_context import InvocationContext
+from google.adk.events import Event, EventActions
+from typing_extensions import override
+
+from . import prompt
+from ..investigative_journalist.agent import fact_check_claims
+from ..news_researcher.agent import grounded_search
+from ...shared_libraries.citations import CITATIONS_KEY, CitationRegistry
+from ...shared_libraries.claim_fanout import (
+    UNSUPPORTED,
+    VERDICTS,
+    ClaimFinding,
+    extract_claims,
+    rating_to_verdict,
+    render_findings,
+    verify_claims,
+)
+from ...shared_libraries.config import env_float, env_int
+
+logger = logging.getLogger(__name__)
+
+_VERDICT_LINE = re.compile(r"verdict:\s*(.+)", re.IGNORECASE)
+_JUSTIFICATION_LINE = re.compile(r"justification:\s*(.+)", re.IGNORECASE)
+
+
+async def verify_claim(claim: str) -> ClaimFinding:
+    """Verifies one claim, preferring published fact-checks over search grounding.
+
+    Args:
+        claim (str): The claim to verify.
+
+    Returns:
+        ClaimFinding: The verdict, a one-sentence justification and sources.
+    """
+    row = (await fact_check_claims([claim]))[0]
+    verdict = rating_to_verdict(row.get("verdict"))
+    if verdict:
+        return ClaimFinding(
+            claim,
+            verdict,
+            f"Fact-checked by {row['publishers'] or 'a fact-checker'}: rated {row['ratings']}.",
+            [row["url"]] if row.get("url") else [],
+        )
+
+    result = await grounded_search.search(prompt.claim_verification_PROMPT + claim)
+    answer = result["answer"]
+    verdict_match = _VERDICT_LINE.search(answer)
+    justification_match = _JUSTIFICATION_LINE.search(answer)
+    stated = verdict_match.group(1).strip().lower() if verdict_match else ""
+    verdict = next((v for v in VERDICTS if stated.startswith(v.lower())), UNSUPPORTED)
+    justification = (
+        justification_match.group(1).strip() if justification_match else answer.strip()[:300]
+    )
+    return ClaimFinding(
+        claim, verdict, justification or "No source found.", [s["uri"] for s in result["sources"][:3]]
+    )
+
+
+class ClaimVerifierAgent(BaseAgent):
+    """Extracts the report's claims and verifies them concurrently.
+
+    Claims come from the `investigative_report` state key. Each claim is
+    checked against published fact-checks first and, failing that, a single
+    search-grounded verification call. Up to `CLAIM_FANOUT_CONCURRENCY` claims
+    run at once, each limited to `CLAIM_FANOUT_TIMEOUT_SECONDS`; claims that
+    time out are reported as unsupported so partial results still reach the
+    editor. Sources are added to the session citation registry and cited by
+    id. The findings table is stored in `claim_findings` without adding any
+    text to the conversation.
+    """
+
+    @override
+    async def _run_async_impl(self, ctx: InvocationContext) -> AsyncGenerator[Event, None]:
+        report = ctx.session.state.get("investigative_report") or ""
+        claims = extract_claims(report, max_claims=env_int("CLAIM_FANOUT_MAX_CLAIMS", 12))
+        findings = await verify_claims(
+            claims,
+            verify_claim,
+            concurrency=env_int("CLAIM_FANOUT_CONCURRENCY", 4),
+            timeout=env_float("CLAIM_FANOUT_TIMEOUT_SECONDS", 20.0),
+        )
+        logger.info("Verified %d claims from the investigative report.", len(findings))
+        # Work on a copy of the state; new citations go out in the event's delta.
+        state = dict(ctx.session.state)
+        registry = CitationRegistry(state)
+        findings = [
+            dataclasses.replace(
+                finding,
+                sources=[
+                    f"[{citation_id}]"
+                    for citation_id in registry.register_all([(uri, "") for uri in finding.sources])
+                    if citation_id is not None
+                ],
+            )
+            for finding in findings
+        ]
+        state_delta = {"claim_findings": render_findings(findings)}
+        if CITATIONS_KEY in state:
+            state_delta[CITATIONS_KEY] = state[CITATIONS_KEY]
+        yield Event(
+            invocation_id=ctx.invocation_id,
+            author=self.name,
+            branch=ctx.branch,
+            actions=EventActions(state_delta=state_delta),
+        )
+
+
+claim_verifier_agent = ClaimVerifierAgent(
+    name="claim_verifier",
+    description="Verifies the investigative report's claims in parallel for the editor.",
+)
@@ -0,0 +1,8 @@
+"""Prompt for the claim verifier stage."""
+
+claim_verification_PROMPT = """
+Verify the following claim using Google Search. Reply with exactly two lines:
+Verdict: <one of Accurate, Inaccurate, Disputed, Unsupported, Not Applicable>
+Justification: <one sentence citing what the sources say>
+
+Claim: """
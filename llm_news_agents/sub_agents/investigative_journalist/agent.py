@@ -3,7 +3,6 @@ import os
 import sys
 import logging
 import google.cloud.logging
-import requests
 import asyncio
 import httpx
 
@@ -11,71 +10,74 @@ from google.adk import Agent
 from google.adk.agents import ParallelAgent
 from google.adk.agents.callback_context import CallbackContext
 from google.adk.models.llm_response import LlmResponse
-from google.genai import types
-from newsdataapi import NewsDataApiClient
-from datetime import datetime, timedelta
-from typing import Dict, Any, Optional, List
+from collections import Counter
+from datetime import datetime
+from typing import Dict, Any, Optional, List, Union
 from . import prompt
+from ...shared_libraries import http_client
+from ...shared_libraries.article_index import get_article_index
+from ...shared_libraries.cache import normalise_query
+from ...shared_libraries.citations import collect_citations
+from ...shared_libraries.claim_store import get_claim_store
+from ...shared_libraries.compaction import compact_tool_result
+from ...shared_libraries.config import env_bool, env_float, env_int
+from ...shared_libraries.lifecycle import register_stats
+from ...shared_libraries.near_dup import collapse_near_duplicates
+from ...shared_libraries.news_engine import Article, build_default_engine, resolve_window
+from ...shared_libraries.rate_limit import RateLimitError
+from ...shared_libraries.resilience import CircuitOpenError
+from ...shared_libraries.single_flight import SingleFlight
+from ...shared_libraries.window_planner import WindowPlanner
 
 logging.basicConfig(stream=sys.stdout, level=logging.INFO)
 logging.getLogger().addHandler(logging.StreamHandler(stream=sys.stdout))
 logger = logging.getLogger(__name__)
 
-async def _render_reference(
+# One engine per process so provider caches and connection pools are shared by
+# every session.
+news_engine = build_default_engine()
+
+# Long date ranges are split into aligned sub-windows searched concurrently.
+news_window_planner = WindowPlanner(
+    news_engine,
+    window_days=env_int("NEWS_WINDOW_DAYS", 7),
+    concurrency=env_int("NEWS_WINDOW_CONCURRENCY", 4),
+    per_window=env_int("NEWS_PAGE_SIZE", 5),
+)
+
+# Identical Fact Check calls issued concurrently by different sessions share
+# one request; `stats()` reports how many calls were collapsed.
+_factcheck_flights = SingleFlight("factcheck")
+
+register_stats("news", news_engine.stats)
+register_stats("factcheck.flights", _factcheck_flights.stats)
+register_stats("factcheck.store", lambda: get_claim_store().stats())
+
+async def _register_references(
     callback_context: CallbackContext,
     llm_response: LlmResponse,
 ) -> LlmResponse:
-    """Appends formatted grounding references to an LLM response and consolidates content.
+    """Registers grounding references in the session citations and consolidates content.
 
-    This function processes grounding metadata from an `LlmResponse`. If such
-    metadata exists, it formats the references into a markdown list, appends
-    this list to the response content, and then consolidates all text parts
+    Grounding chunks are collected from every chunk of a streamed response
+    into the session's citation registry, which the news editor renders once
+    at the end of the pipeline; no reference text is added here, so later
+    stages do not read it back as input. Partial responses are passed on
+    immediately, and the text parts of the final response are consolidated
     into a single part for a clean, unified output.
 
     Args:
-        callback_context: The context for the callback, containing state and
-          configuration. It is not used in this specific function.
+        callback_context: The context for the callback; its state holds the
+          citation registry.
         llm_response: The response object from the Language Model, potentially
           containing content and grounding metadata.
 
     Returns:
-        The modified `LlmResponse` object with formatted references appended
-        and content consolidated.
+        The `LlmResponse` object, with content consolidated once it is final.
     """
-    del callback_context
-    if (
-        not llm_response.content or
-        not llm_response.content.parts or
-        not llm_response.grounding_metadata
-    ):
+    llm_response = collect_citations(callback_context, llm_response)
+    if llm_response.partial or not llm_response.content or not llm_response.content.parts:
         return llm_response
-    
-    references = []
-    # Iterate through each grounding chunk provided in the metadata.
-    for chunk in llm_response.grounding_metadata.grounding_chunks or []:
-        title, uri, text = '', '', ''
-        # Extract details from either 'retrieved_context' or 'web' sources.
-        if chunk.retrieved_context:
-            title = chunk.retrieved_context.title
-            uri = chunk.retrieved_context.uri
-            text = chunk.retrieved_context.text
-        elif chunk.web:
-            title = chunk.web.title
-            uri = chunk.web.uri
-        
-        # Collect non-empty parts (title, text) for the reference string.
-        parts = [s for s in (title, text) if s]
-        if uri and parts:
-            # Format the first part as a markdown link if a URI exists.
-            parts[0] = f'[{parts[0]}]({uri})'
-        if parts:
-            # Join the parts and format as a list item.
-            references.append('* ' + ': '.join(parts) + '\n')
-   
-    # If any references were generated, append them to the response content.        
-    if references:
-        reference_text = ''.join(['\n\nReference:\n\n'] + references)
-        llm_response.content.parts.append(types.Part(text=reference_text))
 
     # Consolidate all text parts into a single part for cleaner output.
     # This avoids multiple, fragmented text sections in the final display.
@@ -87,184 +89,219 @@ async def _render_reference(
         # Remove all subsequent parts as their content is now in the first part.
         if len(llm_response.content.parts) > 1:
             del llm_response.content.parts[1:]
-        
+
     return llm_response
 
-async def fetch_top_newsdataio_api(query: str, from_date: Optional[str] = None, to_date: Optional[str] = None) -> List[Dict[str, Any]]:
+def _to_tool_result(articles: List[Article]) -> List[Dict[str, Any]]:
+    """Collapses syndicated copies of a story and converts articles to tool output.
+
+    Args:
+        articles (List[Article]): The articles found, best first.
+
+    Returns:
+        A list of article dictionaries, one per distinct story.
+    """
+    collapsed, saved_tokens = collapse_near_duplicates(
+        articles, max_distance=env_int("NEWS_NEAR_DUP_MAX_DISTANCE", 12)
+    )
+    if saved_tokens:
+        logger.info(
+            "Collapsed %d near-duplicate articles, saving ~%d tokens.",
+            len(articles) - len(collapsed),
+            saved_tokens,
+        )
+    return [article.to_dict() for article in collapsed]
+
+
+def _search_local_index(
+    query: str, from_date: str, to_date: str, max_articles: int
+) -> Optional[List[Article]]:
+    """Answers a news query from the local article index when it can.
+
+    Only hits matching at least `NEWS_INDEX_MIN_COVERAGE` of the query terms
+    count. Ranges reaching today also require the hits to have been fetched
+    within `NEWS_INDEX_FRESHNESS_SECONDS`, while older ranges do not change
+    and are served regardless of age.
+
+    Args:
+        query (str): The keyword or phrase to search for.
+        from_date (str): Oldest date (YYYY-MM-DD).
+        to_date (str): Newest date (YYYY-MM-DD).
+        max_articles (int): The maximum number of articles to return.
+
+    Returns:
+        The indexed articles if there are at least `NEWS_INDEX_MIN_HITS` of
+        them (or `max_articles`, if fewer), otherwise None.
     """
-    Asynchronously searches for news articles using the NewsAPI 'everything' endpoint.
+    if not env_bool("NEWS_INDEX_ENABLED", True):
+        return None
+    max_age = None
+    if to_date >= datetime.now().strftime("%Y-%m-%d"):
+        max_age = env_float("NEWS_INDEX_FRESHNESS_SECONDS", 900.0)
+    hits = get_article_index().search(
+        query, k=max_articles, from_date=from_date, to_date=to_date, max_age_seconds=max_age
+    )
+    min_coverage = env_float("NEWS_INDEX_MIN_COVERAGE", 1.0)
+    articles = [article for _, coverage, article in hits if coverage >= min_coverage]
+    if len(articles) < min(max_articles, env_int("NEWS_INDEX_MIN_HITS", 5)):
+        return None
+    logger.info("Answered news query %r from the local index (%d articles).", query, len(articles))
+    return articles
+
 
-    This function handles API calls asynchronously, validates date formats, and gracefully
-    manages potential web errors. If dates are not provided, it defaults to searching
-    the last 7 days.
+async def search_news(
+    query: str,
+    from_date: Optional[str] = None,
+    to_date: Optional[str] = None,
+    max_articles: int = 10,
+) -> List[Dict[str, Any]]:
+    """
+    Searches every configured news provider for articles matching a query.
+
+    NewsAPI, NewsData and any local stand-in are queried concurrently within
+    a latency budget, following further result pages in the background, so a
+    single call returns broad coverage. Ranges longer than a week are split
+    into sub-windows searched in parallel and re-ranked together, so every
+    part of the range is represented. Results are merged into one schema
+    and duplicates across providers are dropped. Every fetched article is
+    added to a local BM25 index, and queries it can already answer with
+    fresh, fully matching articles skip the network. If dates are not provided,
+    it defaults to searching the last 7 days; NewsAPI only serves its plan's
+    horizon (29 days on the Free Plan), older windows rely on other providers.
 
     Args:
         query (str): The keyword or phrase to search for.
-        from_date (Optional[str]): The oldest date for articles (YYYY-MM-DD). 
+        from_date (Optional[str]): The oldest date for articles (YYYY-MM-DD).
                                  Defaults to 7 days before the to_date.
-        to_date (Optional[str]): The newest date for articles (YYYY-MM-DD). 
+        to_date (Optional[str]): The newest date for articles (YYYY-MM-DD).
                                Defaults to the current date.
+        max_articles (int): The maximum number of articles to return.
 
     Returns:
-        A list of article dictionaries, or an empty list if an error occurs.
-    
+        A list of article dictionaries with 'source', 'title', 'description',
+        'url', 'published_at', 'provider' and 'other_sources' keys, one per
+        distinct story, or an empty list if no provider answered.
+
     Raises:
         ValueError: If the provided date format is incorrect.
     """
-    # It's a best practice to get sensitive keys from environment variables
-    api_key = os.getenv("NEWSAPI_KEY")
-    if not api_key:
-        print("Error: 'NEWSAPI_KEY' environment variable not set.")
-        return []
-
-    url = "https://newsapi.org/v2/everything"
-    
-    # Set headers, including User-Agent, to prevent certain connection errors
-    headers = {
-        "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/58.0.3029.110 Safari/537.36"
-    }
-
-    params = {
-        "q": query,
-        "sortBy": "relevancy",
-        "pageSize": 5,
-        "page": 1,
-        "language": "en",
-        "apiKey": api_key
-    }
+    from_date, to_date = resolve_window(from_date, to_date)
+    max_articles = max(1, min(max_articles, env_int("NEWS_MAX_ARTICLES", 25)))
+    articles = await asyncio.to_thread(_search_local_index, query, from_date, to_date, max_articles)
+    if articles is not None:
+        return _to_tool_result(articles)
+
+    span = datetime.strptime(to_date, "%Y-%m-%d") - datetime.strptime(from_date, "%Y-%m-%d")
+    # The default week fits one window and keeps pagination and the token budget.
+    if abs(span.days) > news_window_planner.window_days:
+        articles = await news_window_planner.search(query, from_date, to_date, max_articles)
+    else:
+        articles = await news_engine.collect(
+            query,
+            from_date,
+            to_date,
+            max_articles=max_articles,
+            max_tokens=env_int("NEWS_MAX_TOKENS", 2000),
+            page_size=env_int("NEWS_PAGE_SIZE", 5),
+            max_pages=env_int("NEWS_MAX_PAGES", 3),
+        )
+    await asyncio.to_thread(get_article_index().add, articles)
+    return _to_tool_result(articles)
+
+
+async def _search_claims(url: str, params: Dict[str, Any]) -> Dict[str, Any]:
+    """Fetches Fact Check Tools results, sharing identical in-flight requests.
 
-    # Set default dates if they are not provided
-    if to_date is None:
-        to_date = datetime.now().strftime("%Y-%m-%d")
-    
-    if from_date is None:
-        try:
-            # Calculate 7 days prior to the effective 'to_date'
-            to_date_obj = datetime.strptime(to_date, "%Y-%m-%d")
-            from_date_obj = to_date_obj - timedelta(days=7)
-            from_date = from_date_obj.strftime("%Y-%m-%d")
-        except ValueError:
-            raise ValueError("to_date must be in YYYY-MM-DD format to calculate default from_date.")
-
-
-    # Validate and add date parameters. This handles both provided and default dates.
-    try:
-        # Validate the date format
-        from_dt = datetime.strptime(from_date, "%Y-%m-%d")
-        params["from"] = from_dt.strftime("%Y-%m-%d")
-    except ValueError:
-        raise ValueError("from_date must be in YYYY-MM-DD format.")
+    Args:
+        url (str): The claims:search endpoint.
+        params (Dict[str, Any]): The fully resolved request parameters.
 
-    try:
-        # Validate the date format
-        to_dt = datetime.strptime(to_date, "%Y-%m-%d")
-        params["to"] = to_dt.strftime("%Y-%m-%d")
-    except ValueError:
-        raise ValueError("to_date must be in YYYY-MM-DD format.")
+    Returns:
+        The decoded JSON payload of the response.
 
-    try:
-        # Use httpx.AsyncClient for making asynchronous web requests
-        async with httpx.AsyncClient() as client:
-            response = await client.get(url, params=params, headers=headers)
-            # Raise an exception for bad status codes (4xx or 5xx)
-            response.raise_for_status()  
-            data = response.json()
-
-        # Extract only the desired fields from the articles
-        filtered_articles = []
-        for article in data.get("articles", []):
-            filtered_articles.append({
-                "source": article.get("source", {}).get("name"),
-                "title": article.get("title"),
-                "description": article.get("description"),
-                "url": article.get("url")
+    Raises:
+        httpx.HTTPError: If the request fails or returns a 4xx or 5xx status.
+    """
+    key = (
+        url,
+        normalise_query(params["query"]),
+        params.get("languageCode"),
+        params.get("maxAgeDays"),
+        params.get("pageSize"),
+        params.get("pageToken"),
+    )
+
+    async def _fetch() -> Dict[str, Any]:
+        response = await http_client.get(url, params=params)
+        response.raise_for_status()
+        return response.json()
+
+    return await _factcheck_flights.do(key, _fetch)
+
+
+FACTCHECK_URL = "https://factchecktools.googleapis.com/v1alpha1/claims:search"
+
+
+def _parse_claims(data: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """Reduces a claims:search payload to the fields the agents use."""
+    parsed_claims = []
+    for claim in data.get("claims", []):
+        claim_info = {
+            "text": claim.get("text"),
+            "claimDate": claim.get("claimDate"),
+            "claimant": claim.get("claimant"),
+            "claimReviews": [],
+        }
+        for review in claim.get("claimReview", []):
+            claim_info["claimReviews"].append({
+                "publisher": review.get("publisher", {}).get("name"),
+                "reviewDate": review.get("reviewDate"),
+                "textualRating": review.get("textualRating"),
+                "url": review.get("url"),
             })
-        return filtered_articles
-
-    except httpx.HTTPStatusError as e:
-        # Handle HTTP errors gracefully
-        print(f"Error searching news: HTTP {e.response.status_code} - {e.response.text}")
-        return []
-    except httpx.RequestError as e:
-        # Handle network-related errors
-        print(f"Error searching news: A network error occurred - {e}")
-        return []
-    except Exception as e:
-        # Handle other unexpected errors
-        print(f"An unexpected error occurred: {e}")
-        return []
-    
+        parsed_claims.append(claim_info)
+    return parsed_claims
 
-from typing import Optional, List, Dict, Any
 
-async def search_news(query: str, from_date: Optional[str] = None, to_date: Optional[str] = None) -> List[Dict[str, Any]]:
-    """
-    Search for news articles matching a query using NewsAPI's 'everything' endpoint.
-    Automatically adjusts 'from_date' to adhere to the Free Plan limit (30 days).
+async def _lookup_claims(
+    query: str,
+    language_code: str,
+    max_age_days: int,
+    page_size: int,
+    max_pages: int = 1,
+) -> List[Dict[str, Any]]:
+    """Finds fact-checked claims for a query, locally if possible.
+
+    Claims already seen for the same or a similar query, or whose text closely
+    matches it, are answered from the local claim store. Otherwise up to
+    `max_pages` result pages are fetched by following `nextPageToken`, and the
+    parsed claims are stored for next time.
+
+    Raises:
+        httpx.HTTPError: If a request fails or returns a 4xx or 5xx status.
+        RateLimitError: If the Fact Check quota or wait budget is exhausted.
+        CircuitOpenError: If the endpoint is currently failing fast.
     """
-    api_key = os.getenv("NEWSAPI_KEY")
-    url = "https://newsapi.org/v2/everything"
-    
-    # Base parameters
+    store = get_claim_store()
+    stored = await asyncio.to_thread(store.lookup, query, language_code, max_age_days)
+    if stored is not None:
+        return stored[:page_size * max_pages]
     params = {
-        "q": query,
-        "sortBy": "relevancy",
-        "pageSize": 5,
-        "page": 1,
-        "language": "en",
-        "apiKey": api_key
+        "key": os.getenv("FACT_CHECKER_API_KEY"),
+        "query": query,
+        "languageCode": language_code,
+        "maxAgeDays": max_age_days,
+        "pageSize": page_size,
     }
-
-    # ---------------------------------------------------------
-    # PROPOSED SOLUTION: Calculate the oldest allowable date (29 days ago)
-    # ---------------------------------------------------------
-    oldest_allowed_date = datetime.now() - timedelta(days=29)
-
-    # Handle 'from_date' with the 30-day logic applied
-    if from_date:
-        try:
-            # Parse the user's requested date
-            from_dt = datetime.strptime(from_date, "%Y-%m-%d")
-            
-            # Check if the user's date is older than the allowed limit
-            if from_dt < oldest_allowed_date:
-                print(f"Notice: '{from_date}' is too old for the Free Plan. Adjusting to '{oldest_allowed_date.strftime('%Y-%m-%d')}'.")
-                from_dt = oldest_allowed_date
-            
-            params["from"] = from_dt.strftime("%Y-%m-%d")
-        except ValueError:
-            raise ValueError("from_date must be in YYYY-MM-DD format.")
-
-    # Handle 'to_date'
-    if to_date:
-        try:
-            to_dt = datetime.strptime(to_date, "%Y-%m-%d")
-            params["to"] = to_dt.strftime("%Y-%m-%d")
-        except ValueError:
-            raise ValueError("to_date must be in YYYY-MM-DD format.")
-
-    # Make the API request
-    # Note: requests.get is synchronous. In a strictly async function, 
-    # this blocks the loop. Consider using 'httpx' or 'aiohttp' for true async.
-    response = requests.get(url, params=params)
-    
-    # Specific handling for the 426 error if it somehow slips through
-    if response.status_code == 426:
-        raise Exception("NewsAPI Error: 426 Upgrade Required. You are trying to access data too far back for your plan.")
-        
-    response.raise_for_status()
-    data = response.json()
-
-    filtered = []
-    for article in data.get("articles", []):
-        filtered.append({
-            "source": article.get("source"),          
-            "title": article.get("title"),
-            "description": article.get("description"),
-            "url": article.get("url")
-        })
-
-    return filtered
+    parsed_claims = []
+    for _ in range(max_pages):
+        data = await _search_claims(FACTCHECK_URL, params)
+        parsed_claims.extend(_parse_claims(data))
+        if not data.get("nextPageToken"):
+            break
+        params = {**params, "pageToken": data["nextPageToken"]}
+    await asyncio.to_thread(store.store, query, language_code, parsed_claims, max_age_days)
+    return parsed_claims
 
 
 async def fact_checker(
@@ -272,44 +309,81 @@ async def fact_checker(
     language_code: str = "en-US",
     max_age_days: int = 30,
     page_size: int = 10,
-) -> Optional[List[Dict]]:
+) -> Union[List[Dict], Dict[str, Any]]:
     """
     Searches the Google Fact Check Tools API for claims matching the given query.
+
+    Claims already seen for the same or a similar query, or whose text closely
+    matches it, are answered from the local claim store without an API call.
+    If the API cannot be reached, a dict with a 'status' of 'error' and an
+    'error' message is returned instead of the claims.
     """
-    BASE_URL = "https://factchecktools.googleapis.com/v1alpha1/claims:search"
-    params = {
-        "key": os.getenv("FACT_CHECKER_API_KEY"),
-        "query": query,
-        "languageCode": language_code,
-        "maxAgeDays": max_age_days,
-        "pageSize": page_size,
-    }
     try:
-        response = requests.get(BASE_URL, params=params)
-        response.raise_for_status()
-        data = response.json()
-        if "claims" not in data:
-            return []
-        parsed_claims = []
-        for claim in data["claims"]:
-            claim_info = {
-                "text": claim.get("text"),
-                "claimDate": claim.get("claimDate"),
-                "claimant": claim.get("claimant"),
-                "claimReviews": [],
-            }
-            for review in claim.get("claimReview", []):
-                claim_info["claimReviews"].append({
-                    "publisher": review.get("publisher", {}).get("name"),
-                    "reviewDate": review.get("reviewDate"),
-                    "textualRating": review.get("textualRating"),
-                    "url": review.get("url"),
-                })
-            parsed_claims.append(claim_info)
-        return parsed_claims
-    except requests.exceptions.RequestException as e:
-        print(f"Error making API request: {e}")
-        return None
+        return await _lookup_claims(query, language_code, max_age_days, page_size)
+    except (httpx.HTTPError, RateLimitError, CircuitOpenError) as e:
+        logger.warning("Fact Check lookup failed: %s", e)
+        return {
+            "status": "error",
+            "error": f"Fact Check lookup failed: {e}. Report the claim as unverified.",
+        }
+
+
+def _verdict_row(claim: str, found: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Summarises the fact checks found for one claim as a single table row."""
+    reviews = [review for item in found for review in item["claimReviews"]]
+    ratings = Counter(
+        review["textualRating"].strip() for review in reviews if review.get("textualRating")
+    )
+    publishers = list(dict.fromkeys(review["publisher"] for review in reviews if review.get("publisher")))
+    return {
+        "claim": claim,
+        "verdict": ratings.most_common(1)[0][0] if ratings else "no fact-check found",
+        "ratings": ", ".join(f"{rating} x{count}" for rating, count in ratings.most_common()),
+        "publishers": ", ".join(publishers[:3]),
+        "url": next((review["url"] for review in reviews if review.get("url")), None),
+        "matches": len(found),
+    }
+
+
+async def fact_check_claims(
+    claims: List[str],
+    language_code: str = "en-US",
+    max_age_days: int = 30,
+) -> List[Dict[str, Any]]:
+    """
+    Fact-checks several claims at once and returns one verdict row per claim.
+
+    Claims are looked up concurrently against the Google Fact Check Tools API
+    (and the local claim store), following further result pages where needed.
+    Prefer this tool over calling fact_checker once per claim.
+
+    Args:
+        claims (List[str]): The claims to verify, one statement each.
+        language_code (str): The BCP-47 language of the claims.
+        max_age_days (int): Only consider reviews published within this many days.
+
+    Returns:
+        A list with one row per distinct claim, holding 'claim', 'verdict'
+        (the most common rating, 'no fact-check found' or 'error'), 'ratings',
+        'publishers', 'url' and 'matches' keys.
+    """
+    distinct: Dict[str, str] = {}
+    for claim in claims:
+        if claim.strip():
+            distinct.setdefault(normalise_query(claim), claim)
+    unique = list(distinct.values())[:env_int("FACTCHECK_BATCH_MAX_CLAIMS", 20)]
+    semaphore = asyncio.Semaphore(env_int("FACTCHECK_BATCH_CONCURRENCY", 4))
+    max_pages = env_int("FACTCHECK_MAX_PAGES", 2)
+
+    async def _check(claim: str) -> Dict[str, Any]:
+        async with semaphore:
+            try:
+                found = await _lookup_claims(claim, language_code, max_age_days, 10, max_pages)
+            except (httpx.HTTPError, RateLimitError, CircuitOpenError) as e:
+                return {"claim": claim, "verdict": "error", "error": str(e)}
+        return _verdict_row(claim, found)
+
+    return list(await asyncio.gather(*(_check(claim) for claim in unique)))
 
 
 news_researcher = Agent(
@@ -322,7 +396,8 @@ news_researcher = Agent(
         Provide comprehensive summaries of the news found.
         Do not worry about fact-checking; focus on information gathering.
     """,
-    tools=[fetch_top_newsdataio_api,search_news],
+    tools=[search_news],
+    after_tool_callback=compact_tool_result,
     output_key="research_options", 
 
 )
@@ -334,10 +409,13 @@ fact_checker_agent = Agent(
     instruction="""
         You are a strict fact checker.
         Verify specific claims provided to you.
+        Check all claims together with a single fact_check_claims call; use
+        fact_checker only to dig into one claim in detail.
         Rate the veracity of statements based on your tool's output.
         Be extremely skeptical and precise.""",
     description="You are a strict fact checker.",
-    tools=[fact_checker],
+    tools=[fact_check_claims, fact_checker],
+    after_tool_callback=compact_tool_result,
     output_key="factchecker_options", 
 )
 
@@ -354,8 +432,9 @@ parallel_info_search = ParallelAgent(
 investigative_journalist_agent = Agent(
     model='gemini-2.5-flash-lite',
     name='investigative_journalist',
-    after_model_callback=_render_reference,
+    after_model_callback=_register_references,
     instruction=prompt.investigative_journalist_PROMPT,
     sub_agents=[parallel_info_search],
+    output_key="investigative_report",
 )
 
@@ -1,18 +1,22 @@
 """News editor agent for correcting inaccuracies based on verified findings."""
-import asyncio
-import os
-import requests
-
-from typing import Optional, List, Dict
+from typing import Optional
 from google.adk import Agent
 from google.adk.agents.callback_context import CallbackContext
 from google.adk.models.llm_response import LlmResponse
 from google.adk.tools.google_search_tool import google_search
 from google.genai import types
 from . import prompt
+from ...shared_libraries.cache import TTLCache
+from ...shared_libraries.citations import render_citations
+from ...shared_libraries.report_cache import store_final_report
+from ...shared_libraries.streaming import MarkerFilter
 
 _END_OF_EDIT_MARK = '---END-OF-EDIT---'
 
+# Streaming marker filters of in-progress editor responses, by invocation id.
+# Bounded, so filters of streams that errored or were cancelled still age out.
+_marker_filters = TTLCache(ttl_seconds=15 * 60, max_entries=256, max_bytes=1024 * 1024)
+
 async def _remove_end_of_edit_mark(
     callback_context: CallbackContext,
     llm_response: LlmResponse,
@@ -23,9 +27,15 @@ async def _remove_end_of_edit_mark(
     response content. If found, it truncates the text at that point and removes
     any subsequent parts of the response, ensuring a clean final output.
 
+    When streaming, partial responses go through a per-invocation
+    `MarkerFilter`, which holds back only a possible start of the marker, so
+    a marker split across chunks never reaches the client and the rest of
+    the text streams without delay.
+
     Args:
         callback_context (CallbackContext): The context object for the callback,
-            provided by the agent framework. It is not used in this function.
+            provided by the agent framework. Its invocation id keys the
+            streaming filter.
         llm_response (LlmResponse): The response object from the language model
             which may contain the end-of-edit marker.
 
@@ -33,12 +43,22 @@ async def _remove_end_of_edit_mark(
         LlmResponse: The modified response object with the marker and any
             subsequent content removed.
     """
-    del callback_context  # Mark callback_context as intentionally unused.
-
     # If the response or its parts are empty, return it as is.
     if not llm_response.content or not llm_response.content.parts:
         return llm_response
 
+    if llm_response.partial:
+        marker_filter = _marker_filters.get(callback_context.invocation_id)
+        if marker_filter is None:
+            marker_filter = MarkerFilter(_END_OF_EDIT_MARK)
+            _marker_filters.set(callback_context.invocation_id, marker_filter)
+        for part in llm_response.content.parts:
+            if part.text:
+                part.text = marker_filter.feed(part.text)
+        return llm_response
+    # The final, aggregated response carries the whole text again.
+    _marker_filters.pop(callback_context.invocation_id, None)
+
     # Iterate through the parts of the response to find the marker.
     for idx, part in enumerate(llm_response.content.parts):
         if part.text and _END_OF_EDIT_MARK in part.text:
@@ -55,61 +75,25 @@ async def _render_reference(
     callback_context: CallbackContext,
     llm_response: LlmResponse,
 ) -> LlmResponse:
-    """Appends formatted grounding references from Google Search to the response.
+    """Appends the session's references list to the final response.
 
-    This function processes grounding metadata attached to the LLM response,
-    formats it into a readable 'References' section with markdown links, and
-    appends it to the response content.
+    The editor's own Google Search grounding is registered in the session's
+    citation registry alongside the sources collected by earlier stages,
+    and the final response gets a single numbered 'References' section of
+    every source cited in the current turn, deduplicated by URI. Partial
+    responses pass through without delay.
 
     Args:
-        callback_context (CallbackContext): The context object for the callback,
-            which is not used in this function.
+        callback_context (CallbackContext): The context object for the callback;
+            its state holds the citation registry.
         llm_response (LlmResponse): The response object from the language model,
             containing grounding metadata from search results.
 
     Returns:
-        LlmResponse: The modified response object with a new 'References'
-            section appended, if grounding metadata was available.
+        LlmResponse: The response object, with a 'References' section appended
+            to the final response if any sources were cited.
     """
-    del callback_context # Mark callback_context as intentionally unused.
-
-    # Check if there is content and grounding metadata to process.
-    if (
-        not llm_response.content or
-        not llm_response.content.parts or
-        not llm_response.grounding_metadata
-    ):
-        return llm_response
-
-    references = []
-    # Loop through each grounding chunk provided in the metadata.
-    for chunk in llm_response.grounding_metadata.grounding_chunks or []:
-        title, uri, text = '', '', ''
-        # Extract title and URI from different possible grounding sources.
-        if chunk.retrieved_context:
-            title = chunk.retrieved_context.title
-            uri = chunk.retrieved_context.uri
-        elif chunk.web:
-            title = chunk.web.title
-            uri = chunk.web.uri
-
-        # Collect the parts of the reference that are not empty.
-        parts = [s for s in (title, text) if s]
-        if uri and parts:
-            # Format the title as a markdown link if a URI is available.
-            parts[0] = f'[{parts[0]}]({uri})'
-        if parts:
-            # Join the parts into a single reference line and add to the list.
-            references.append('* ' + ': '.join(parts) + '\n')
-
-    # If any references were successfully formatted, append them to the response.
-    if references:
-        # Combine all references into a single text block.
-        reference_text = ''.join(['\n\nReferences:\n\n'] + references)
-        # Add the reference text as a new part of the response content.
-        llm_response.content.parts.append(types.Part(text=reference_text))
-
-    return llm_response
+    return render_citations(callback_context, llm_response, heading='References')
 
 
 async def final_processing_callback(
@@ -119,8 +103,10 @@ async def final_processing_callback(
     """Combines reference rendering and cleanup into a single final callback.
 
     This function orchestrates the final processing of the language model's
-    response by executing a sequence of helper functions. It first appends
-    grounding references and then cleans up any internal markers.
+    response by executing a sequence of helper functions. It first cleans up
+    the end-of-edit marker, so the references appended afterwards are not cut
+    off with the text following the marker, and then stores the finished
+    report in the report cache.
 
     Args:
         callback_context (CallbackContext): The context object for the callback,
@@ -132,12 +118,28 @@ async def final_processing_callback(
         LlmResponse: The fully processed and cleaned response object, ready to
             be sent to the user.
     """
-    # First, render the references from the Google Search grounding.
-    llm_response = await _render_reference(callback_context, llm_response)
-    # Second, remove the end-of-edit marker for a clean final output.
+    # First, remove the end-of-edit marker for a clean final output.
     llm_response = await _remove_end_of_edit_mark(callback_context, llm_response)
+    # Second, render the references from the Google Search grounding.
+    llm_response = await _render_reference(callback_context, llm_response)
+    # Finally, keep the finished report for repeated requests on the topic.
+    llm_response = await store_final_report(callback_context, llm_response)
     return llm_response
 
+
+async def _drop_marker_filter(callback_context: CallbackContext) -> Optional[types.Content]:
+    """Forgets the invocation's streaming filter once the editor has finished.
+
+    Args:
+        callback_context (CallbackContext): The context object for the callback;
+            its invocation id keys the streaming filter.
+
+    Returns:
+        Optional[types.Content]: Always None, leaving the agent's output as is.
+    """
+    _marker_filters.pop(callback_context.invocation_id)
+    return None
+
 news_editor_agent = Agent(
     model='gemini-2.5-flash-lite',
     name='news_editor_agent',
@@ -145,4 +147,5 @@ news_editor_agent = Agent(
     # Added Google Search for the final grounding step
     tools=[google_search],
     after_model_callback=final_processing_callback,
+    after_agent_callback=_drop_marker_filter,
 )
@@ -74,5 +74,7 @@ The sun is sphere-shaped and very hot.
 ---END-OF-EDIT---
 
 Here are the question-answer pair and the reviewer-provided findings:
+
+{claim_findings?}
 """
 
@@ -1,23 +1,33 @@
 import os
 import logging
 import google.cloud.logging
+import httpx
+import json
 import requests
 
-from typing import Optional, List, Dict
+from typing import Any, Optional, List, Dict
 from dotenv import load_dotenv
 from datetime import datetime
 
 from google.adk import Agent
 from google.adk.tools.google_search_tool import google_search
 from google.adk.tools import agent_tool 
+from google.adk.agents.callback_context import CallbackContext
 from google.adk.tools.tool_context import ToolContext
-from google.adk.tools.langchain_tool import LangchainTool  
 #from google.adk.tools.crewai_tool import CrewaiTool
+from google.genai import errors as genai_errors
 from google.genai import types
 from . import prompt
-
-from langchain_community.tools import WikipediaQueryRun
-from langchain_community.utilities import WikipediaAPIWrapper
+from ...shared_libraries.citations import CitationRegistry, collect_citations
+from ...shared_libraries.compaction import compact_tool_result
+from ...shared_libraries.config import env_bool, env_float, env_int
+from ...shared_libraries.lifecycle import register_stats
+from ...shared_libraries.rate_limit import Priority, RateLimitError
+from ...shared_libraries.research_log import ResearchLog
+from ...shared_libraries.resilience import CircuitOpenError
+from ...shared_libraries.speculation import SpeculativePrefetcher
+from ...shared_libraries.web_search import build_grounded_search
+from ...shared_libraries.wikipedia import NO_RESULT, build_wikipedia_client
 
 cloud_logging_client = google.cloud.logging.Client()
 cloud_logging_client.setup_logging()
@@ -31,6 +41,62 @@ if not logger.handlers:
     logger.setLevel(logging.INFO)
 
 # Tools
+wikipedia_client = build_wikipedia_client()
+
+
+async def wikipedia(query: str) -> str:
+    """A wrapper around Wikipedia. Useful for when you need to answer general
+    questions about people, places, companies, facts, historical events, or
+    other subjects. Input should be a search query.
+
+    Args:
+        query (str): The search query.
+
+    Returns:
+        str: Summaries of the best-matching pages.
+    """
+    try:
+        return await wikipedia_client.run(query)
+    except (httpx.HTTPError, RateLimitError, CircuitOpenError) as e:
+        logger.warning("Wikipedia lookup failed: %s", e)
+        return f"Wikipedia lookup failed: {e}"
+
+
+grounded_search = build_grounded_search()
+register_stats("web_search", grounded_search.stats)
+
+
+async def web_search(query: str, tool_context: ToolContext) -> Dict[str, Any]:
+    """Searches the web with Google Search and returns a grounded answer.
+
+    Args:
+        query (str): The question or search query.
+
+    Returns:
+        Dict[str, Any]: The 'answer' text, its 'sources' (citation id and
+        title) and the 'search_queries' issued, or a 'status' of 'error'
+        with an 'error' message if the search could not be run.
+    """
+    try:
+        result = await grounded_search.search(query)
+    except (genai_errors.APIError, httpx.HTTPError, RateLimitError, CircuitOpenError) as e:
+        logger.warning("Web search failed: %s", e)
+        return {
+            "status": "error",
+            "error": f"Web search failed: {e}. Try the wikipedia tool or a different query.",
+        }
+    # Sources go to the session citation registry; the model only sees their
+    # ids, and the editor renders the full list once at the end.
+    ids = CitationRegistry(tool_context.state).register_all(
+        [(source["uri"], source["title"]) for source in result["sources"]]
+    )
+    sources = [
+        {"id": citation_id, "title": source["title"]}
+        for citation_id, source in zip(ids, result["sources"])
+    ]
+    return {**result, "sources": sources}
+
+
 def append_to_state(
     tool_context: ToolContext, field: str, response: str
 ) -> dict[str, str]:
@@ -41,23 +107,86 @@ def append_to_state(
         response (str): a string to append to the field
 
     Returns:
-        dict[str, str]: {"status": "success"}
+        dict[str, str]: {"status": "success"}, or {"status": "duplicate"} if
+        the same finding was already saved
     """
-    existing_state = tool_context.state.get(field, [])
-    tool_context.state[field] = existing_state + [response]
+    log = ResearchLog(
+        tool_context.state,
+        field,
+        max_entries=env_int("RESEARCH_LOG_MAX_ENTRIES", 50),
+        keep_uncompressed=env_int("RESEARCH_LOG_KEEP_UNCOMPRESSED", 10),
+    )
+    if not log.append(response):
+        return {"status": "duplicate"}
     logging.info(f"[Added to {field}] {response}")
     return {"status": "success"}
 
 
+# Research lookups for the user's topic start as soon as the pipeline does and
+# overlap the investigative stage; research_agent picks up whatever finished.
+research_prefetcher = SpeculativePrefetcher("research")
+register_stats("research_prefetch", research_prefetcher.stats)
+
+
+def _web_search_direct() -> bool:
+    return os.getenv("WEB_SEARCH_MODE", "agent") == "direct"
+
+
+async def start_research_prefetch(callback_context: CallbackContext) -> Optional[types.Content]:
+    """Starts the research stage's topic lookups in the background.
+
+    Used as a `before_agent_callback` of the pipeline. Wikipedia is queried in
+    the LOW rate-limit lane so the earlier stages' own calls go first; direct
+    web search is included when `WEB_SEARCH_MODE=direct`. The lookups also
+    warm the tools' caches. `SPECULATIVE_RESEARCH=0` disables prefetching.
+
+    Returns:
+        None, so the pipeline always runs.
+    """
+    if not env_bool("SPECULATIVE_RESEARCH", True):
+        return None
+    content = callback_context.user_content
+    topic = " ".join(part.text for part in (content.parts or []) if part.text) if content else ""
+    if not topic.strip():
+        return None
+
+    async def _web() -> str:
+        return json.dumps(await grounded_search.search(topic))
+
+    jobs = {"Wikipedia": lambda: wikipedia_client.run(topic, priority=Priority.LOW)}
+    if _web_search_direct():
+        jobs["Web search"] = _web
+    research_prefetcher.start(callback_context.invocation_id, jobs)
+    return None
+
+
+async def merge_research_prefetch(callback_context: CallbackContext) -> Optional[types.Content]:
+    """Hands finished prefetches to research_agent through `speculative_research`.
+
+    Lookups still running after `SPECULATIVE_RESEARCH_GRACE_SECONDS` are
+    cancelled rather than delaying the stage.
+
+    Returns:
+        None, so the research agent always runs.
+    """
+    results = await research_prefetcher.collect(
+        callback_context.invocation_id,
+        grace=env_float("SPECULATIVE_RESEARCH_GRACE_SECONDS", 2.0),
+    )
+    blocks = [f"{name}:\n{result}" for name, result in results.items() if result and result != NO_RESULT]
+    callback_context.state["speculative_research"] = "\n\n".join(blocks)
+    return None
+
 
 # Agents
-web_search = Agent(
+web_search_agent = Agent(
     name='web_search_agent',
     model='gemini-2.0-flash',
     instruction=(
         'You are a helpful agent that can answer questions using web search.'
     ),
     tools=[google_search],
+    after_model_callback=collect_citations,
 )
 research_agent = Agent(
     name="researcher",
@@ -67,9 +196,13 @@ research_agent = Agent(
     generate_content_config=types.GenerateContentConfig(
     temperature=0,
     ),
+    before_agent_callback=merge_research_prefetch,
+    after_tool_callback=compact_tool_result,
     tools=[
-        LangchainTool(tool=WikipediaQueryRun(api_wrapper=WikipediaAPIWrapper())),
-        agent_tool.AgentTool(web_search),
+        wikipedia,
+        # WEB_SEARCH_MODE=direct skips the nested search agent and returns the
+        # grounding sources as data from a single cached model call.
+        web_search if _web_search_direct() else agent_tool.AgentTool(web_search_agent),
         append_to_state,
         
     ],
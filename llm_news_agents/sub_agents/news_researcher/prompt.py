@@ -25,6 +25,12 @@ Your task is guided by the inputs you receive. You must process them in the foll
 * 'PROMPT': If both of the above are empty, your objective is to conduct general research on the main subject of the prompt.
 * Use the 'append_to_state' tool to add your research to the field 'research'.
 
+Prefetched Research
+-------------------
+Lookups for the user's topic may already have been run for you while the previous stage was working:
+{speculative_research?}
+If this prefetched material answers one of your research questions, save the relevant facts with append_to_state instead of repeating the same tool call.
+
 Mandatory Workflow
 ------------------
 You must follow these steps in order:
@@ -0,0 +1,94 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Compares latency and token cost of the nested web_search agent and direct grounding.
+
+Needs live Gemini credentials (the same environment the agents use):
+
+    python tests/load_test/web_search_benchmark.py "query one" "query two"
+"""
+import asyncio
+import json
+import sys
+import time
+
+from google.adk.runners import InMemoryRunner
+from google.genai import types
+
+from llm_news_agents.shared_libraries.compaction import estimate_tokens
+from llm_news_agents.shared_libraries.web_search import GroundedSearch
+from llm_news_agents.sub_agents.news_researcher.agent import web_search_agent
+
+DEFAULT_QUERIES = [
+    "Who won the 2024 Nobel Prize in Physics?",
+    "What is the current population of Lagos?",
+    "When did the James Webb Space Telescope launch?",
+]
+
+
+async def run_agent_path(runner: InMemoryRunner, query: str) -> dict:
+    session = await runner.session_service.create_session(app_name=runner.app_name, user_id="bench")
+    message = types.Content(role="user", parts=[types.Part.from_text(text=query)])
+    prompt_tokens = output_tokens = 0
+    text = ""
+    start = time.perf_counter()
+    async for event in runner.run_async(user_id="bench", session_id=session.id, new_message=message):
+        if event.usage_metadata:
+            prompt_tokens += event.usage_metadata.prompt_token_count or 0
+            output_tokens += event.usage_metadata.candidates_token_count or 0
+        if event.content and event.content.parts:
+            text += "".join(part.text or "" for part in event.content.parts)
+    return {
+        "latency_s": time.perf_counter() - start,
+        "prompt_tokens": prompt_tokens,
+        "output_tokens": output_tokens,
+        "result_tokens": estimate_tokens(text),
+    }
+
+
+async def run_direct_path(search: GroundedSearch, query: str) -> dict:
+    before_prompt, before_output = search.prompt_tokens, search.output_tokens
+    start = time.perf_counter()
+    result = await search.search(query)
+    latency = time.perf_counter() - start
+    start = time.perf_counter()
+    await search.search(query)
+    return {
+        "latency_s": latency,
+        "cached_latency_s": time.perf_counter() - start,
+        "prompt_tokens": search.prompt_tokens - before_prompt,
+        "output_tokens": search.output_tokens - before_output,
+        "result_tokens": estimate_tokens(result),
+    }
+
+
+async def main(queries: list) -> None:
+    runner = InMemoryRunner(agent=web_search_agent, app_name="web_search_benchmark")
+    search = GroundedSearch()
+    rows = []
+    for query in queries:
+        rows.append({
+            "query": query,
+            "agent": await run_agent_path(runner, query),
+            "direct": await run_direct_path(search, query),
+        })
+    print(json.dumps(rows, indent=2))
+    for path in ("agent", "direct"):
+        latency = sum(row[path]["latency_s"] for row in rows) / len(rows)
+        tokens = sum(row[path]["prompt_tokens"] + row[path]["output_tokens"] for row in rows) / len(rows)
+        print(f"{path:>6}: mean latency {latency:.2f}s, mean model tokens {tokens:.0f}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main(sys.argv[1:] or DEFAULT_QUERIES))
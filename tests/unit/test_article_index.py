@@ -0,0 +1,76 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import time
+
+from llm_news_agents.shared_libraries.article_index import ArticleIndex
+from llm_news_agents.shared_libraries.news_engine import Article
+
+
+def _articles():
+    return [
+        Article("AP", "Central bank raises interest rates", "Inflation stays high", "https://ap.example/1", "2025-05-02"),
+        Article("BBC", "Football final ends in penalties", None, "https://bbc.example/2", "2025-05-03"),
+        Article("CNN", "Interest rates and the housing market", None, "https://cnn.example/3", "2025-05-04"),
+    ]
+
+
+def test_bm25_ranks_flushed_and_active_segments_and_survives_reload(tmp_path) -> None:
+    index = ArticleIndex(str(tmp_path), flush_every=2)
+    assert index.add(_articles()) == 3
+    assert index.add(_articles()[:1]) == 0
+    index.add([Article("FT", "Bank of England rates decision", None, "https://ft.example/4")])
+
+    hits = index.search("interest rates bank", k=5)
+    assert hits[0][2].source == "AP"
+    assert {hit[2].source for hit in hits} == {"AP", "CNN", "FT"}
+    assert index.search("rates", from_date="2025-05-04", k=5)[0][2].source == "CNN"
+    index.close()
+
+    reloaded = ArticleIndex(str(tmp_path))
+    assert len(reloaded) == 4
+    assert reloaded.search("penalties")[0][1:] == (1.0, _articles()[1])
+    assert reloaded.search("penalties", max_age_seconds=-1) == []
+    reloaded.close()
+
+
+def test_refetched_articles_stay_fresh() -> None:
+    index = ArticleIndex()
+    index.add(_articles(), fetched_at=time.time() - 3600)
+    assert index.search("penalties", max_age_seconds=900) == []
+    assert index.add(_articles()) == 0
+    assert index.search("penalties", max_age_seconds=900)[0][2] == _articles()[1]
+
+
+def test_memory_index_evicts_oldest_segments() -> None:
+    index = ArticleIndex(flush_every=2, max_docs=4)
+    for i in range(10):
+        index.add([Article("S", f"Story number {i} storm", None, f"https://s.example/{i}")])
+    assert len(index) <= 5
+    assert index.search("storm number 9")
+    assert index.add([Article("S", "Story number 0 storm", None, "https://s.example/0")]) == 1
+
+
+def test_disk_index_evicts_oldest_segment_files(tmp_path) -> None:
+    index = ArticleIndex(str(tmp_path), flush_every=2, max_docs=4)
+    for i in range(10):
+        index.add([Article("S", f"Story number {i} storm", None, f"https://s.example/{i}")])
+    index.add([Article("S", "Story number 10 storm", None, "https://s.example/10")])
+    index.close()
+    assert len(list(tmp_path.glob("segment_*.json"))) <= 3
+
+    reloaded = ArticleIndex(str(tmp_path), flush_every=2, max_docs=4)
+    assert len(reloaded) <= 5
+    assert reloaded.search("storm number 10")[0][2].url == "https://s.example/10"
+    reloaded.close()
@@ -0,0 +1,73 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from llm_news_agents.shared_libraries.cache import TTLCache, normalise_query
+
+
+class _FakeClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_entries_expire_after_ttl() -> None:
+    clock = _FakeClock()
+    cache = TTLCache(ttl_seconds=10, max_entries=10, max_bytes=10_000, clock=clock)
+    cache.set("k", [1, 2, 3])
+    assert cache.get("k") == [1, 2, 3]
+
+    clock.now = 11
+    assert cache.get("k") is None
+    assert cache.stats()["hits"] == 1
+    assert cache.stats()["misses"] == 1
+    assert cache.stats()["expirations"] == 1
+
+
+def test_least_recently_used_entry_is_evicted() -> None:
+    cache = TTLCache(ttl_seconds=60, max_entries=2, max_bytes=10_000)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.get("a")
+    cache.set("c", 3)
+
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+    assert cache.get("c") == 3
+    assert cache.stats()["evictions"] == 1
+
+
+def test_byte_limit_is_enforced() -> None:
+    cache = TTLCache(ttl_seconds=60, max_entries=100, max_bytes=30)
+    cache.set("a", "x" * 14)
+    cache.set("b", "y" * 14)
+    assert cache.stats()["bytes"] <= 30
+    assert cache.get("a") is None
+
+    cache.set("huge", "z" * 100)
+    assert cache.get("huge") is None
+
+
+def test_pop_removes_the_entry_and_its_bytes() -> None:
+    cache = TTLCache(ttl_seconds=60, max_entries=10, max_bytes=10_000)
+    cache.set("a", "x" * 14)
+    assert cache.pop("a") == "x" * 14
+    assert cache.pop("a", "gone") == "gone"
+    assert cache.stats()["entries"] == 0
+    assert cache.stats()["bytes"] == 0
+
+
+def test_normalise_query() -> None:
+    assert normalise_query("  Climate   Summit\tCOP30 ") == "climate summit cop30"
@@ -0,0 +1,70 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+from types import SimpleNamespace
+
+from google.adk.models import LlmResponse
+from google.genai import types
+
+from llm_news_agents.shared_libraries.citations import (
+    CITATION_TURN_KEY,
+    CitationRegistry,
+    collect_citations,
+    render_citations,
+)
+
+
+def _chunk(text, uris, partial):
+    return LlmResponse(
+        content=types.Content(role="model", parts=[types.Part(text=text)]),
+        grounding_metadata=types.GroundingMetadata(
+            grounding_chunks=[
+                types.GroundingChunk(web=types.GroundingChunkWeb(uri=uri, title=uri.split("/")[-1]))
+                for uri in uris
+            ]
+        ),
+        partial=partial,
+    )
+
+
+def test_ids_are_stable_and_deduplicated_by_normalised_uri() -> None:
+    state = {CITATION_TURN_KEY: "turn-1"}
+    registry = CitationRegistry(state)
+    assert registry.register_all(
+        [("https://www.a.example/story/", "A"), ("https://b.example/x", "B"), ("http://a.example/story?utm_source=x", "A again")]
+    ) == [1, 2, 1]
+    assert registry.register("", "") is None
+
+    state[CITATION_TURN_KEY] = "turn-2"
+    assert CitationRegistry(state).register("https://b.example/x", "B") == 2
+    block = CitationRegistry(state).render()
+    assert block == "\n\nReferences:\n\n[2] [B](https://b.example/x)\n"
+    assert "[1]" in CitationRegistry(state).render(current_turn_only=False)
+
+
+def test_every_stage_feeds_one_references_list_at_the_end() -> None:
+    state = {CITATION_TURN_KEY: "turn-1"}
+    journalist = SimpleNamespace(invocation_id="inv", agent_name="journalist", state=state)
+    editor = SimpleNamespace(invocation_id="inv", agent_name="editor", state=state)
+
+    partial = collect_citations(journalist, _chunk("Draft ", ["https://a.example/x"], True))
+    assert "citations" not in state
+    final = collect_citations(journalist, _chunk("Draft report", ["https://a.example/x"], False))
+    assert [p.text for p in partial.content.parts + final.content.parts] == ["Draft ", "Draft report"]
+
+    render_citations(editor, _chunk("Edited ", ["https://b.example/y"], True))
+    edited = render_citations(editor, _chunk("Edited report", ["https://a.example/x/"], False))
+    block = edited.content.parts[-1].text
+    assert block.startswith("\n\nReferences:\n\n")
+    assert block.count("a.example") == 1
+    assert block.index("[1]") < block.index("[2]")
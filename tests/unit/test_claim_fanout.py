@@ -0,0 +1,79 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import asyncio
+
+import pytest
+
+from llm_news_agents.shared_libraries.claim_fanout import (
+    ClaimFinding,
+    extract_claims,
+    rating_to_verdict,
+    render_findings,
+    verify_claims,
+)
+
+_REPORT = """## Bridge Collapse Shakes City
+
+### The Lead
+The Harbor Bridge collapsed on 3 May 2025 after a cargo ship struck a pier. Officials were shocked.
+Was anyone warned in advance?
+
+### Verification Notes
+* Claims that the bridge was closed for repairs in April are **false** according to the city.
+
+Reference:
+
+* [City statement](https://city.example/statement)
+"""
+
+
+def test_extract_claims_keeps_checkable_sentences_in_order() -> None:
+    assert extract_claims(_REPORT) == [
+        "The Harbor Bridge collapsed on 3 May 2025 after a cargo ship struck a pier.",
+        "Claims that the bridge was closed for repairs in April are false according to the city.",
+    ]
+    assert extract_claims(_REPORT, max_claims=1) == [
+        "The Harbor Bridge collapsed on 3 May 2025 after a cargo ship struck a pier."
+    ]
+
+
+def test_rating_to_verdict() -> None:
+    assert rating_to_verdict("Mostly False") == "Inaccurate"
+    assert rating_to_verdict("Half True") == "Disputed"
+    assert rating_to_verdict("Correct") == "Accurate"
+    assert rating_to_verdict("no fact-check found") is None
+    for negated in ("Not true", "Untrue", "Not accurate", "Not correct", "It's not true"):
+        assert rating_to_verdict(negated) == "Inaccurate", negated
+    assert rating_to_verdict("Misleading") == "Disputed"
+    assert rating_to_verdict("No evidence") == "Unsupported"
+    assert rating_to_verdict("Not false") is None
+    assert rating_to_verdict("Not entirely true") is None
+
+
+@pytest.mark.asyncio
+async def test_verify_claims_returns_partial_results_on_timeout_and_errors() -> None:
+    async def verify(claim):
+        if claim == "slow":
+            await asyncio.sleep(10)
+        if claim == "broken":
+            raise RuntimeError("boom")
+        return ClaimFinding(claim, "Accurate", "Confirmed.", ["https://example.com"])
+
+    findings = await verify_claims(["fine", "slow", "broken"], verify, concurrency=2, timeout=0.05)
+
+    assert [finding.verdict for finding in findings] == ["Accurate", "Unsupported", "Unsupported"]
+    table = render_findings(findings)
+    assert "  * Claim 1: fine\n      * Verdict: Accurate" in table
+    assert table.endswith("  * Overall verdict: Unsupported")
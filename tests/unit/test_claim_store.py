@@ -0,0 +1,95 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from datetime import date, timedelta
+
+from llm_news_agents.shared_libraries import claim_store
+from llm_news_agents.shared_libraries.claim_store import ClaimStore
+from llm_news_agents.shared_libraries.fuzzy import similarity
+
+
+def _claim(text, reviewed=None):
+    reviewed = reviewed or date.today().isoformat()
+    return {
+        "text": text,
+        "claimDate": None,
+        "claimant": "someone",
+        "claimReviews": [{"textualRating": "False", "reviewDate": f"{reviewed}T00:00:00Z"}],
+    }
+
+
+def test_repeated_and_paraphrased_claims_are_answered_locally(tmp_path) -> None:
+    path = str(tmp_path / "claims.db")
+    store = ClaimStore(path)
+    store.store("Vaccines cause autism", "en-US", [_claim("Vaccines cause autism in children")])
+    store.store("moon landing was faked", "en-US", [])
+
+    assert store.lookup("vaccine causes autism", "en-US")[0]["text"] == "Vaccines cause autism in children"
+    assert store.lookup("Was the moon landing faked", "en-US") == []
+    assert store.lookup("Vaccines cause autism in children!", "en-US")[0]["claimant"] == "someone"
+    assert store.lookup("vaccines cause autism", "de-DE") is None
+    assert store.lookup("interest rates hit record high", "en-US") is None
+    store.close()
+
+    reloaded = ClaimStore(path, ttl=-1)
+    assert reloaded.stats()["claims"] == 1
+    assert reloaded.lookup("Vaccines cause autism", "en-US") is None
+    reloaded.close()
+
+
+def test_negated_or_renumbered_claims_do_not_match() -> None:
+    assert similarity("3.5 percent unemployment", "5.3 percent unemployment") == 0.0
+    store = ClaimStore()
+    store.store("vaccines cause autism", "en-US", [_claim("Vaccines cause autism")])
+    store.store("unemployment at 3.5 percent", "en-US", [_claim("Unemployment is at 3.5 percent")])
+
+    assert store.lookup("vaccines do not cause autism", "en-US") is None
+    assert store.lookup("vaccines don't cause autism", "en-US") is None
+    assert store.lookup("unemployment at 5.3 percent", "en-US") is None
+    assert store.lookup("unemployment is at 3.5 percent", "en-US") is not None
+    store.close()
+
+
+def test_age_limit_is_part_of_the_lookup() -> None:
+    store = ClaimStore()
+    old = (date.today() - timedelta(days=200)).isoformat()
+    store.store("moon landing faked", "en-US", [_claim("The moon landing was faked", old)], max_age_days=365)
+
+    assert store.lookup("moon landing faked", "en-US", max_age_days=365)[0]["text"] == "The moon landing was faked"
+    assert store.lookup("moon landing faked", "en-US", max_age_days=30) is None
+    store.close()
+
+
+def test_claims_with_swapped_subject_and_object_do_not_match() -> None:
+    store = ClaimStore()
+    store.store("Russia invaded Ukraine in 2022", "en-US", [_claim("Russia invaded Ukraine in 2022")])
+
+    assert store.lookup("Ukraine invaded Russia in 2022", "en-US") is None
+    assert store.lookup("Russia invaded Ukraine in 2022", "en-US") is not None
+    store.close()
+
+
+def test_stale_claims_and_queries_are_deleted_on_store(monkeypatch) -> None:
+    clock = [1000.0]
+    monkeypatch.setattr(claim_store.time, "time", lambda: clock[0])
+    store = ClaimStore(ttl=60)
+    store.store("vaccines cause autism", "en-US", [_claim("Vaccines cause autism")])
+    clock[0] += 120
+    store.store("moon landing faked", "en-US", [_claim("The moon landing was faked")])
+
+    assert store.stats()["claims"] == 1
+    assert store.stats()["queries"] == 1
+    assert len(store._indexes[("claims", "en-US")]) == 1
+    assert len(store._indexes[("queries", "en-US", 30)]) == 1
+    store.close()
@@ -0,0 +1,69 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from types import SimpleNamespace
+
+from llm_news_agents.shared_libraries.compaction import (
+    compact,
+    compact_tool_result,
+    compaction_stats,
+    estimate_tokens,
+)
+
+
+def _articles(n):
+    return [
+        {
+            "source": f"Outlet {i}",
+            "title": f"Headline number {i}",
+            "description": "A long description sentence. " * 40,
+            "url": f"https://example.com/{i}",
+            "provider": "newsapi",
+            "other_sources": [],
+        }
+        for i in range(n)
+    ]
+
+
+def test_compact_prunes_tabulates_and_truncates_within_budget() -> None:
+    articles = _articles(5)
+    result = compact(articles, budget=400, drop_fields=("provider",))
+
+    assert result["columns"] == ["source", "title", "description", "url"]
+    assert len(result["rows"]) == 5
+    assert estimate_tokens(result) <= 400 < estimate_tokens(articles)
+
+
+def test_compact_drops_trailing_records_as_last_resort() -> None:
+    result = compact(_articles(20), budget=150)
+    assert 1 <= len(result["rows"]) < 20
+    assert result["rows"][0][0] == "Outlet 0"
+
+
+def test_callback_wraps_text_and_reports_tokens() -> None:
+    response = compact_tool_result(SimpleNamespace(name="wikipedia"), {}, None, "Word. " * 4000)
+    assert estimate_tokens(response["result"]) <= 1500
+    stats = compaction_stats()["wikipedia"]
+    assert stats["tokens_before"] > stats["tokens_after"]
+
+
+def test_urls_survive_compaction_intact() -> None:
+    articles = [
+        {**article, "url": f"https://www.reuters.com/world/africa/lagos-port-strike-enters-day-{i}-2025-06-0{i % 9 + 1}/"}
+        for i, article in enumerate(_articles(25))
+    ]
+    result = compact(articles, budget=1500)
+    url_column = result["columns"].index("url")
+    assert result["rows"]
+    assert all(row[url_column] == articles[i]["url"] for i, row in enumerate(result["rows"]))
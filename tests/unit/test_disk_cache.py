@@ -0,0 +1,79 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import asyncio
+
+import httpx
+import pytest
+
+from llm_news_agents.shared_libraries import http_client
+from llm_news_agents.shared_libraries.disk_cache import (
+    DiskHttpCache,
+    freshness_lifetime,
+    make_key,
+)
+
+
+def test_make_key_drops_credentials_and_sorts_params() -> None:
+    key = make_key("https://newsapi.org/v2/everything", {"q": "x", "apiKey": "s3cret", "page": 1})
+    assert key == "https://newsapi.org/v2/everything?page=1&q=x"
+
+
+def test_freshness_lifetime_honours_cache_control() -> None:
+    assert freshness_lifetime({"cache-control": "public, max-age=60"}, 300) == 60
+    assert freshness_lifetime({"cache-control": "no-cache"}, 300) == 0
+    assert freshness_lifetime({"cache-control": "no-store"}, 300) is None
+    assert freshness_lifetime({}, 300) == 300
+
+
+def test_compaction_keeps_revalidatable_entries(tmp_path) -> None:
+    cache = DiskHttpCache(str(tmp_path / "http.sqlite"))
+    cache.store("dead", 200, {"cache-control": "max-age=0"}, b"a")
+    cache.store("stale", 200, {"cache-control": "max-age=0", "etag": '"v1"'}, b"b")
+    cache.store("fresh", 200, {"cache-control": "max-age=60"}, b"c")
+
+    assert cache.compact() == 1
+    assert cache.lookup("dead") is None
+    assert cache.lookup("stale").etag == '"v1"'
+    assert cache.lookup("fresh").is_fresh()
+    cache.close()
+
+
+@pytest.mark.asyncio
+async def test_get_revalidates_stale_entries(tmp_path, monkeypatch) -> None:
+    monkeypatch.setenv("TOOLS_HTTP_CACHE_PATH", str(tmp_path / "http.sqlite"))
+    seen_headers = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        seen_headers.append(request.headers.get("if-none-match"))
+        if request.headers.get("if-none-match") == '"v1"':
+            return httpx.Response(304, headers={"cache-control": "max-age=60"})
+        return httpx.Response(
+            200, headers={"cache-control": "no-cache", "etag": '"v1"'}, json={"ok": True}
+        )
+
+    http_client._clients[asyncio.get_running_loop()] = httpx.AsyncClient(
+        transport=httpx.MockTransport(handler)
+    )
+    try:
+        first = await http_client.get("https://example.org/api", params={"q": "a"})
+        second = await http_client.get("https://example.org/api", params={"q": "a"})
+        third = await http_client.get("https://example.org/api", params={"q": "a"})
+    finally:
+        await http_client.aclose_http_client()
+
+    assert first.json() == second.json() == third.json() == {"ok": True}
+    assert second.status_code == 200
+    # The third call is served from disk after the 304 refreshed the entry.
+    assert seen_headers == [None, '"v1"']
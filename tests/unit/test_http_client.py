@@ -0,0 +1,57 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import logging
+
+from types import SimpleNamespace
+
+import pytest
+
+from llm_news_agents.shared_libraries import http_client, lifecycle
+from llm_news_agents.shared_libraries.lifecycle import ToolsLifecyclePlugin, register_stats, tool_stats
+
+
+@pytest.mark.asyncio
+async def test_client_is_shared_within_a_loop() -> None:
+    """The pooled client is reused until it is explicitly closed."""
+    client = http_client.get_http_client()
+    assert http_client.get_http_client() is client
+
+    await http_client.aclose_http_client()
+    assert client.is_closed
+    assert http_client.get_http_client() is not client
+    await http_client.aclose_http_client()
+
+
+@pytest.mark.asyncio
+async def test_lifecycle_plugin_closes_the_client_on_shutdown() -> None:
+    client = http_client.get_http_client()
+    await ToolsLifecyclePlugin().close()
+    assert client.is_closed
+
+
+@pytest.mark.asyncio
+async def test_lifecycle_plugin_logs_registered_stats(caplog, monkeypatch) -> None:
+    monkeypatch.setattr(lifecycle, "_stats_sources", {})
+    register_stats("test_source", lambda: {"hits": 3})
+    register_stats("test_broken", lambda: 1 / 0)
+    stats = tool_stats()
+    assert stats["test_source"] == {"hits": 3}
+    assert stats["test_broken"].startswith("unavailable")
+
+    with caplog.at_level(logging.INFO, logger="llm_news_agents.shared_libraries.lifecycle"):
+        await ToolsLifecyclePlugin().after_run_callback(
+            invocation_context=SimpleNamespace(invocation_id="inv-1")
+        )
+    assert '"test_source": {"hits": 3}' in caplog.text
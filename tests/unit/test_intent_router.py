@@ -0,0 +1,68 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from types import SimpleNamespace
+
+import pytest
+from google.genai import types
+
+from llm_news_agents.shared_libraries.intent_router import classify_intent, route_intent
+
+
+@pytest.mark.parametrize(
+    "text, intent",
+    [
+        ("Hi!", "greeting"),
+        ("Hello there, good morning", "greeting"),
+        ("thank you!", "thanks"),
+        ("Hey, what can you do?", "chitchat"),
+        ("What do you mean?", "clarification"),
+        ("Tell me more", "follow_up"),
+        ("go on...", "follow_up"),
+        ("Hi, what happened at the Lagos port strike?", "topic"),
+        ("Is it true that the Eiffel Tower is being sold?", "topic"),
+    ],
+)
+def test_classify_intent(text, intent) -> None:
+    assert classify_intent(text) == intent
+
+
+@pytest.mark.asyncio
+async def test_route_intent_short_circuits_only_small_talk() -> None:
+    def context(text):
+        return SimpleNamespace(
+            user_content=types.Content(role="user", parts=[types.Part(text=text)]), state={}
+        )
+
+    reply = await route_intent(context("Hi!"))
+    assert "investigate" in reply.parts[0].text
+    assert await route_intent(context("Moon landing hoax claims")) is None
+
+
+@pytest.mark.asyncio
+async def test_follow_ups_empty_and_attachment_messages_continue_an_investigation() -> None:
+    def context(parts, state):
+        return SimpleNamespace(user_content=types.Content(role="user", parts=parts), state=state)
+
+    with_report = {"investigative_report": "The port strike entered its third day."}
+    assert await route_intent(context([types.Part(text="tell me more")], with_report)) is None
+    assert await route_intent(context([types.Part(text="Go on")], with_report)) is None
+    assert await route_intent(context([types.Part(text="  ")], with_report)) is None
+
+    reply = await route_intent(context([types.Part(text="tell me more")], {}))
+    assert "which news topic" in reply.parts[0].text
+    assert await route_intent(context([], {})) is not None
+
+    image = types.Part(inline_data=types.Blob(mime_type="image/png", data=b"png"))
+    assert await route_intent(context([image], {})) is None
@@ -0,0 +1,32 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from llm_news_agents.shared_libraries.near_dup import collapse_near_duplicates
+from llm_news_agents.shared_libraries.news_engine import Article
+
+
+def test_syndicated_copies_collapse_into_one_entry() -> None:
+    articles = [
+        Article("AP", "Storm hits coast as thousands evacuate", None, "https://ap.example/1"),
+        Article("Local", "Storm hits coast, thousands evacuate (AP)", None, "https://local.example/2"),
+        Article("Daily", "Election results show tight race in key states", None, "https://daily.example/3"),
+    ]
+
+    collapsed, saved_tokens = collapse_near_duplicates(articles)
+
+    assert [a.source for a in collapsed] == ["AP", "Daily"]
+    assert collapsed[0].other_sources == ["Local"]
+    assert saved_tokens == articles[1].estimated_tokens()
+    # The caller's (possibly cached) articles are left untouched.
+    assert articles[0].other_sources == []
@@ -0,0 +1,136 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import asyncio
+import logging
+
+import pytest
+
+from llm_news_agents.shared_libraries.news_engine import (
+    LocalNewsProvider,
+    NewsApiProvider,
+    NewsEngine,
+    NewsProvider,
+    canonical_url,
+    resolve_window,
+)
+
+_ARTICLES = [
+    {
+        "source": "Wire",
+        "title": "Storm hits coast",
+        "description": "A storm made landfall.",
+        "url": "https://www.example.com/storm/?utm_source=x",
+        "published_at": "2025-06-02T10:00:00Z",
+    },
+    {
+        "source": "Daily",
+        "title": "Election results",
+        "description": None,
+        "url": "https://daily.example.org/election",
+        "published_at": "2025-06-03T10:00:00Z",
+    },
+]
+
+
+class _SlowProvider(NewsProvider):
+    name = "slow"
+
+    async def search(self, query, from_date, to_date, page=1, page_size=5):
+        await asyncio.sleep(1)
+        return []
+
+
+class _FailingProvider(NewsProvider):
+    name = "failing"
+
+    async def search(self, query, from_date, to_date, page=1, page_size=5):
+        raise RuntimeError("boom")
+
+
+def test_canonical_url_ignores_tracking_and_www() -> None:
+    assert canonical_url("https://www.example.com/storm/?utm_source=x") == canonical_url(
+        "http://example.com/storm"
+    )
+
+
+def test_resolve_window_defaults_to_seven_days() -> None:
+    assert resolve_window(None, "2025-06-10") == ("2025-06-03", "2025-06-10")
+    with pytest.raises(ValueError):
+        resolve_window("10/06/2025", None)
+
+
+@pytest.mark.asyncio
+async def test_engine_merges_dedupes_and_respects_budget() -> None:
+    syndicated = dict(_ARTICLES[0], source="Syndicate", url="http://example.com/storm")
+    engine = NewsEngine(
+        [
+            LocalNewsProvider(_ARTICLES),
+            LocalNewsProvider([syndicated]),
+            _SlowProvider(),
+            _FailingProvider(),
+        ],
+        latency_budget=0.05,
+    )
+
+    articles = await engine.search("storm", "2025-06-01", "2025-06-05")
+
+    assert [a.source for a in articles] == ["Wire"]
+    assert articles[0].provider == "local"
+
+
+@pytest.mark.asyncio
+async def test_stream_follows_pages_until_the_cap() -> None:
+    articles = [
+        {"source": "S", "title": f"Storm update {i}", "description": "d", "url": f"https://e.com/{i}"}
+        for i in range(12)
+    ]
+    engine = NewsEngine([LocalNewsProvider(articles)], latency_budget=1)
+
+    everything = await engine.collect("storm", "2025-06-01", "2025-06-05", max_articles=50)
+    assert len(everything) == 12
+
+    capped = await engine.collect("storm", "2025-06-01", "2025-06-05", max_articles=7)
+    assert len(capped) == 7
+
+    token_capped = await engine.collect(
+        "storm", "2025-06-01", "2025-06-05", max_tokens=everything[0].estimated_tokens() * 3
+    )
+    assert len(token_capped) == 3
+
+
+def test_newsapi_clamp_only_logs_when_the_window_changes(caplog) -> None:
+    provider = NewsApiProvider("key")
+    recent = provider.oldest_date()
+    with caplog.at_level(logging.INFO, logger="llm_news_agents.shared_libraries.news_engine"):
+        assert provider.clamp(recent) == recent
+        assert not caplog.records
+        assert provider.clamp("2000-01-01") == recent
+    assert len(caplog.records) == 1
+    with pytest.raises(TypeError):
+        NewsProvider()
+
+
+class _CancelledProvider(NewsProvider):
+    name = "cancelled"
+
+    async def search(self, query, from_date, to_date, page=1, page_size=5):
+        raise asyncio.CancelledError()
+
+
+@pytest.mark.asyncio
+async def test_cancelled_provider_is_skipped_like_a_failure() -> None:
+    engine = NewsEngine([_CancelledProvider(), LocalNewsProvider(_ARTICLES)], latency_budget=1)
+    assert len(await engine.search("storm", "2025-06-01", "2025-06-05")) == 1
+    assert len(await engine.collect("storm", "2025-06-01", "2025-06-05")) == 1
@@ -0,0 +1,90 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import asyncio
+
+import httpx
+import pytest
+
+from llm_news_agents.shared_libraries.rate_limit import (
+    Priority,
+    ProviderScheduler,
+    QuotaExceededError,
+    RateLimitError,
+    RateLimitTimeoutError,
+    retry_after_seconds,
+    send_with_backoff,
+)
+
+
+@pytest.mark.asyncio
+async def test_queued_callers_are_served_by_priority() -> None:
+    scheduler = ProviderScheduler("test", rate=100.0, burst=1)
+    await scheduler.acquire()
+    order = []
+
+    async def call(label: str, priority: Priority) -> None:
+        await scheduler.acquire(priority)
+        order.append(label)
+
+    await asyncio.gather(
+        call("low", Priority.LOW), call("normal", Priority.NORMAL), call("high", Priority.HIGH)
+    )
+    assert order == ["high", "normal", "low"]
+
+
+@pytest.mark.asyncio
+async def test_daily_quota_and_max_wait() -> None:
+    scheduler = ProviderScheduler("test", rate=0.001, burst=1, daily_quota=1, max_wait=0.01)
+    await scheduler.acquire()
+    with pytest.raises(QuotaExceededError):
+        await scheduler.acquire()
+
+    scheduler = ProviderScheduler("test", rate=0.001, burst=1, max_wait=0.01)
+    await scheduler.acquire()
+    with pytest.raises(RateLimitTimeoutError):
+        await scheduler.acquire()
+
+
+@pytest.mark.asyncio
+async def test_retry_after_is_honoured_and_pauses_the_bucket() -> None:
+    scheduler = ProviderScheduler("test", rate=1000.0, burst=10)
+    responses = [
+        httpx.Response(429, headers={"Retry-After": "0.01"}),
+        httpx.Response(200, json={"ok": True}),
+    ]
+
+    async def send() -> httpx.Response:
+        return responses.pop(0)
+
+    response = await send_with_backoff(scheduler, send)
+    assert response.status_code == 200
+    assert scheduler.granted == 2
+
+
+@pytest.mark.asyncio
+async def test_retry_after_beyond_max_wait_fails_fast() -> None:
+    scheduler = ProviderScheduler("test", rate=1000.0, burst=10, max_wait=1.0)
+
+    async def send() -> httpx.Response:
+        return httpx.Response(429, headers={"Retry-After": "3600"})
+
+    with pytest.raises(RateLimitError):
+        await asyncio.wait_for(send_with_backoff(scheduler, send), timeout=1.0)
+    assert not scheduler.try_acquire()
+
+
+def test_retry_after_parsing() -> None:
+    assert retry_after_seconds(httpx.Response(429, headers={"Retry-After": "7"})) == 7
+    assert retry_after_seconds(httpx.Response(429)) is None
@@ -0,0 +1,115 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+import time
+
+from types import SimpleNamespace
+
+import pytest
+from google.adk.models import LlmResponse
+from google.genai import types
+
+from llm_news_agents.shared_libraries import report_cache
+from llm_news_agents.shared_libraries.report_cache import (
+    ReportCache,
+    report_ttl,
+    serve_cached_report,
+    store_final_report,
+    topic_key,
+    wants_fresh,
+)
+
+
+def test_topic_key_keeps_word_order_and_ignores_bypass_wording() -> None:
+    assert topic_key("Israel strikes Iran") != topic_key("Iran strikes Israel")
+    assert topic_key("Fresh investigation: Fed rate decision") == topic_key("Fed rate decision")
+    assert wants_fresh("Please run a fresh investigation of the Fed rate decision")
+    assert not wants_fresh("Fed rate decision")
+
+
+def test_ttl_follows_news_recency() -> None:
+    now = time.mktime((2026, 6, 1, 0, 0, 0, 0, 0, -1))
+    assert report_ttl("Breaking: port strike in Lagos", now=now) == 900.0
+    assert report_ttl("The 2019 election results", now=now) == 7 * 24 * 3600.0
+    assert report_ttl("Lagos port strike", now=now) == 6 * 3600.0
+
+
+def test_paraphrases_hit_and_expired_reports_miss() -> None:
+    cache = ReportCache(min_similarity=0.8)
+    cache.store("Lagos port strikes", "Report A", ttl=60)
+    assert cache.lookup("lagos port strike") == "Report A"
+    assert cache.lookup("Eiffel Tower sale") is None
+
+    cache.store("Eiffel Tower sale", "Report B", ttl=-1)
+    assert cache.lookup("Eiffel Tower sale") is None
+    assert cache.stats() == {"hits": 1, "misses": 2, "reports": 1}
+    cache.close()
+
+
+def test_rewordings_hit_but_other_years_miss() -> None:
+    cache = ReportCache()
+    cache.store("Fed rate decision", "Fed report", ttl=60)
+    cache.store("2020 election results", "2020 report", ttl=60)
+    assert cache.lookup("the Fed's rate decision") == "Fed report"
+    assert cache.lookup("2024 election results") is None
+    assert cache.lookup("the 2020 election results") == "2020 report"
+
+    cache.store("Israel strikes Iran", "Israel report", ttl=60)
+    assert cache.lookup("Iran strikes Israel") is None
+    assert cache.lookup("Israel strikes Iran!") == "Israel report"
+    cache.close()
+
+
+@pytest.mark.asyncio
+async def test_final_report_is_served_until_a_fresh_one_is_requested(monkeypatch) -> None:
+    monkeypatch.setattr(report_cache, "_report_cache", ReportCache())
+
+    def context(text, state):
+        return SimpleNamespace(user_content=types.Content(role="user", parts=[types.Part(text=text)]), state=state)
+
+    state = {}
+    assert await serve_cached_report(context("Lagos port strike", state)) is None
+    final = LlmResponse(content=types.Content(role="model", parts=[types.Part(text="The report.")]))
+    await store_final_report(context("Lagos port strike", state), final)
+
+    reply = await serve_cached_report(context("lagos port strike?", {}))
+    assert reply.parts[0].text == "The report."
+    assert await serve_cached_report(context("Fresh investigation of the Lagos port strike", {})) is None
+
+    state = {}
+    await store_final_report(context("tell me more", {report_cache.TOPIC_KEY: "tell me more"}), final)
+    assert await serve_cached_report(context("tell me more", state)) is None
+    assert state[report_cache.TOPIC_KEY] == ""
+
+
+@pytest.mark.asyncio
+async def test_attachments_and_sessions_with_a_report_bypass_the_cache(monkeypatch) -> None:
+    monkeypatch.setattr(report_cache, "_report_cache", ReportCache())
+    text = "Fact-check this article for me"
+    final = LlmResponse(content=types.Content(role="model", parts=[types.Part(text="Report on A.")]))
+
+    def context(state, data=None):
+        parts = [types.Part(text=text)]
+        if data is not None:
+            parts.append(types.Part.from_bytes(data=data, mime_type="application/pdf"))
+        return SimpleNamespace(user_content=types.Content(role="user", parts=parts), state=state)
+
+    state = {}
+    assert await serve_cached_report(context(state, b"%PDF A")) is None
+    await store_final_report(context(state), final)
+    assert await serve_cached_report(context({}, b"%PDF B")) is None
+
+    state = {"investigative_report": "An earlier report."}
+    assert await serve_cached_report(context(state)) is None
+    await store_final_report(context(state), final)
+    assert report_cache.get_report_cache().stats()["reports"] == 0
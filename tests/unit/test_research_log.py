@@ -0,0 +1,36 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from llm_news_agents.shared_libraries.research_log import ResearchLog
+
+
+def test_log_dedupes_bounds_and_compresses_older_entries() -> None:
+    state = {}
+    log = ResearchLog(state, "research", max_entries=3, keep_uncompressed=1)
+    finding = "The bridge opened in 1932. " * 20
+
+    assert log.append(finding)
+    assert not log.append(finding.upper())
+    for i in range(4):
+        assert log.append(f"Finding {i}")
+
+    assert log.entries() == ["Finding 1", "Finding 2", "Finding 3"]
+    assert state["research.0"] is None and state["research.1"] is None
+    assert isinstance(state["research.2"], str)  # Too short to benefit from compression.
+
+    log = ResearchLog(state, "notes", keep_uncompressed=1)
+    log.append(finding)
+    log.append("Short")
+    assert state["notes.0"].keys() == {"z"}
+    assert log.entries() == [finding, "Short"]
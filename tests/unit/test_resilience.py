@@ -0,0 +1,70 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import asyncio
+
+import pytest
+
+from llm_news_agents.shared_libraries.resilience import CircuitBreaker, Hedger
+
+
+class _FakeClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_breaker_opens_on_error_rate_and_recovers_half_open() -> None:
+    clock = _FakeClock()
+    breaker = CircuitBreaker("test", failure_ratio=0.5, window=4, min_calls=4, reset_timeout=10, clock=clock)
+    for success in (True, False, True, False):
+        breaker.record(success)
+    assert breaker.state == "open"
+    assert not breaker.allow()
+
+    clock.now = 10
+    assert breaker.state == "half_open"
+    assert breaker.allow()
+    breaker.record(True)
+    assert breaker.state == "closed"
+    assert breaker.stats()["rejected"] == 1
+
+
+@pytest.mark.asyncio
+async def test_hedge_wins_when_primary_stalls() -> None:
+    hedger = Hedger("test", delay=0.01)
+    delays = [1.0, 0.0]
+
+    async def send() -> str:
+        delay = delays.pop(0)
+        await asyncio.sleep(delay)
+        return f"slept {delay}"
+
+    assert await hedger.run(send) == "slept 0.0"
+    assert hedger.stats()["hedge_wins"] == 1
+    assert hedger.stats()["hedge_win_rate"] == 1.0
+
+
+@pytest.mark.asyncio
+async def test_no_hedge_when_vetoed() -> None:
+    hedger = Hedger("test", delay=0.001)
+
+    async def send() -> str:
+        await asyncio.sleep(0.01)
+        return "primary"
+
+    assert await hedger.run(send, may_hedge=lambda: False) == "primary"
+    assert hedger.stats()["hedged"] == 0
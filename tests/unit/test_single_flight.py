@@ -0,0 +1,95 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import asyncio
+
+import pytest
+
+from llm_news_agents.shared_libraries.single_flight import SingleFlight
+
+
+@pytest.mark.asyncio
+async def test_concurrent_identical_calls_share_one_execution() -> None:
+    flights = SingleFlight("test")
+    executions = 0
+
+    async def work() -> list:
+        nonlocal executions
+        executions += 1
+        await asyncio.sleep(0.01)
+        return ["article"]
+
+    results = await asyncio.gather(*(flights.do("q", work) for _ in range(5)))
+
+    assert executions == 1
+    assert all(result == ["article"] for result in results)
+    assert flights.stats() == {"calls": 5, "executions": 1, "collapsed": 4, "in_flight": 0}
+
+
+@pytest.mark.asyncio
+async def test_errors_reach_every_waiter_and_are_not_remembered() -> None:
+    flights = SingleFlight("test")
+
+    async def failing() -> None:
+        await asyncio.sleep(0.01)
+        raise RuntimeError("upstream down")
+
+    results = await asyncio.gather(
+        flights.do("q", failing), flights.do("q", failing), return_exceptions=True
+    )
+    assert all(isinstance(result, RuntimeError) for result in results)
+
+    async def working() -> str:
+        return "ok"
+
+    assert await flights.do("q", working) == "ok"
+
+
+@pytest.mark.asyncio
+async def test_cancelled_leader_does_not_cancel_other_waiters() -> None:
+    flights = SingleFlight("test")
+    started = asyncio.Event()
+
+    async def work() -> str:
+        started.set()
+        await asyncio.sleep(0.05)
+        return "ok"
+
+    leader = asyncio.create_task(flights.do("q", work))
+    await started.wait()
+    follower = asyncio.create_task(flights.do("q", work))
+    await asyncio.sleep(0)
+    leader.cancel()
+
+    assert await follower == "ok"
+    assert leader.cancelled()
+    assert flights.stats()["in_flight"] == 0
+
+
+@pytest.mark.asyncio
+async def test_work_is_cancelled_once_no_caller_waits() -> None:
+    flights = SingleFlight("test")
+    cancelled = asyncio.Event()
+
+    async def work() -> None:
+        try:
+            await asyncio.sleep(10)
+        except asyncio.CancelledError:
+            cancelled.set()
+            raise
+
+    caller = asyncio.create_task(flights.do("q", work))
+    await asyncio.sleep(0.01)
+    caller.cancel()
+    await asyncio.wait_for(cancelled.wait(), 1)
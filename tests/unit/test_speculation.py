@@ -0,0 +1,41 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import asyncio
+
+import pytest
+
+from llm_news_agents.shared_libraries.speculation import SpeculativePrefetcher
+
+
+@pytest.mark.asyncio
+async def test_collect_returns_finished_jobs_and_discards_late_ones() -> None:
+    prefetcher = SpeculativePrefetcher("test")
+
+    async def fast():
+        return "fast result"
+
+    async def slow():
+        await asyncio.sleep(10)
+        return "too late"
+
+    async def failing():
+        raise RuntimeError("boom")
+
+    prefetcher.start("invocation", {"fast": fast, "slow": slow, "failing": failing})
+    results = await prefetcher.collect("invocation", grace=0.05)
+
+    assert results == {"fast": "fast result"}
+    assert prefetcher.stats() == {"started": 3, "used": 1, "discarded": 1}
+    assert await prefetcher.collect("invocation") == {}
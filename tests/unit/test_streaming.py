@@ -0,0 +1,34 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from llm_news_agents.shared_libraries.streaming import MarkerFilter
+
+_MARKER = "---END-OF-EDIT---"
+
+
+def test_marker_split_across_every_boundary_never_leaks() -> None:
+    text = "The sun is a sphere - mostly. " + _MARKER + "\nignored tail"
+    for cut in range(1, len(text)):
+        marker_filter = MarkerFilter(_MARKER)
+        emitted = marker_filter.feed(text[:cut]) + marker_filter.feed(text[cut:])
+        assert emitted == "The sun is a sphere - mostly. "
+
+
+def test_only_a_possible_marker_prefix_is_held_back() -> None:
+    marker_filter = MarkerFilter(_MARKER)
+    assert marker_filter.feed("Hello world") == "Hello world"
+    assert marker_filter.feed(" then --") == " then "
+    assert marker_filter.feed("- more") == "--- more"
+    assert marker_filter.feed("end --") == "end "
+
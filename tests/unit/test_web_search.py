@@ -0,0 +1,59 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from types import SimpleNamespace
+
+import pytest
+from google.genai import types
+
+from llm_news_agents.shared_libraries.rate_limit import RateLimitError
+from llm_news_agents.shared_libraries.web_search import grounding_result
+
+
+def test_grounding_result_returns_answer_sources_and_queries() -> None:
+    response = types.GenerateContentResponse(
+        candidates=[
+            types.Candidate(
+                content=types.Content(role="model", parts=[types.Part(text="The sky is blue.")]),
+                grounding_metadata=types.GroundingMetadata(
+                    grounding_chunks=[
+                        types.GroundingChunk(web=types.GroundingChunkWeb(title="NASA", uri="https://nasa.gov/sky")),
+                        types.GroundingChunk(web=types.GroundingChunkWeb(title="Met Office", uri="https://metoffice.gov.uk")),
+                    ],
+                    web_search_queries=["why is the sky blue"],
+                ),
+            )
+        ]
+    )
+
+    result = grounding_result(response, max_sources=1)
+
+    assert result == {
+        "answer": "The sky is blue.",
+        "sources": [{"title": "NASA", "uri": "https://nasa.gov/sky"}],
+        "search_queries": ["why is the sky blue"],
+    }
+
+
+@pytest.mark.asyncio
+async def test_direct_tool_turns_failures_into_an_error_payload(monkeypatch) -> None:
+    from llm_news_agents.sub_agents.news_researcher import agent
+
+    async def failing(query):
+        raise RateLimitError("quota exhausted")
+
+    monkeypatch.setattr(agent.grounded_search, "search", failing)
+    result = await agent.web_search("why is the sky blue", SimpleNamespace(state={}))
+    assert result["status"] == "error"
+    assert "quota exhausted" in result["error"]
@@ -0,0 +1,52 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import gzip
+import json
+
+import pytest
+
+from llm_news_agents.shared_libraries.wiki_dump import OfflineWikipedia, WikipediaDumpIndex, build_index
+
+_SAMPLE = [
+    {"title": "Alan Turing", "abstract": "Alan Mathison Turing was an English mathematician."},
+    {"title": "Turing machine", "abstract": "A Turing machine is a mathematical model of computation."},
+    {"title": "Ada Lovelace", "abstract": "Augusta Ada King was an English mathematician and writer."},
+    {"title": "Turing", "redirect": "Alan Turing"},
+]
+
+
+@pytest.fixture
+def index_dir(tmp_path):
+    source = tmp_path / "sample.jsonl.gz"
+    with gzip.open(source, "wt", encoding="utf-8") as f:
+        f.writelines(json.dumps(record) + "\n" for record in _SAMPLE)
+    assert build_index(str(source), str(tmp_path / "index")) == 4
+    return str(tmp_path / "index")
+
+
+def test_exact_redirect_prefix_and_fuzzy_lookups(index_dir) -> None:
+    index = WikipediaDumpIndex(index_dir)
+    assert index.lookup("alan_turing")[0] == "Alan Turing"
+    assert index.lookup("Turing") == index.lookup("Alan Turing")
+    assert index.lookup("Charles Babbage") is None
+    assert [title for title, _ in index.prefix_search("turing")] == ["Alan Turing", "Turing machine"]
+    assert index.fuzzy_search("Ada Lovelase")[0][0] == "Ada Lovelace"
+    index.close()
+
+
+@pytest.mark.asyncio
+async def test_offline_backend_matches_online_format(index_dir) -> None:
+    answer = await OfflineWikipedia(index_dir, top_k=2).run("Turing machine")
+    assert answer.startswith("Page: Turing machine\nSummary: A Turing machine")
@@ -0,0 +1,43 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import httpx
+import pytest
+
+from llm_news_agents.shared_libraries import http_client
+from llm_news_agents.shared_libraries.wikipedia import NO_RESULT, WikipediaClient
+
+
+@pytest.mark.asyncio
+async def test_summaries_are_fetched_concurrently_and_cached(monkeypatch) -> None:
+    requests = []
+
+    async def fake_get(url, params=None, headers=None, priority=None):
+        requests.append(params.get("titles") or params["srsearch"])
+        request = httpx.Request("GET", url)
+        if params.get("list") == "search":
+            hits = [{"title": "Alan Turing"}, {"title": "Turing machine"}] if "turing" in params["srsearch"] else []
+            return httpx.Response(200, json={"query": {"search": hits}}, request=request)
+        pages = {"1": {"title": params["titles"], "extract": f"{params['titles']} intro."}}
+        return httpx.Response(200, json={"query": {"pages": pages}}, request=request)
+
+    monkeypatch.setattr(http_client, "get", fake_get)
+    client = WikipediaClient(top_k=2, max_chars=60)
+
+    answer = await client.run("alan turing")
+    assert answer.startswith("Page: Alan Turing\nSummary: Alan Turing intro.\n\nPage: Turing")
+    assert len(answer) == 60
+    await client.run("Alan  Turing")
+    assert requests == ["alan turing", "Alan Turing", "Turing machine"]
+    assert await client.run("nothing") == NO_RESULT
@@ -0,0 +1,84 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import pytest
+
+from llm_news_agents.shared_libraries.news_engine import LocalNewsProvider, NewsEngine, NewsProvider
+from llm_news_agents.shared_libraries.window_planner import WindowPlanner, plan_windows
+
+
+def test_windows_are_aligned_so_overlapping_requests_share_them() -> None:
+    first = plan_windows("2025-03-01", "2025-03-20", 7)
+    second = plan_windows("2025-03-10", "2025-03-28", 7)
+    assert set(first) & set(second)
+    assert all(start <= end for start, end in first)
+    assert first[-1][0] <= "2025-03-01" and first[0][1] >= "2025-03-20"
+
+
+@pytest.mark.asyncio
+async def test_every_window_is_represented_and_cached() -> None:
+    articles = [
+        {
+            "source": "S",
+            "title": f"Trial day {day}",
+            "description": "court",
+            "url": f"https://e.com/{day}",
+            "published_at": f"2025-03-{day:02d}",
+        }
+        for day in range(1, 29)
+    ]
+    planner = WindowPlanner(NewsEngine([LocalNewsProvider(articles)]), window_days=7, per_window=2)
+
+    results = await planner.search("trial", "2025-03-01", "2025-03-28", max_articles=50)
+    days = {a.published_at for a in results}
+    assert len(plan_windows("2025-03-01", "2025-03-28", 7)) <= len(results)
+    assert all("2025-03-01" <= day <= "2025-03-28" for day in days)
+
+    misses = planner.cache.stats()["misses"]
+    await planner.search("trial", "2025-03-08", "2025-03-28", max_articles=50)
+    assert planner.cache.stats()["misses"] == misses
+
+
+class _DownProvider(NewsProvider):
+    name = "down"
+
+    async def search(self, query, from_date, to_date, page=1, page_size=5):
+        raise RuntimeError("outage")
+
+
+@pytest.mark.asyncio
+async def test_windows_are_not_cached_when_every_provider_failed() -> None:
+    planner = WindowPlanner(NewsEngine([_DownProvider()]), window_days=7)
+    assert await planner.search("trial", "2025-03-01", "2025-03-28") == []
+    assert len(planner.cache) == 0
+
+
+@pytest.mark.asyncio
+async def test_default_week_goes_through_the_paginated_engine(monkeypatch) -> None:
+    from llm_news_agents.sub_agents.investigative_journalist import agent
+
+    monkeypatch.setenv("NEWS_INDEX_ENABLED", "0")
+    calls = []
+
+    async def collect(*args, **kwargs):
+        calls.append(kwargs)
+        return []
+
+    async def planned(*args, **kwargs):
+        raise AssertionError("a one-week search must not be split into windows")
+
+    monkeypatch.setattr(agent.news_engine, "collect", collect)
+    monkeypatch.setattr(agent.news_window_planner, "search", planned)
+    assert await agent.search_news("trial") == []
+    assert calls and calls[0]["max_tokens"] is not None